@@ -0,0 +1,5 @@
+"""Offline benchmarks of the BeAnonymous render pipeline.
+
+Run with ``python -m benchmarks run`` and compare two result files with
+``python -m benchmarks compare BASELINE CURRENT``.
+"""
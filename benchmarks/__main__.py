@@ -0,0 +1,96 @@
+"""Command line entry point: python -m benchmarks {run,compare}."""
+
+import argparse
+import json
+import os
+import shutil
+import sys
+import tempfile
+from pathlib import Path
+
+# Settings: src.config.settings TTS_BACKEND_ENV / TTS_BACKEND_STUB, kept as
+# literals because src must not be imported before user data is isolated
+TTS_BACKEND_ENV = "BEANONYMOUS_TTS_BACKEND"
+TTS_BACKEND_STUB = "stub"
+
+def build_parser():
+    """Build the command line parser."""
+    parser = argparse.ArgumentParser(
+        prog="python -m benchmarks",
+        description="Offline render pipeline benchmarks with synthetic media and a stub TTS engine."
+    )
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    run = subparsers.add_parser("run", help="Time every stage and save the results as JSON")
+    run.add_argument("--words", type=int, nargs="+", help="Script lengths in words (default: 25 100 400)")
+    run.add_argument("--repeat", type=int, help="Timed runs per case, the median is kept (default: 3)")
+    run.add_argument("--no-intro", action="store_true", help="Only benchmark renders without the intro")
+    run.add_argument("--output", default="benchmark_results.json", help="Results file")
+    run.add_argument("--baseline", help="Compare against this results file when done")
+    run.add_argument("--threshold", type=float, help="Relative slowdown counted as a regression (default: 0.15)")
+    run.add_argument("--workdir", help="Keep media and user data here instead of a temp directory")
+
+    compare = subparsers.add_parser("compare", help="Flag regressions between two results files")
+    compare.add_argument("baseline", help="Baseline results file")
+    compare.add_argument("current", help="New results file")
+    compare.add_argument("--threshold", type=float, help="Relative slowdown counted as a regression (default: 0.15)")
+    return parser
+
+def isolate_user_data(workdir: Path):
+    """Point the home directory and TTS backend at benchmark-only values.
+
+    Must run before anything from src is imported, since user data paths
+    are resolved at import time.
+    """
+    home = workdir / 'home'
+    home.mkdir(parents=True, exist_ok=True)
+    os.environ['HOME'] = str(home)
+    os.environ['USERPROFILE'] = str(home)
+    os.environ[TTS_BACKEND_ENV] = TTS_BACKEND_STUB
+
+def compare_files(baseline_path, current, threshold):
+    """Print a comparison and return the exit code, 1 on regressions."""
+    from .compare import DEFAULT_THRESHOLD, compare, format_report, load_results
+    rows = compare(load_results(baseline_path), current,
+                   DEFAULT_THRESHOLD if threshold is None else threshold)
+    print(format_report(rows))
+    return 1 if any(row['status'] == 'regression' for row in rows) else 0
+
+def main(argv=None):
+    """Run the benchmark command line."""
+    args = build_parser().parse_args(argv)
+
+    if args.command == "compare":
+        from .compare import load_results
+        return compare_files(args.baseline, load_results(args.current), args.threshold)
+
+    if shutil.which('ffmpeg') is None or shutil.which('ffprobe') is None:
+        print("ffmpeg and ffprobe must be on PATH to run the benchmarks", file=sys.stderr)
+        return 2
+
+    workdir = Path(args.workdir or tempfile.mkdtemp(prefix='beanonymous-bench-')).resolve()
+    isolate_user_data(workdir)
+    from .harness import DEFAULT_REPEAT, DEFAULT_WORD_COUNTS, PipelineBenchmark
+
+    try:
+        benchmark = PipelineBenchmark(
+            workdir,
+            word_counts=args.words or DEFAULT_WORD_COUNTS,
+            intro_options=(False,) if args.no_intro else (False, True),
+            repeat=args.repeat or DEFAULT_REPEAT
+        )
+        results = benchmark.run()
+    finally:
+        if not args.workdir:
+            shutil.rmtree(workdir, ignore_errors=True)
+
+    with open(args.output, 'w', encoding='utf-8') as f:
+        json.dump(results, f, indent=2)
+    print(f"Results written to {args.output}")
+
+    if args.baseline:
+        return compare_files(args.baseline, results, args.threshold)
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,82 @@
+"""Comparison of benchmark results against a stored baseline."""
+
+import json
+from pathlib import Path
+from typing import Dict, List
+
+# A case regresses when its median grows by more than this fraction...
+DEFAULT_THRESHOLD = 0.15
+# ...and by more than this many seconds, so tiny stages do not flag on noise
+MIN_DELTA_SECONDS = 0.05
+
+def load_results(path) -> Dict:
+    """Read a results file written by 'python -m benchmarks run'.
+
+    Args:
+        path (str): Results JSON file
+
+    Returns:
+        Dict: The results
+    """
+    with open(Path(path), 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+def compare(baseline: Dict, current: Dict, threshold: float = DEFAULT_THRESHOLD,
+            min_delta: float = MIN_DELTA_SECONDS) -> List[Dict]:
+    """Compare the median time of every case.
+
+    Args:
+        baseline (Dict): Baseline results
+        current (Dict): New results
+        threshold (float): Relative slowdown that counts as a regression
+        min_delta (float): Absolute slowdown in seconds below which changes are ignored
+
+    Returns:
+        List[Dict]: One row per case with baseline, current, change and a status
+            of 'regression', 'improvement', 'ok', 'new' or 'missing'
+    """
+    old_cases = baseline['results']
+    new_cases = current['results']
+    rows = []
+    for case in sorted(old_cases.keys() | new_cases.keys()):
+        old = old_cases.get(case, {}).get('median')
+        new = new_cases.get(case, {}).get('median')
+        row = {'case': case, 'baseline': old, 'current': new, 'change': None}
+        if old is None:
+            row['status'] = 'new'
+        elif new is None:
+            row['status'] = 'missing'
+        else:
+            row['change'] = (new - old) / old if old else 0.0
+            if new - old > min_delta and row['change'] > threshold:
+                row['status'] = 'regression'
+            elif old - new > min_delta and -row['change'] > threshold:
+                row['status'] = 'improvement'
+            else:
+                row['status'] = 'ok'
+        rows.append(row)
+    return rows
+
+def format_report(rows: List[Dict]) -> str:
+    """Format comparison rows as a text table.
+
+    Args:
+        rows (List[Dict]): Output of compare()
+
+    Returns:
+        str: Table with one line per case
+    """
+    def seconds(value):
+        return f"{value:.3f}s" if value is not None else "-"
+
+    width = max([len(row['case']) for row in rows] + [4])
+    lines = [f"{'case':<{width}}  {'baseline':>9}  {'current':>9}  {'change':>7}  status"]
+    for row in rows:
+        change = f"{row['change']:+.0%}" if row['change'] is not None else "-"
+        lines.append(
+            f"{row['case']:<{width}}  {seconds(row['baseline']):>9}  {seconds(row['current']):>9}  "
+            f"{change:>7}  {row['status']}"
+        )
+    regressions = sum(row['status'] == 'regression' for row in rows)
+    lines.append(f"{regressions} regression(s) in {len(rows)} case(s)")
+    return '\n'.join(lines)
@@ -0,0 +1,203 @@
+"""Timing of the render stages over a grid of script lengths and intro on/off."""
+
+import os
+import platform
+import shutil
+import statistics
+import subprocess
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Callable, Dict, Iterable, List
+
+from src.config.settings import (
+    CACHE_DIR,
+    RENDER_MODE_SINGLE_PASS,
+    RENDER_MODE_LEGACY
+)
+from src.core.audio.processor import AudioProcessor
+from src.core.audio.tts import TTS
+from src.core.utils.logger import get_logger
+from src.core.utils.settings_manager import SettingsManager
+from src.core.utils.workspace import JobWorkspace
+from src.core.video.generator import VideoGenerator
+from .media import SyntheticMedia
+
+logger = get_logger('BENCHMARK')
+
+DEFAULT_WORD_COUNTS = (25, 100, 400)
+DEFAULT_REPEAT = 3
+VIDEO_MODES = (RENDER_MODE_SINGLE_PASS, RENDER_MODE_LEGACY)
+# Words per synthetic sentence, so longer scripts exercise chunked TTS
+SENTENCE_WORDS = 10
+VOCABULARY = (
+    "we", "are", "anonymous", "legion", "do", "not", "forgive", "forget",
+    "expect", "us", "the", "network", "signal", "message", "citizens", "world",
+    "truth", "hidden", "watching", "together"
+)
+
+def synthetic_script(words: int) -> str:
+    """Build a deterministic script of a given length.
+
+    Args:
+        words (int): Number of words
+
+    Returns:
+        str: Sentences of SENTENCE_WORDS words drawn from VOCABULARY
+    """
+    tokens = [VOCABULARY[(i * 7 + i // len(VOCABULARY)) % len(VOCABULARY)] for i in range(words)]
+    sentences = [
+        ' '.join(tokens[start:start + SENTENCE_WORDS]).capitalize() + '.'
+        for start in range(0, words, SENTENCE_WORDS)
+    ]
+    return ' '.join(sentences)
+
+def case_name(stage: str, words: int, intro=None) -> str:
+    """Build the key of one benchmark case.
+
+    Args:
+        stage (str): Stage name, e.g. 'tts' or 'video_legacy'
+        words (int): Script length
+        intro (bool, optional): Intro on/off, None for stages it does not affect
+
+    Returns:
+        str: e.g. 'video_legacy/words=100/intro=on'
+    """
+    name = f"{stage}/words={words}"
+    if intro is not None:
+        name += f"/intro={'on' if intro else 'off'}"
+    return name
+
+class PipelineBenchmark:
+    """Times TTS, pitch conversion and both video render paths.
+
+    Must run with user data isolated in the work directory (see
+    benchmarks.__main__), since the TTS chunk cache is cleared between
+    repeats so every run synthesizes from scratch.
+    """
+
+    def __init__(self, workdir, word_counts: Iterable[int] = DEFAULT_WORD_COUNTS,
+                 intro_options: Iterable[bool] = (False, True), repeat: int = DEFAULT_REPEAT):
+        """Initialize the benchmark.
+
+        Args:
+            workdir (str): Directory for synthetic media, narrations and user data
+            word_counts (Iterable[int]): Script lengths to benchmark
+            intro_options (Iterable[bool]): Intro settings to benchmark
+            repeat (int): Timed runs per case, the median is reported
+        """
+        self.workdir = Path(workdir).resolve()
+        if self.workdir not in CACHE_DIR.resolve().parents:
+            raise RuntimeError("User data is not isolated, run the benchmark with 'python -m benchmarks run'")
+        self.word_counts = list(word_counts)
+        self.intro_options = list(intro_options)
+        self.repeat = max(1, int(repeat))
+        self.media = SyntheticMedia(self.workdir / 'media')
+
+    def run(self) -> Dict:
+        """Run every case.
+
+        Returns:
+            Dict: 'meta' describing the environment and 'results' by case name
+        """
+        self.media.generate()
+        results = {}
+        for words in self.word_counts:
+            script = synthetic_script(words)
+            narration_wav = self.workdir / f"narration-{words}.wav"
+            narration_mp3 = self.workdir / f"narration-{words}.mp3"
+
+            results[case_name('tts', words)] = self._measure(
+                lambda: self._run_tts(script, narration_wav), before=self._clear_tts_cache)
+            results[case_name('pitch', words)] = self._measure(
+                lambda: self._run_pitch(narration_wav, narration_mp3))
+            for intro in self.intro_options:
+                for mode in VIDEO_MODES:
+                    results[case_name(f'video_{mode}', words, intro)] = self._measure(
+                        lambda: self._run_video(mode, narration_mp3, intro))
+
+        return {'meta': self._meta(), 'results': results}
+
+    def _measure(self, stage: Callable[[], None], before: Callable[[], None] = None) -> Dict:
+        """Time a stage `repeat` times.
+
+        Args:
+            stage (callable): Runs the stage once
+            before (callable, optional): Untimed setup before every run
+
+        Returns:
+            Dict: runs, median and min in seconds
+        """
+        runs = []
+        for _ in range(self.repeat):
+            if before:
+                before()
+            start = time.perf_counter()
+            stage()
+            runs.append(round(time.perf_counter() - start, 4))
+        return {'runs': runs, 'median': statistics.median(runs), 'min': min(runs)}
+
+    @staticmethod
+    def _clear_tts_cache():
+        """Forget cached TTS chunks so synthesis is timed from scratch."""
+        shutil.rmtree(CACHE_DIR / 'tts_chunks', ignore_errors=True)
+
+    @staticmethod
+    def _run_tts(script: str, narration_wav: Path):
+        """Synthesize the raw narration and keep it for the later stages."""
+        with JobWorkspace('bench-tts') as workspace:
+            tts = TTS(script, workspace=workspace, defer_pitch=True, use_cache=False)
+            if not tts.generate():
+                raise RuntimeError("TTS generation failed")
+            shutil.copyfile(tts.output_path, narration_wav)
+
+    @staticmethod
+    def _run_pitch(narration_wav: Path, narration_mp3: Path):
+        """Apply the pitch filter to a copy of the raw narration."""
+        with JobWorkspace('bench-pitch') as workspace:
+            # convert_pitch deletes its input
+            source = workspace.file('normal_audio.wav')
+            shutil.copyfile(narration_wav, source)
+            output = workspace.file('final_tts.mp3')
+            AudioProcessor.convert_pitch(source, output, workspace=workspace)
+            shutil.copyfile(output, narration_mp3)
+
+    def _run_video(self, mode: str, narration_mp3: Path, intro: bool):
+        """Render the final video with one render path."""
+        with JobWorkspace(f'bench-{mode}') as workspace:
+            generator = VideoGenerator(
+                str(self.media.video),
+                str(self.media.music),
+                workspace.path / 'output',
+                intro,
+                render_mode=mode,
+                output_filename='benchmark.mp4',
+                workspace=workspace,
+                tts_path=narration_mp3,
+                intro_path=self.media.intro
+            )
+            if not generator.generate():
+                raise RuntimeError(f"Video generation failed ({mode})")
+
+    def _meta(self) -> Dict:
+        """Describe the environment the results were measured in."""
+        return {
+            'timestamp': datetime.now(timezone.utc).isoformat(timespec='seconds'),
+            'commit': _command_output(['git', 'rev-parse', '--short', 'HEAD']),
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'cpu_count': os.cpu_count(),
+            'ffmpeg': _command_output(['ffmpeg', '-hide_banner', '-version']),
+            'encode_profile': SettingsManager.get_setting('encode_profile'),
+            'word_counts': self.word_counts,
+            'intro_options': self.intro_options,
+            'repeat': self.repeat
+        }
+
+def _command_output(cmd: List[str]):
+    """Get the first output line of a command, None if it cannot run."""
+    try:
+        output = subprocess.run(cmd, capture_output=True, text=True, timeout=10).stdout
+    except (OSError, subprocess.SubprocessError):
+        return None
+    return output.splitlines()[0].strip() if output.strip() else None
@@ -0,0 +1,73 @@
+"""Synthetic stock media generated from ffmpeg lavfi sources."""
+
+from pathlib import Path
+
+from src.core.utils.ffmpeg_runner import run_ffmpeg
+from src.core.utils.logger import get_logger
+
+logger = get_logger('BENCHMARK MEDIA')
+
+class SyntheticMedia:
+    """Background video, music and intro made with testsrc and sine sources.
+
+    Files already present in the directory are reused.
+    """
+
+    def __init__(self, directory, video_seconds=30, music_seconds=60, intro_seconds=3):
+        """Initialize the media set.
+
+        Args:
+            directory (str): Directory for the generated files
+            video_seconds (int): Length of the background video
+            music_seconds (int): Length of the background music
+            intro_seconds (int): Length of the intro
+        """
+        self.directory = Path(directory)
+        self.video_seconds = video_seconds
+        self.music_seconds = music_seconds
+        self.intro_seconds = intro_seconds
+        self.video = self.directory / 'stock.mp4'
+        self.music = self.directory / 'music.mp3'
+        self.intro = self.directory / 'intro.mp4'
+
+    def generate(self) -> 'SyntheticMedia':
+        """Create any missing file.
+
+        Returns:
+            SyntheticMedia: self, for chaining
+        """
+        self.directory.mkdir(parents=True, exist_ok=True)
+        video_args = ['-c:v', 'libx264', '-preset', 'veryfast', '-pix_fmt', 'yuv420p']
+        self._make(self.video, [
+            '-f', 'lavfi', '-i', 'testsrc=size=1280x720:rate=30',
+            '-t', str(self.video_seconds),
+            *video_args, '-an'
+        ])
+        self._make(self.music, [
+            '-f', 'lavfi', '-i', 'sine=frequency=220:sample_rate=44100',
+            '-t', str(self.music_seconds),
+            '-c:a', 'libmp3lame', '-b:a', '128k'
+        ])
+        self._make(self.intro, [
+            '-f', 'lavfi', '-i', 'testsrc2=size=1280x720:rate=30',
+            '-f', 'lavfi', '-i', 'sine=frequency=440:sample_rate=44100',
+            '-t', str(self.intro_seconds),
+            *video_args, '-c:a', 'aac', '-shortest'
+        ])
+        return self
+
+    @staticmethod
+    def _make(path: Path, args):
+        """Run ffmpeg to create one file unless it exists."""
+        if path.exists():
+            return
+        logger.info(f"Generating synthetic {path.name}...")
+        partial_path = path.with_name(f"partial-{path.name}")
+        try:
+            run_ffmpeg(['ffmpeg', '-y', '-hide_banner', '-loglevel', 'error', *args, str(partial_path)],
+                       label=f"synthetic {path.name}")
+        except BaseException:
+            if partial_path.exists():
+                partial_path.unlink()
+            raise
+        partial_path.replace(path)
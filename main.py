@@ -1,11 +1,90 @@
 """Entry point for BeAnonymous application."""
 
-from src.gui.app import BeAnonymousApp
+import argparse
+import json
+import os
+import sys
+import time
 
-def main():
-    """Run the BeAnonymous application."""
-    app = BeAnonymousApp()
+# Start of the startup measurement, taken before any application module loads
+START_TIME = time.perf_counter()
+
+def build_parser():
+    """Build the command line parser."""
+    parser = argparse.ArgumentParser(
+        prog="BeAnonymous",
+        description="The Anonymous Video Generator. Starts the GUI when no command is given."
+    )
+    subparsers = parser.add_subparsers(dest="command")
+
+    batch = subparsers.add_parser("batch", help="Render jobs from a JSONL/CSV manifest without the GUI")
+    batch.add_argument("manifest", help="Manifest file (.jsonl or .csv)")
+    batch.add_argument("--results", default="results.jsonl", help="Per-job results file (JSONL)")
+    batch.add_argument("--workers", type=int, default=max(1, (os.cpu_count() or 2) // 2),
+                       help="Number of worker processes")
+    batch.add_argument("--tts-jobs", type=int, default=1, help="Maximum concurrent TTS stages")
+    batch.add_argument("--ffmpeg-jobs", type=int, default=1, help="Maximum concurrent ffmpeg stages")
+
+    ingest = subparsers.add_parser("ingest", help="Normalize stock and intro videos to the mezzanine format")
+    ingest.add_argument("--force", action="store_true", help="Re-encode clips that are already up to date")
+
+    serve = subparsers.add_parser("serve", help="Serve a local HTTP API for submitting and following renders")
+    serve.add_argument("--host", help="Interface to bind (default 127.0.0.1)")
+    serve.add_argument("--port", type=int, help="Port to listen on (default 8765)")
+    serve.add_argument("--workers", type=int, default=2, help="Number of parallel renders")
+    serve.add_argument("--max-pending", type=int,
+                       help="Queued plus running jobs accepted before submissions get 429 (default 8)")
+
+    startup = subparsers.add_parser("startup", help="Measure GUI cold-start time and check it against the budget")
+    startup.add_argument("--budget", type=float, help="Allowed seconds to first paint (default from settings)")
+    return parser
+
+def run_gui(measure=False, budget=None):
+    """Start the GUI, timing its startup.
+
+    Args:
+        measure (bool): Close after the first paint and print the timings
+        budget (float, optional): Allowed seconds to first paint
+
+    Returns:
+        int: Exit code, 1 if measuring and over budget
+    """
+    from src.gui.startup_timer import StartupTimer
+    timer = StartupTimer(START_TIME, budget)
+    from src.gui.app import BeAnonymousApp
+    timer.mark("imports")
+    app = BeAnonymousApp(startup_timer=timer, close_after_paint=measure)
     app.run()
 
+    if measure:
+        print(json.dumps(timer.report(), indent=2))
+        return 0 if timer.within_budget() else 1
+    return 0
+
+def main(argv=None):
+    """Run the BeAnonymous application."""
+    args = build_parser().parse_args(argv)
+
+    if args.command == "batch":
+        from src.core.batch import run_batch
+        return run_batch(args.manifest, args.results, args.workers, args.tts_jobs, args.ffmpeg_jobs)
+
+    if args.command == "ingest":
+        from src.core.video.ingest import MezzanineIngest
+        for path in MezzanineIngest.ingest_all(force=args.force):
+            print(path)
+        return 0
+
+    if args.command == "serve":
+        from src.core.service import run_service
+        options = {'host': args.host, 'port': args.port, 'max_pending': args.max_pending}
+        return run_service(workers=args.workers,
+                           **{key: value for key, value in options.items() if value is not None})
+
+    if args.command == "startup":
+        return run_gui(measure=True, budget=args.budget)
+
+    return run_gui()
+
 if __name__ == "__main__":
-    main()
+    sys.exit(main())
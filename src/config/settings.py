@@ -1,5 +1,6 @@
 """Settings configuration for BeAnonymous."""
 
+import tempfile
 from pathlib import Path
 
 # Base Directory Structure
@@ -19,34 +20,115 @@ VIDEO_INTRO_PATH = RESOURCES_DIR / 'videos' / 'intro'   # New path for intro vid
 AUDIO_ASSETS_PATH = RESOURCES_DIR / 'audio'
 TEMP_PATH = CORE_DIR / 'utils' / 'temp'
 
-# Media Paths
-INTRO_VIDEO_PATH = VIDEO_INTRO_PATH / 'anon_intro.mp4'
+# User Data Paths (derived data that can be rebuilt at any time)
+USER_DATA_DIR = Path.home() / '.beanonymous'
+CACHE_DIR = USER_DATA_DIR / 'cache'
+MEZZANINE_PATH = CACHE_DIR / 'mezzanine'
+TRACE_LOG_PATH = USER_DATA_DIR / 'logs' / 'render_traces.jsonl'  # One JSON record per render
+TRACE_LOG_MAX_BYTES = 10 * 1024 * 1024  # Rolled over to render_traces.jsonl.1 past this size
 
-# Ensure critical directories exist
-REQUIRED_DIRS = [
-    TEMP_PATH,
-    GUI_ASSETS_PATH,
-    VIDEO_ASSETS_PATH,
-    AUDIO_ASSETS_PATH
-]
+# Job Workspaces (one unique temp directory per render)
+WORKSPACE_ROOT = Path(tempfile.gettempdir()) / 'beanonymous'
+RAM_WORKSPACE_ROOT = Path('/dev/shm') / 'beanonymous'
 
-# Create directories if they don't exist
-for directory in REQUIRED_DIRS:
-    directory.mkdir(parents=True, exist_ok=True)
+# Media Paths
+INTRO_VIDEO_PATH = VIDEO_INTRO_PATH / 'anon_intro.mp4'
 
 # Application Settings
 APP_NAME = "BeAnonymous"
 APP_VERSION = "1.0.0"
 WINDOW_SIZE = "450x540"
 WINDOW_BG_COLOR = "#202020"
+STARTUP_BUDGET_SECONDS = 1.5  # Import to first paint, checked by `main.py startup`
+
+# Child Processes (ffmpeg/ffprobe run through the shared process runner)
+PROCESS_STDERR_TAIL_LINES = 50  # stderr lines kept for error reports
+PROCESS_LINE_LIMIT = 1024 * 1024  # Longest stdout/stderr line read, in bytes
+FFPROBE_TIMEOUT = 30  # Seconds before a hung probe is killed
 
 # Video Settings
 DEFAULT_VIDEO = "Default"
 DEFAULT_AUDIO = "Default"
 VIDEO_OUTPUT_FILENAME = "BeAnonymous_video.mp4"
 
+# Render Modes
+RENDER_MODE_SINGLE_PASS = "single_pass"  # One ffmpeg filtergraph, no temp media
+RENDER_MODE_LEGACY = "legacy"            # Three chained ffmpeg runs via temp files
+RENDER_MODE_STREAM_COPY = "stream_copy"  # Concat ingested mezzanine clips, encode audio only
+RENDER_MODE_CACHED = "cached"            # Reuse cached looped background tracks
+RENDER_MODE_SPECULATIVE = "speculative"  # Encode the background from an estimated length during TTS
+RENDER_MODES = (
+    RENDER_MODE_SINGLE_PASS,
+    RENDER_MODE_LEGACY,
+    RENDER_MODE_STREAM_COPY,
+    RENDER_MODE_CACHED,
+    RENDER_MODE_SPECULATIVE
+)
+DEFAULT_RENDER_MODE = RENDER_MODE_SINGLE_PASS
+
+# Encode Profiles (speed/quality trade-off for every encode of the final video)
+OUTPUT_VIDEO_CODEC = "libx264"
+OUTPUT_AUDIO_CODEC = "aac"
+ENCODE_PROFILE_DRAFT = "draft"
+ENCODE_PROFILE_BALANCED = "balanced"
+ENCODE_PROFILE_ARCHIVE = "archive"
+ENCODE_PROFILE_PREVIEW = "preview"  # Used by preview renders, not offered in Settings
+ENCODE_PROFILES = {
+    # height None keeps the source resolution, threads 0 lets ffmpeg decide
+    ENCODE_PROFILE_DRAFT: {'preset': 'veryfast', 'crf': 28, 'threads': 0, 'height': 480, 'audio_bitrate': '96k'},
+    ENCODE_PROFILE_BALANCED: {'preset': 'medium', 'crf': 23, 'threads': 0, 'height': None, 'audio_bitrate': '128k'},
+    ENCODE_PROFILE_ARCHIVE: {'preset': 'slow', 'crf': 18, 'threads': 0, 'height': None, 'audio_bitrate': '192k'},
+    ENCODE_PROFILE_PREVIEW: {'preset': 'ultrafast', 'crf': 32, 'threads': 0, 'height': 360, 'audio_bitrate': '64k'}
+}
+DEFAULT_ENCODE_PROFILE = ENCODE_PROFILE_BALANCED
+
+# Preview Renders (short low-resolution renders of the start of a script)
+PREVIEW_SECONDS = 10
+PREVIEW_SENTENCES = 2
+PREVIEW_PATH = WORKSPACE_ROOT / 'previews'
+
+# Mezzanine Format (canonical encode for ingested stock/intro clips)
+MEZZANINE_VIDEO_CODEC = "libx264"
+MEZZANINE_PROFILE = "high"
+MEZZANINE_PIX_FMT = "yuv420p"
+MEZZANINE_WIDTH = 1280
+MEZZANINE_HEIGHT = 720
+MEZZANINE_FPS = 30
+MEZZANINE_GOP = 60  # Fixed keyframe interval in frames (2 seconds)
+MEZZANINE_TIMESCALE = 90000
+MEZZANINE_CRF = 18
+MEZZANINE_AUDIO_CODEC = "aac"
+MEZZANINE_AUDIO_RATE = 44100
+MEZZANINE_AUDIO_BITRATE = "192k"
+
+# Video Track Cache
+VIDEO_CACHE_BUCKET_SECONDS = 30  # Cached tracks are encoded to the next multiple of this
+
+# Speculative Renders (background encoded while the narration is synthesized)
+SPECULATIVE_SEGMENT_SECONDS = 4  # Segment length, a multiple of the mezzanine GOP
+SPECULATIVE_MARGIN = 0.15  # Extra length encoded beyond the estimate, as a fraction
+SPECULATIVE_MIN_MARGIN_SECONDS = 4
+
+# Thumbnails
+THUMBNAIL_FRAMES = 4  # Frames in each preview strip
+THUMBNAIL_WIDTH = 120  # Width of each frame in pixels
+THUMBNAIL_WORKERS = 2  # Clips thumbnailed at once
+THUMBNAIL_CACHE_MAX_MB = 64
+
+# Render Service (local HTTP API, `main.py serve`)
+SERVICE_HOST = "127.0.0.1"  # Loopback only, the API has no authentication
+SERVICE_PORT = 8765
+SERVICE_OUTPUT_PATH = USER_DATA_DIR / 'service'  # Rendered videos, one per job id
+SERVICE_MAX_PENDING = 8  # Queued plus running jobs before submissions get 429
+SERVICE_MAX_FINISHED = 100  # Finished jobs kept for status and download
+SERVICE_MAX_BODY_BYTES = 1024 * 1024
+SERVICE_HEARTBEAT_SECONDS = 15  # Keep-alive comments on idle progress streams
+
 # TTS Settings
 TTS_RATE = 195
 TTS_VOICE_ID = 0
+TTS_ENGINE_SAMPLE_RATE = 22050  # Assumed rate of the raw speech, as eSpeak writes it
+TTS_BACKEND_ENV = "BEANONYMOUS_TTS_BACKEND"  # Set to "stub" for the offline benchmark engine
+TTS_BACKEND_STUB = "stub"
 TTS_TEMP_FILE = TEMP_PATH / 'normal_audio.mp3'
 TTS_FINAL_FILE = TEMP_PATH / 'final_tts.mp3'
\ No newline at end of file
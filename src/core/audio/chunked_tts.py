@@ -0,0 +1,355 @@
+"""Sentence-level parallel speech synthesis for BeAnonymous."""
+
+import multiprocessing
+import os
+import re
+import shutil
+import threading
+import time
+import uuid
+import wave
+from concurrent.futures import FIRST_EXCEPTION, Future, ProcessPoolExecutor, wait
+from concurrent.futures.process import BrokenProcessPool
+from pathlib import Path
+from typing import List, Optional, Tuple
+from ..utils.cancel import JobCancelled
+from ..utils.disk_cache import DiskCache
+from ..utils.ffmpeg_runner import run_ffmpeg
+from ..utils.logger import get_logger
+from ..utils.settings_manager import SettingsManager
+from .narration_cache import NarrationCache
+from .tts_worker import TTSWorkerError
+
+logger = get_logger('CHUNKED TTS')
+
+# Silence inserted between joined chunks, engines trim it at file edges
+CHUNK_GAP_SECONDS = 0.25
+# Seconds between checks for cancellation and hung chunks
+POLL_INTERVAL = 0.25
+
+_SENTENCE_END = re.compile(r'(?<=[.!?;:])\s+|\n\s*\n')
+
+def split_script(text: str) -> List[str]:
+    """Split a script into sentence/paragraph chunks.
+
+    Args:
+        text (str): Narration text
+
+    Returns:
+        List[str]: Non-empty chunks in reading order
+    """
+    chunks = []
+    for part in _SENTENCE_END.split(text):
+        part = ' '.join(part.split())
+        if part:
+            chunks.append(part)
+    return chunks
+
+# Engine kept alive inside each pool process between chunks
+_engine = None
+_engine_config = None
+
+def _synthesize_chunk(text: str, output_path: str, voice_id: int, rate: int) -> str:
+    """Synthesize one chunk inside a pool process.
+
+    Args:
+        text (str): Chunk text
+        output_path (str): Destination WAV file
+        voice_id (int): Voice index
+        rate (int): Speech rate
+
+    Returns:
+        str: The output path
+    """
+    global _engine, _engine_config
+    from .tts import create_engine, configure_engine
+
+    if _engine is None:
+        _engine = create_engine()
+    if _engine_config != (voice_id, rate):
+        configure_engine(_engine, voice_id, rate)
+        _engine_config = (voice_id, rate)
+    _engine.save_to_file(text, output_path)
+    _engine.runAndWait()
+    if not Path(output_path).exists():
+        raise RuntimeError(f"TTS chunk was not created: {output_path}")
+    return output_path
+
+def _link_or_copy(source: Path, target: Path) -> None:
+    """Hard-link a file, copying it where links are not supported (e.g. across drives).
+
+    Raises:
+        FileNotFoundError: If the source does not exist
+    """
+    try:
+        os.link(source, target)
+    except FileNotFoundError:
+        raise
+    except OSError:
+        shutil.copyfile(source, target)
+
+class ChunkedSynthesizer:
+    """Synthesizes scripts chunk by chunk across worker processes.
+
+    Each chunk is cached on its own, so editing one sentence only
+    re-synthesizes that sentence.
+    """
+    _pool: Optional[ProcessPoolExecutor] = None
+    _pool_workers = 0
+    _default_workers = 0
+    _pool_lock = threading.Lock()
+    _cache: Optional[DiskCache] = None
+
+    def __init__(self, voice_id: int, rate: int):
+        """Initialize the synthesizer.
+
+        Args:
+            voice_id (int): Voice index
+            rate (int): Speech rate in words per minute
+        """
+        self.voice_id = voice_id
+        self.rate = rate
+
+    @classmethod
+    def cache(cls) -> DiskCache:
+        """Get the shared chunk cache, sized from the current settings."""
+        max_mb = SettingsManager.get_setting('tts_chunk_cache_max_mb', 256)
+        if cls._cache is None:
+            cls._cache = DiskCache('tts_chunks', max_mb * 1024 * 1024)
+        else:
+            cls._cache.max_bytes = max_mb * 1024 * 1024
+        return cls._cache
+
+    @classmethod
+    def set_default_workers(cls, workers: int) -> None:
+        """Size the pool when the 'tts_chunk_workers' setting is 0.
+
+        Batch workers call this so that each of their pools gets a share
+        of the CPUs instead of one process per CPU each.
+
+        Args:
+            workers (int): Pool processes, 0 for one per CPU
+        """
+        cls._default_workers = max(0, int(workers))
+
+    @classmethod
+    def pool_workers(cls) -> int:
+        """Pool processes wanted by the settings."""
+        return (SettingsManager.get_setting('tts_chunk_workers', 0)
+                or cls._default_workers or os.cpu_count() or 2)
+
+    @classmethod
+    def submit(cls, *args) -> Tuple[ProcessPoolExecutor, Future]:
+        """Submit a chunk to the shared synthesis pool, creating it on first use.
+
+        The pool is looked up and used under one lock, so a resize can
+        never hand out an executor that has already been shut down.
+
+        Args:
+            *args: Arguments of _synthesize_chunk
+
+        Returns:
+            Tuple[ProcessPoolExecutor, Future]: The pool that took the chunk,
+                and a future resolving to the chunk's output path
+        """
+        workers = cls.pool_workers()
+        with cls._pool_lock:
+            if cls._pool is None or cls._pool_workers != workers:
+                if cls._pool is not None:
+                    # Chunks already submitted to the old pool still run
+                    cls._pool.shutdown(wait=False)
+                cls._pool = ProcessPoolExecutor(
+                    max_workers=workers,
+                    mp_context=multiprocessing.get_context('spawn')
+                )
+                cls._pool_workers = workers
+                logger.info(f"Started TTS chunk pool with {workers} worker(s)")
+            return cls._pool, cls._pool.submit(_synthesize_chunk, *args)
+
+    @classmethod
+    def recycle_pool(cls, pool: ProcessPoolExecutor) -> None:
+        """Kill a pool holding a hung chunk, the next submit() starts a fresh one.
+
+        A pool cannot stop a single task, so all its processes are killed.
+        Chunks of other jobs on it fail with BrokenProcessPool and are
+        resubmitted by their synthesize().
+
+        Args:
+            pool (ProcessPoolExecutor): Pool returned by submit()
+        """
+        with cls._pool_lock:
+            if cls._pool is pool:
+                cls._pool = None
+        for process in list((pool._processes or {}).values()):
+            process.kill()
+        pool.shutdown(wait=False)
+        logger.info("Recycled TTS chunk pool")
+
+    @staticmethod
+    def chunk_timeout(text: str) -> float:
+        """Seconds a chunk may be spoken for, scaled like TTSWorker requests."""
+        return SettingsManager.get_setting('tts_worker_timeout', 120) + len(text) / 15
+
+    def synthesize(self, text: str, output_path, cancel_token=None) -> None:
+        """Synthesize a script to a single WAV file.
+
+        Args:
+            text (str): Narration text
+            output_path (str): Destination WAV file
+            cancel_token (CancelToken, optional): Cancels this script's queued
+                chunks when cancelled; chunks already being spoken finish in
+                the background and are ignored
+
+        Raises:
+            TTSWorkerError: If a chunk is spoken for longer than its timeout
+            JobCancelled: If the cancel token is cancelled during synthesis
+        """
+        output_path = Path(output_path)
+        output_path.parent.mkdir(parents=True, exist_ok=True)
+        chunks = split_script(text)
+        if not chunks:
+            raise ValueError("Script contains no speakable text")
+
+        cache = self.cache()
+        keys = [NarrationCache.key_for(chunk, self.voice_id, self.rate, None) for chunk in chunks]
+        workdir = output_path.parent
+        local_files = []
+
+        def local_file():
+            path = workdir / f"chunk-{uuid.uuid4().hex[:8]}.wav"
+            local_files.append(path)
+            return path
+
+        def checkout(key):
+            # Link hits into the workspace now, other processes may evict them before the join
+            cached = cache.get(key)
+            if cached is None:
+                return None
+            path = local_file()
+            try:
+                _link_or_copy(cached, path)
+            except FileNotFoundError:
+                logger.info(f"Chunk {key[:12]} was evicted before it could be reused")
+                return None
+            return path
+
+        try:
+            chunk_files = [checkout(key) for key in keys]
+            missing = [i for i, path in enumerate(chunk_files) if path is None]
+            logger.info(f"{len(chunks)} chunk(s), {len(chunks) - len(missing)} reused, "
+                        f"{len(missing)} to synthesize")
+            if missing:
+                chunk_files = self._synthesize_missing(chunks, missing, chunk_files, local_file,
+                                                       cancel_token)
+                for i in missing:
+                    # The cache gets its own link, eviction never removes the workspace file
+                    cached = local_file()
+                    _link_or_copy(chunk_files[i], cached)
+                    cache.put(keys[i], cached, '.wav')
+            self.join(chunk_files, output_path, cancel_token)
+        finally:
+            for path in local_files:
+                path.unlink(missing_ok=True)
+
+    def _synthesize_missing(self, chunks, missing, chunk_files, local_file, cancel_token):
+        """Synthesize the chunks at the `missing` indices on the shared pool.
+
+        Args:
+            chunks (List[str]): All chunk texts
+            missing (List[int]): Indices of the chunks to synthesize
+            chunk_files (List[Optional[Path]]): Files of the reused chunks
+            local_file: Callable returning a fresh workspace file path
+            cancel_token (CancelToken, optional): Cancels this script's queued chunks
+
+        Returns:
+            List[Path]: chunk_files with the synthesized chunks filled in
+        """
+        futures, pools, started, retried = {}, {}, {}, set()
+
+        def submit(i):
+            pool, future = self.submit(chunks[i], str(local_file()), self.voice_id, self.rate)
+            futures[i] = future
+            pools[future] = (pool, i)
+            return future
+
+        pending = {submit(i) for i in missing}
+        while pending:
+            done, pending = wait(pending, timeout=POLL_INTERVAL, return_when=FIRST_EXCEPTION)
+            if cancel_token and cancel_token.cancelled:
+                # The pool is shared with other jobs, only drop this script's chunks
+                for future in pending:
+                    future.cancel()
+                raise JobCancelled()
+            for future in done:
+                i = pools[future][1]
+                error = (BrokenProcessPool("TTS chunk pool was shut down") if future.cancelled()
+                         else future.exception())
+                if isinstance(error, BrokenProcessPool) and i not in retried:
+                    # Another job recycled the pool, run the chunk again once
+                    retried.add(i)
+                    pending.add(submit(i))
+                elif error is not None:
+                    for other in pending:
+                        other.cancel()
+                    raise error
+            now = time.monotonic()
+            for future in pending:
+                if future.running():
+                    started.setdefault(future, now)
+                pool, i = pools[future]
+                if future in started and now - started[future] > self.chunk_timeout(chunks[i]):
+                    logger.error(f"TTS chunk {i + 1} hung for {now - started[future]:.0f}s, "
+                                 "recycling the pool")
+                    for other in pending:
+                        other.cancel()
+                    self.recycle_pool(pool)
+                    raise TTSWorkerError("TTS chunk timed out")
+        chunk_files = list(chunk_files)
+        for i, future in futures.items():
+            chunk_files[i] = Path(future.result())
+        return chunk_files
+
+    @staticmethod
+    def join(chunk_files: List[Path], output_path: Path, cancel_token=None) -> None:
+        """Join chunk WAVs in order with a short gap between them.
+
+        Falls back to ffmpeg when the chunks are not plain WAV files
+        with identical parameters (e.g. AIFF output on macOS).
+
+        Args:
+            chunk_files (List[Path]): Chunk files in reading order
+            output_path (Path): Destination WAV file
+            cancel_token (CancelToken, optional): Kills the ffmpeg fallback when cancelled
+        """
+        try:
+            with wave.open(str(chunk_files[0]), 'rb') as first:
+                params = first.getparams()
+            gap = b'\x00' * int(params.framerate * CHUNK_GAP_SECONDS) * params.sampwidth * params.nchannels
+            with wave.open(str(output_path), 'wb') as out:
+                out.setparams(params)
+                for i, chunk in enumerate(chunk_files):
+                    with wave.open(str(chunk), 'rb') as part:
+                        if part.getparams()[:3] != params[:3]:
+                            raise wave.Error(f"Mismatched WAV format in {chunk}")
+                        if i:
+                            out.writeframes(gap)
+                        out.writeframes(part.readframes(part.getnframes()))
+        except (wave.Error, EOFError) as e:
+            logger.info(f"Joining chunks with ffmpeg ({e})")
+            inputs = []
+            for chunk in chunk_files:
+                inputs += ['-i', str(chunk)]
+            # Pad every chunk but the last with the same gap as the WAV path
+            last = len(chunk_files) - 1
+            padded = ''.join(f'[{i}:a]apad=pad_dur={CHUNK_GAP_SECONDS}[p{i}];' for i in range(last))
+            pads = ''.join(f'[p{i}]' for i in range(last)) + f'[{last}:a]'
+            cmd = [
+                'ffmpeg', '-y',
+                '-hide_banner', '-loglevel', 'warning',
+                *inputs,
+                '-filter_complex', f'{padded}{pads}concat=n={len(chunk_files)}:v=0:a=1[a]',
+                '-map', '[a]',
+                '-c:a', 'pcm_s16le',
+                str(output_path)
+            ]
+            run_ffmpeg(cmd, label="chunk join", cancel_token=cancel_token)
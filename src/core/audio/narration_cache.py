@@ -0,0 +1,125 @@
+"""Content-addressed cache of synthesized narration for BeAnonymous."""
+
+import hashlib
+import json
+import os
+import sys
+from importlib import metadata
+from pathlib import Path
+from typing import Dict, Optional
+from ...config.settings import TTS_BACKEND_ENV, TTS_BACKEND_STUB
+from ..utils.disk_cache import DiskCache
+from ..utils.logger import get_logger
+from ..utils.settings_manager import SettingsManager
+
+logger = get_logger('NARRATION CACHE')
+
+class NarrationCache:
+    """Final narration audio keyed by a hash of everything that shapes it.
+
+    The cache lives in the shared cache directory, so batch workers, the
+    GUI and the render service reuse each other's narrations. The
+    DiskCache index is locked across processes, but another process may
+    still evict a file right after get() returned it; callers copy the
+    file out and treat a vanished file as a miss.
+    """
+    _cache: Optional[DiskCache] = None
+
+    @classmethod
+    def cache(cls) -> DiskCache:
+        """Get the shared disk cache, sized from the current settings.
+
+        Returns:
+            DiskCache: Cache holding narration files
+        """
+        max_mb = SettingsManager.get_setting('narration_cache_max_mb', 512)
+        if cls._cache is None:
+            cls._cache = DiskCache('narration', max_mb * 1024 * 1024)
+        else:
+            cls._cache.max_bytes = max_mb * 1024 * 1024
+        return cls._cache
+
+    @staticmethod
+    def engine_identity() -> str:
+        """Identify the speech engine, since voices differ per driver/version.
+
+        Returns:
+            str: Engine name, version and platform
+        """
+        if os.environ.get(TTS_BACKEND_ENV) == TTS_BACKEND_STUB:
+            return f"{TTS_BACKEND_STUB}-{sys.platform}"
+        try:
+            version = metadata.version('pyttsx3')
+        except metadata.PackageNotFoundError:
+            version = 'unknown'
+        return f"pyttsx3-{version}-{sys.platform}"
+
+    @classmethod
+    def key_for(cls, text: str, voice_id: int, rate: int, pitch_factor: Optional[float]) -> str:
+        """Build the cache key for a narration.
+
+        Args:
+            text (str): Narration text, whitespace is normalized
+            voice_id (int): Voice index
+            rate (int): Speech rate
+            pitch_factor (float, optional): Applied pitch factor, None for raw audio
+
+        Returns:
+            str: Hex digest key
+        """
+        identity = {
+            'text': ' '.join(text.split()),
+            'voice_id': voice_id,
+            'rate': rate,
+            'pitch_factor': pitch_factor,
+            'engine': cls.engine_identity()
+        }
+        encoded = json.dumps(identity, sort_keys=True).encode('utf-8')
+        return hashlib.sha256(encoded).hexdigest()
+
+    @classmethod
+    def get(cls, key: str) -> Optional[Path]:
+        """Look up a cached narration.
+
+        Args:
+            key (str): Cache key
+
+        Returns:
+            Optional[Path]: Cached file, or None on a miss
+        """
+        path = cls.cache().get(key)
+        cls.log_stats()
+        return path
+
+    @classmethod
+    def put(cls, key: str, source_path, suffix: str) -> Path:
+        """Move a finished narration file into the cache.
+
+        Args:
+            key (str): Cache key
+            source_path (str): File to store (moved, not copied)
+            suffix (str): File suffix including the dot
+
+        Returns:
+            Path: Cached file
+        """
+        return cls.cache().put(key, source_path, suffix)
+
+    @classmethod
+    def stats(cls) -> Dict:
+        """Get hit rate and storage for this process.
+
+        Returns:
+            Dict: Hits, misses, evictions, hit rate and bytes stored
+        """
+        return cls.cache().stats()
+
+    @classmethod
+    def log_stats(cls) -> None:
+        """Log the current hit rate and bytes stored."""
+        stats = cls.stats()
+        logger.info(
+            f"Narration cache hit rate {stats['hit_rate']:.0%} "
+            f"({stats['hits']}/{stats['hits'] + stats['misses']}), "
+            f"{stats['bytes_stored']} bytes stored"
+        )
@@ -1,30 +1,119 @@
 """Audio processing utilities for BeAnonymous."""
 
 import subprocess
+import wave
 from pathlib import Path
-from ...config.settings import TEMP_PATH
+from ...config.settings import TTS_ENGINE_SAMPLE_RATE
+from ..utils.ffmpeg_runner import run_ffmpeg
 from ..utils.logger import get_logger
+from ..utils.media_index import MediaIndex
 from ..utils.settings_manager import SettingsManager
 
 logger = get_logger('AUDIO')
 
 class AudioProcessor:
     """Audio processing class for manipulating generated TTS audio."""
+    # Sample rate the pitch filter assumes for its input
+    BASE_SAMPLE_RATE = 44100
+    
+    @staticmethod
+    def resolve_pitch_factor(pitch_factor=None):
+        """Get the pitch factor to use, falling back to the saved setting.
+        
+        Args:
+            pitch_factor (float, optional): Explicit pitch factor
+            
+        Returns:
+            float: Pitch factor
+        """
+        if pitch_factor is None:
+            pitch_factor = SettingsManager.load_settings().get('pitch_factor', 0.35)
+        return float(pitch_factor)
+    
+    @classmethod
+    def pitch_filter(cls, pitch_factor):
+        """Build the ffmpeg audio filter for the hacker-style low pitch.
+        
+        Args:
+            pitch_factor (float): Pitch factor
+            
+        Returns:
+            str: Filter chain usable in -af or inside a filter_complex
+        """
+        return f'asetrate={cls.BASE_SAMPLE_RATE}*{pitch_factor},aresample={cls.BASE_SAMPLE_RATE}'
+    
+    @classmethod
+    def pitch_stretch(cls, pitch_factor, sample_rate=TTS_ENGINE_SAMPLE_RATE):
+        """Get how much the pitch filter lengthens raw speech.
+        
+        asetrate plays samples recorded at `sample_rate` back at
+        BASE_SAMPLE_RATE * pitch_factor.
+        
+        Args:
+            pitch_factor (float): Pitch factor
+            sample_rate (int): Sample rate of the raw speech, defaults to
+                the rate the engine is assumed to write
+            
+        Returns:
+            float: Pitched duration divided by raw duration
+        """
+        return sample_rate / (cls.BASE_SAMPLE_RATE * pitch_factor)
+    
+    @classmethod
+    def pitched_duration(cls, wav_path, pitch_factor):
+        """Get the duration a narration file will have after the pitch filter.
+        
+        asetrate reinterprets the samples at BASE_SAMPLE_RATE * pitch_factor,
+        so the result only depends on the frame count. It is read from the
+        WAV header, or derived from a probe for other formats such as the
+        AIFF files macOS engines write.
+        
+        Args:
+            wav_path (str): Unprocessed narration file
+            pitch_factor (float): Pitch factor
+            
+        Returns:
+            float: Duration in seconds
+        """
+        try:
+            with wave.open(str(wav_path), 'rb') as wav_file:
+                frames = wav_file.getnframes()
+        except (wave.Error, EOFError):
+            # Per-job intermediate, not worth keeping in the index
+            info = MediaIndex.get(wav_path, persist=False)
+            if info['duration'] is None:
+                raise ValueError(f"Could not determine duration of {wav_path}")
+            return info['duration'] * cls.pitch_stretch(
+                pitch_factor, info['sample_rate'] or cls.BASE_SAMPLE_RATE)
+        return frames / (cls.BASE_SAMPLE_RATE * pitch_factor)
     
     @staticmethod    
     def convert_pitch(input_path=None, 
-                     output_path=None):
-        """Convert the pitch of an audio file using ffmpeg."""
-        settings = SettingsManager.load_settings()
-        pitch_factor = settings.get('pitch_factor', 0.35)
-        """Convert the pitch of an audio file using ffmpeg."""
+                     output_path=None,
+                     pitch_factor=None,
+                     workspace=None,
+                     cancel_token=None):
+        """Convert the pitch of an audio file using ffmpeg.
+        
+        Args:
+            input_path (str): Source audio file, deleted after conversion
+            output_path (str, optional): Converted file, defaults to
+                final_tts.mp3 in the workspace
+            pitch_factor (float, optional): Overrides the saved pitch factor
+            workspace (JobWorkspace, optional): Job workspace holding the files
+            cancel_token (CancelToken, optional): Kills ffmpeg when cancelled
+        """
+        pitch_factor = AudioProcessor.resolve_pitch_factor(pitch_factor)
         try:
-            # Create temp directory if it doesn't exist
-            TEMP_PATH.mkdir(parents=True, exist_ok=True)
+            if output_path is None and workspace is not None:
+                output_path = workspace.file("final_tts.mp3")
 
             # Ensure paths are Path objects and absolute
             input_path = Path(input_path).resolve()
             output_path = Path(output_path).resolve()
+
+            # Create output directory if it doesn't exist
+            output_path.parent.mkdir(parents=True, exist_ok=True)
             
             logger.info(f"Using input path: {input_path}")
             logger.info(f"Using output path: {output_path}")
@@ -39,12 +128,12 @@ class AudioProcessor:
                 'ffmpeg', '-y',
                 '-hide_banner', '-loglevel', 'warning',
                 '-i', str(input_path),
-                '-af', f'asetrate=44100*{pitch_factor},aresample=44100',
+                '-af', AudioProcessor.pitch_filter(pitch_factor),
                 str(output_path)
             ]
             
             logger.info("Processing audio pitch adjustment...")
-            subprocess.run(cmd, check=True)
+            run_ffmpeg(cmd, label="pitch adjustment", cancel_token=cancel_token)
             logger.info(f"Output file created at: {output_path}")
             input_path.unlink()  # Remove the original file after processing
             logger.info(f"Originally generated tts file {input_path} deleted")
@@ -53,7 +142,7 @@ class AudioProcessor:
             return True
             
         except subprocess.CalledProcessError as e:
-            logger.error(f"FFmpeg Error: {e.stderr.decode() if e.stderr else str(e)}")
+            logger.error(f"FFmpeg Error: {e.stderr or e}")
             raise
         except Exception as e:
             logger.error(f"Error: {str(e)}")
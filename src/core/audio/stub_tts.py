@@ -0,0 +1,85 @@
+"""Deterministic offline stand-in for the pyttsx3 engine."""
+
+import math
+import struct
+import wave
+import zlib
+from typing import Dict, List
+
+# Output format, matching what pyttsx3's eSpeak driver writes
+SAMPLE_RATE = 22050
+# Distinct tones words are mapped to
+TONE_COUNT = 8
+# Silence between words, as a fraction of each word's time slot
+WORD_GAP = 0.2
+
+class StubVoice:
+    """Voice entry as returned by getProperty('voices')."""
+
+    def __init__(self, voice_id: str, name: str):
+        """Initialize the voice.
+
+        Args:
+            voice_id (str): Voice identifier
+            name (str): Display name
+        """
+        self.id = voice_id
+        self.name = name
+
+class StubEngine:
+    """Engine with the pyttsx3 calls the app uses, writing synthetic speech.
+
+    Each word becomes a short tone chosen from the word's CRC, one word per
+    60 / rate seconds, so the same text and rate always produce the same
+    WAV. No speech driver or audio device is needed.
+    """
+    VOICES = [StubVoice('stub-0', 'Stub Voice 0'), StubVoice('stub-1', 'Stub Voice 1')]
+
+    def __init__(self):
+        """Initialize the engine."""
+        self.properties = {'rate': 200, 'voice': self.VOICES[0].id, 'volume': 1.0}
+        self._pending: List = []
+        self._tones: Dict = {}
+
+    def getProperty(self, name):
+        """Get an engine property, 'voices' lists the stub voices."""
+        if name == 'voices':
+            return list(self.VOICES)
+        return self.properties[name]
+
+    def setProperty(self, name, value):
+        """Set an engine property."""
+        self.properties[name] = value
+
+    def save_to_file(self, text: str, path: str):
+        """Queue text to be written to a WAV file by runAndWait()."""
+        self._pending.append((text, path))
+
+    def runAndWait(self):
+        """Write every queued file."""
+        pending, self._pending = self._pending, []
+        for text, path in pending:
+            self._write(text, path)
+
+    def _tone(self, index: int, frames: int) -> bytes:
+        """Get one word's samples: a tone followed by silence."""
+        key = (index, frames)
+        if key not in self._tones:
+            voiced = int(frames * (1 - WORD_GAP))
+            frequency = 140 + 25 * index
+            samples = [
+                int(8000 * math.sin(2 * math.pi * frequency * i / SAMPLE_RATE))
+                for i in range(voiced)
+            ]
+            self._tones[key] = struct.pack(f'<{voiced}h', *samples) + b'\x00\x00' * (frames - voiced)
+        return self._tones[key]
+
+    def _write(self, text: str, path: str):
+        """Write the synthetic speech for a text."""
+        frames = int(SAMPLE_RATE * 60 / max(1, int(self.properties['rate'])))
+        with wave.open(str(path), 'wb') as out:
+            out.setnchannels(1)
+            out.setsampwidth(2)
+            out.setframerate(SAMPLE_RATE)
+            for word in text.split():
+                out.writeframes(self._tone(zlib.crc32(word.encode('utf-8')) % TONE_COUNT, frames))
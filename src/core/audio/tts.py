@@ -1,45 +1,113 @@
 """Text-to-speech generator for BeAnonymous."""
 
 import os
-import pyttsx3
+import shutil
 import subprocess
-from ...config.settings import TEMP_PATH
+from ...config.settings import TEMP_PATH, TTS_BACKEND_ENV, TTS_BACKEND_STUB
 from pathlib import Path
 from ..utils.logger import get_logger
 from ..utils.settings_manager import SettingsManager
+from ..utils.tracing import span
+from .chunked_tts import ChunkedSynthesizer, split_script
 
 logger = get_logger('TTS')
 
+def create_engine():
+    """Create a pyttsx3 engine.
+    
+    The deterministic stub engine is used instead when the
+    BEANONYMOUS_TTS_BACKEND environment variable is "stub". Child
+    processes inherit it, so worker and chunk pools use the stub too.
+    
+    Returns:
+        pyttsx3.Engine: Initialized engine
+    """
+    if os.environ.get(TTS_BACKEND_ENV) == TTS_BACKEND_STUB:
+        from .stub_tts import StubEngine
+        return StubEngine()
+    # Imported here so loading the GUI or a cached render never pays for it
+    import pyttsx3
+    return pyttsx3.init()
+
+def configure_engine(engine, voice_id, rate):
+    """Apply voice and rate settings to an engine.
+    
+    Args:
+        engine: pyttsx3 engine
+        voice_id (int): Index into the engine's voice list
+        rate (int): Speech rate in words per minute
+    """
+    voices = engine.getProperty('voices')
+    engine.setProperty('voice', voices[voice_id].id)
+    engine.setProperty('rate', rate)
+
 class TTS:
     """Text-to-speech generator class with pitch adjustment capabilities."""
     
-    def __init__(self, text, output_path=None):
+    def __init__(self, text, output_path=None, voice_id=None, rate=None, pitch_factor=None,
+                 workspace=None, defer_pitch=False, use_worker=None, use_cache=None,
+                 chunked=None, cancel_token=None):
         """Initialize TTS generator.
         
         Args:
             text (str): Text to convert to speech
             output_path (str, optional): Path to save the final processed audio file
+            voice_id (int, optional): Voice index, overrides the saved setting
+            rate (int, optional): Speech rate in words per minute, overrides the saved setting
+            pitch_factor (float, optional): Pitch factor, overrides the saved setting
+            workspace (JobWorkspace, optional): Job workspace for intermediate files,
+                defaults to the shared TEMP_PATH
+            defer_pitch (bool): Skip the pitch pass and leave the lossless WAV as
+                the output, so the pitch filter can run inside the final render.
+                output_path then gets a .wav suffix.
+            use_worker (bool, optional): Synthesize in the long-lived TTS worker
+                process instead of a new engine, defaults to the 'use_tts_worker' setting
+            use_cache (bool, optional): Reuse identical narrations from the narration
+                cache, defaults to the 'narration_cache' setting
+            chunked (bool, optional): Synthesize multi-sentence scripts chunk by chunk
+                in parallel with a per-chunk cache, defaults to the 'chunked_tts' setting
+            cancel_token (CancelToken, optional): Stops synthesis and kills the
+                engine or ffmpeg child when cancelled
         """
         self.text = text
+        self.cancel_token = cancel_token
+        self.defer_pitch = defer_pitch
+        settings = SettingsManager.load_settings()
+        self.use_worker = settings.get('use_tts_worker', True) if use_worker is None else use_worker
+        self.use_cache = settings.get('narration_cache', True) if use_cache is None else use_cache
+        self.chunked = settings.get('chunked_tts', True) if chunked is None else chunked
+        self.voice_id = voice_id
+        self.rate = rate
+        self.pitch_factor = pitch_factor
+
+        self.workspace = workspace
+        temp_dir = workspace.path if workspace else TEMP_PATH
 
         # Create temp directory if it doesn't exist
-        TEMP_PATH.mkdir(parents=True, exist_ok=True)
+        temp_dir.mkdir(parents=True, exist_ok=True)
 
         # Setup paths using pathlib and make them absolute 
-        self.temp_path = TEMP_PATH.resolve() / "normal_audio.mp3"
-        self.output_path = TEMP_PATH.resolve() / "final_tts.mp3" if output_path is None else Path(output_path).resolve()
+        # The raw engine output is kept as lossless WAV
+        self.temp_path = temp_dir.resolve() / "normal_audio.wav"
+        self.output_path = temp_dir.resolve() / "final_tts.mp3" if output_path is None else Path(output_path).resolve()
+        if defer_pitch:
+            # Without a pitch pass the raw WAV is the final narration, keep
+            # a .wav name even if an .mp3 output was asked for
+            if output_path is not None:
+                self.temp_path = self.output_path.with_suffix('.wav')
+            self.output_path = self.temp_path
         
         logger.info(f"Using temp path: {self.temp_path}")
         logger.info(f"Using output path: {self.output_path}")
         
-        self._init_engine()
+        self.voice_id = settings['tts_voice_id'] if self.voice_id is None else self.voice_id
+        self.rate = settings['tts_rate'] if self.rate is None else self.rate
+        # The engine is created lazily so cache hits never touch pyttsx3
+        self.engine = None
     def _init_engine(self):
         """Initialize the TTS engine with default settings."""
-        self.engine = pyttsx3.init()
-        settings = SettingsManager.load_settings()
-        voices = self.engine.getProperty('voices')
-        self.engine.setProperty('voice', voices[settings['tts_voice_id']].id)
-        self.engine.setProperty('rate', settings['tts_rate'])
+        self.engine = create_engine()
+        configure_engine(self.engine, self.voice_id, self.rate)
     
     def _generate_tts(self):
         """Generate initial TTS audio file.
@@ -61,8 +129,24 @@ class TTS:
             logger.info(f"Using absolute path: {abs_temp_path}")
             
             # Save the file
-            self.engine.save_to_file(self.text, abs_temp_path)
-            self.engine.runAndWait()
+            if self.chunked and len(split_script(self.text)) > 1:
+                with span('synthesize', outputs=[abs_temp_path], backend='chunked'):
+                    ChunkedSynthesizer(self.voice_id, self.rate).synthesize(
+                        self.text, abs_temp_path, self.cancel_token)
+            elif self.use_worker:
+                from .tts_worker import get_worker
+                with span('synthesize', outputs=[abs_temp_path], backend='worker'):
+                    get_worker().synthesize(self.text, abs_temp_path, self.voice_id, self.rate,
+                                            self.cancel_token)
+            else:
+                # The in-process engine cannot be interrupted, only skipped
+                if self.cancel_token:
+                    self.cancel_token.raise_if_cancelled()
+                with span('synthesize', outputs=[abs_temp_path], backend='engine'):
+                    if self.engine is None:
+                        self._init_engine()
+                    self.engine.save_to_file(self.text, abs_temp_path)
+                    self.engine.runAndWait()
             
             # Verify file was created
             if self.temp_path.exists():
@@ -86,12 +170,51 @@ class TTS:
         try:
             logger.info("Adjusting audio pitch...")
             from ..audio.processor import AudioProcessor
-            AudioProcessor.convert_pitch(self.temp_path, self.output_path)
+            AudioProcessor.convert_pitch(self.temp_path, self.output_path, self.pitch_factor,
+                                         workspace=self.workspace,
+                                         cancel_token=self.cancel_token)
             return True
         except Exception as e:
             logger.error(f"Pitch adjustment failed: {str(e)}")
             return False
     
+    def _cache_key(self):
+        """Build the narration cache key for this request."""
+        from .narration_cache import NarrationCache
+        from .processor import AudioProcessor
+        pitch_factor = None if self.defer_pitch else AudioProcessor.resolve_pitch_factor(self.pitch_factor)
+        return NarrationCache.key_for(self.text, self.voice_id, self.rate, pitch_factor)
+    
+    def _restore_from_cache(self, cache_key):
+        """Copy a cached narration to the output path.
+        
+        Returns:
+            bool: True on a cache hit
+        """
+        from .narration_cache import NarrationCache
+        cached = NarrationCache.get(cache_key)
+        if cached is None:
+            return False
+        self.output_path.parent.mkdir(parents=True, exist_ok=True)
+        try:
+            shutil.copyfile(cached, self.output_path)
+        except FileNotFoundError:
+            # Evicted by another process sharing the cache since the lookup
+            logger.info("Cached narration was evicted before it could be restored")
+            return False
+        logger.info(f"Narration restored from cache to {self.output_path}")
+        return True
+    
+    def _store_in_cache(self, cache_key):
+        """Copy the finished narration into the cache."""
+        from .narration_cache import NarrationCache
+        try:
+            staged = self.output_path.with_name(f"{self.output_path.stem}.cache{self.output_path.suffix}")
+            shutil.copyfile(self.output_path, staged)
+            NarrationCache.put(cache_key, staged, self.output_path.suffix)
+        except Exception as e:
+            logger.error(f"Failed to store narration in cache: {e}")
+    
     def generate(self):
         """Generate TTS audio file with pitch adjustment.
         
@@ -100,6 +223,16 @@ class TTS:
         """
         logger.info("=== Starting TTS Generation Process ===")
         
+        cache_key = self._cache_key() if self.use_cache else None
+        if cache_key:
+            with span('narration_cache') as lookup:
+                hit = self._restore_from_cache(cache_key)
+                if lookup:
+                    lookup.attrs['hit'] = hit
+        if cache_key and hit:
+            logger.info("TTS Generation Process Complete")
+            return True
+        
         # First generate the initial TTS
         logger.info("Generating initial TTS...")
         if not self._generate_tts():
@@ -109,16 +242,22 @@ class TTS:
         logger.info(f"Initial TTS file exists: {self.temp_path.exists()}")
         if self.temp_path.exists():
             logger.info(f"Initial TTS file size: {self.temp_path.stat().st_size} bytes")
-            
-        # Then adjust the pitch
-        logger.info("Adjusting pitch...")
-        if not self._adjust_pitch():
-            logger.error("Failed to adjust pitch")
-            return False
+        
+        if self.defer_pitch:
+            logger.info("Pitch adjustment deferred to the final render")
+        else:
+            # Then adjust the pitch
+            logger.info("Adjusting pitch...")
+            if not self._adjust_pitch():
+                logger.error("Failed to adjust pitch")
+                return False
             
         logger.info(f"Output file exists: {self.output_path.exists()}")
         if self.output_path.exists():
             logger.info(f"Output file size: {self.output_path.stat().st_size} bytes")
         
+        if cache_key:
+            self._store_in_cache(cache_key)
+        
         logger.info("TTS Generation Process Complete")
         return True
@@ -0,0 +1,196 @@
+"""Long-lived text-to-speech worker process for BeAnonymous."""
+
+import itertools
+import multiprocessing
+import queue
+import threading
+from pathlib import Path
+from typing import Optional
+from ..utils.cancel import JobCancelled
+from ..utils.logger import get_logger
+from ..utils.settings_manager import SettingsManager
+
+logger = get_logger('TTS WORKER')
+
+# Seconds between checks for crashes, timeouts and cancellation
+POLL_INTERVAL = 0.25
+
+class TTSWorkerError(RuntimeError):
+    """Raised when the worker fails, hangs or dies during a request."""
+
+def _worker_main(requests, responses):
+    """Serve synthesis requests with one initialized engine.
+
+    pyttsx3 shares a single engine per driver inside a process, so the
+    engine is created once and voice/rate are only re-applied when a
+    request asks for a different configuration.
+
+    Args:
+        requests: Queue of request dicts (id, text, path, voice_id, rate), None to stop
+        responses: Queue receiving (id, ok, error) tuples
+    """
+    from .tts import create_engine, configure_engine
+
+    try:
+        engine = create_engine()
+        init_error = None
+    except Exception as e:
+        engine = None
+        init_error = f"TTS engine failed to start: {e}"
+    configuration = None
+    while True:
+        request = requests.get()
+        if request is None:
+            break
+        if init_error:
+            responses.put((request['id'], False, init_error))
+            continue
+        try:
+            wanted = (request['voice_id'], request['rate'])
+            if wanted != configuration:
+                configure_engine(engine, *wanted)
+                configuration = wanted
+            engine.save_to_file(request['text'], request['path'])
+            engine.runAndWait()
+            ok = Path(request['path']).exists()
+            responses.put((request['id'], ok, None if ok else "TTS file was not created"))
+        except Exception as e:
+            responses.put((request['id'], False, str(e)))
+
+class TTSWorker:
+    """Client for a TTS engine process that survives across jobs.
+
+    Requests are sent over a queue; if the process crashes or a request
+    exceeds its timeout, the process is killed and a fresh one is started.
+    """
+
+    def __init__(self, timeout: Optional[float] = None):
+        """Initialize the worker client. The process starts on first use.
+
+        Args:
+            timeout (float, optional): Base request timeout in seconds,
+                defaults to the 'tts_worker_timeout' setting
+        """
+        if timeout is None:
+            timeout = SettingsManager.get_setting('tts_worker_timeout', 120)
+        self.timeout = float(timeout)
+        self._context = multiprocessing.get_context('spawn')
+        self._process = None
+        self._requests = None
+        self._responses = None
+        self._ids = itertools.count(1)
+        self._lock = threading.Lock()
+
+    def start(self) -> None:
+        """Start the worker process if it is not running."""
+        if self._process is not None and self._process.is_alive():
+            return
+        self._requests = self._context.Queue()
+        self._responses = self._context.Queue()
+        self._process = self._context.Process(
+            target=_worker_main,
+            args=(self._requests, self._responses),
+            name="beanonymous-tts",
+            daemon=True
+        )
+        self._process.start()
+        logger.info(f"Started TTS worker (pid {self._process.pid})")
+
+    def stop(self) -> None:
+        """Stop the worker process, killing it if it does not exit."""
+        if self._process is None:
+            return
+        if self._process.is_alive():
+            try:
+                self._requests.put(None)
+            except Exception:
+                pass
+            self._process.join(timeout=2)
+            if self._process.is_alive():
+                self._process.kill()
+                self._process.join()
+        logger.info("Stopped TTS worker")
+        self._process = None
+
+    def kill(self) -> None:
+        """Kill the worker process immediately, start() brings up a new one."""
+        if self._process is not None and self._process.is_alive():
+            self._process.kill()
+            self._process.join()
+        self._process = None
+
+    def restart(self) -> None:
+        """Kill the current worker process and start a fresh one."""
+        self.kill()
+        self.start()
+
+    def _request_timeout(self, text: str) -> float:
+        """Scale the timeout with the script length (~15 chars per second spoken)."""
+        return self.timeout + len(text) / 15
+
+    def synthesize(self, text: str, output_path, voice_id: int, rate: int,
+                   cancel_token=None) -> None:
+        """Synthesize text to a file in the worker process.
+
+        Args:
+            text (str): Text to convert to speech
+            output_path (str): Destination audio file
+            voice_id (int): Voice index
+            rate (int): Speech rate in words per minute
+            cancel_token (CancelToken, optional): Kills the worker when cancelled,
+                a fresh one is started on the next request
+
+        Raises:
+            TTSWorkerError: If synthesis fails, times out or the worker dies
+            JobCancelled: If the cancel token is cancelled during synthesis
+        """
+        with self._lock:
+            self.start()
+            request_id = next(self._ids)
+            self._requests.put({
+                'id': request_id,
+                'text': text,
+                'path': str(Path(output_path).resolve()),
+                'voice_id': voice_id,
+                'rate': rate
+            })
+            timeout = self._request_timeout(text)
+            waited = 0.0
+            while True:
+                try:
+                    response_id, ok, error = self._responses.get(timeout=POLL_INTERVAL)
+                except queue.Empty:
+                    waited += POLL_INTERVAL
+                    if cancel_token and cancel_token.cancelled:
+                        logger.info("TTS request cancelled, killing worker")
+                        self.kill()
+                        raise JobCancelled()
+                    if not self._process.is_alive():
+                        logger.error("TTS worker died, restarting")
+                        self.restart()
+                        raise TTSWorkerError("TTS worker crashed during synthesis")
+                    if waited >= timeout:
+                        logger.error(f"TTS worker hung for {timeout:.0f}s, restarting")
+                        self.restart()
+                        raise TTSWorkerError("TTS worker timed out")
+                    continue
+                if response_id != request_id:
+                    continue  # Stale answer from a request that already timed out
+                if not ok:
+                    raise TTSWorkerError(error)
+                return
+
+_worker: Optional[TTSWorker] = None
+_worker_lock = threading.Lock()
+
+def get_worker() -> TTSWorker:
+    """Get the process-wide TTS worker, creating it on first use.
+
+    Returns:
+        TTSWorker: Shared worker client
+    """
+    global _worker
+    with _worker_lock:
+        if _worker is None:
+            _worker = TTSWorker()
+        return _worker
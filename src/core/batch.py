@@ -0,0 +1,151 @@
+"""Headless batch rendering driven by a JSONL or CSV manifest."""
+
+import csv
+import json
+import multiprocessing
+import os
+import time
+import traceback
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from pathlib import Path
+from typing import Dict, List
+from .audio.chunked_tts import ChunkedSynthesizer
+from .pipeline import RenderJob, render_job
+from .utils.logger import get_logger
+
+logger = get_logger('BATCH')
+
+# Per-process slots shared by all pool workers, set by _init_worker
+_tts_slot = None
+_ffmpeg_slot = None
+
+def load_manifest(manifest_path) -> List[Dict]:
+    """Read manifest rows from a JSONL or CSV file.
+
+    Args:
+        manifest_path (str): Path to a .jsonl/.json-lines or .csv manifest
+
+    Returns:
+        List[Dict]: One dict per job, in file order
+    """
+    manifest_path = Path(manifest_path)
+    if not manifest_path.exists():
+        raise FileNotFoundError(f"Manifest not found: {manifest_path}")
+
+    if manifest_path.suffix.lower() == '.csv':
+        with open(manifest_path, 'r', newline='', encoding='utf-8') as f:
+            rows = list(csv.DictReader(f))
+    else:
+        rows = []
+        with open(manifest_path, 'r', encoding='utf-8') as f:
+            for line in f:
+                if line.strip():
+                    rows.append(json.loads(line))
+
+    # Give every row a stable id for the results file
+    for number, row in enumerate(rows, start=1):
+        if not row.get('id'):
+            row['id'] = f"job-{number:04d}"
+    return rows
+
+def _init_worker(tts_slot, ffmpeg_slot, chunk_workers):
+    """Store the shared concurrency slots in a pool worker and size its TTS chunk pool."""
+    global _tts_slot, _ffmpeg_slot
+    _tts_slot = tts_slot
+    _ffmpeg_slot = ffmpeg_slot
+    ChunkedSynthesizer.set_default_workers(chunk_workers)
+
+def _run_job(row: Dict) -> Dict:
+    """Render one manifest row inside a pool worker.
+
+    Args:
+        row (Dict): Manifest row
+
+    Returns:
+        Dict: Result record with status, exit code, timings, trace and error
+    """
+    started_at = time.time()
+    result = {'id': row.get('id'), 'output': row.get('output'), 'started_at': started_at}
+    try:
+        job = RenderJob.from_dict(row)
+        rendered = render_job(job, tts_slot=_tts_slot, ffmpeg_slot=_ffmpeg_slot)
+        result.update(status='ok', exit_code=0, error=None, **rendered)
+    except Exception as e:
+        logger.error(f"Job {row.get('id')} failed: {e}")
+        result.update(status='failed', exit_code=1, error=str(e),
+                      traceback=traceback.format_exc(), timings={})
+    result['finished_at'] = time.time()
+    result['timings'].setdefault('total', result['finished_at'] - started_at)
+    return result
+
+class BatchRunner:
+    """Runs manifest jobs on a bounded process pool."""
+
+    def __init__(self, workers=1, tts_jobs=1, ffmpeg_jobs=1):
+        """Initialize the batch runner.
+
+        Args:
+            workers (int): Number of pool processes
+            tts_jobs (int): Maximum concurrent TTS stages across the pool
+            ffmpeg_jobs (int): Maximum concurrent ffmpeg stages across the pool
+        """
+        self.workers = max(1, int(workers))
+        self.tts_jobs = max(1, int(tts_jobs))
+        self.ffmpeg_jobs = max(1, int(ffmpeg_jobs))
+
+    def run(self, rows: List[Dict], results_path) -> List[Dict]:
+        """Render all rows and append one result line per job.
+
+        Args:
+            rows (List[Dict]): Manifest rows
+            results_path (str): JSONL file receiving one record per finished job
+
+        Returns:
+            List[Dict]: Result records in completion order
+        """
+        results_path = Path(results_path)
+        results_path.parent.mkdir(parents=True, exist_ok=True)
+        tts_slot = multiprocessing.BoundedSemaphore(self.tts_jobs)
+        ffmpeg_slot = multiprocessing.BoundedSemaphore(self.ffmpeg_jobs)
+        # Only tts_jobs workers synthesize at once, so their chunk pools share the CPUs
+        chunk_workers = max(1, (os.cpu_count() or 2) // self.tts_jobs)
+
+        logger.info(
+            f"Rendering {len(rows)} job(s) with {self.workers} worker(s), "
+            f"{self.tts_jobs} TTS slot(s), {self.ffmpeg_jobs} ffmpeg slot(s)"
+        )
+        results = []
+        with open(results_path, 'w', encoding='utf-8') as results_file, \
+                ProcessPoolExecutor(max_workers=self.workers,
+                                    initializer=_init_worker,
+                                    initargs=(tts_slot, ffmpeg_slot, chunk_workers)) as pool:
+            futures = {pool.submit(_run_job, row): row for row in rows}
+            for future in as_completed(futures):
+                result = future.result()
+                results.append(result)
+                results_file.write(json.dumps(result) + "\n")
+                results_file.flush()
+                logger.info(
+                    f"[{len(results)}/{len(rows)}] {result['id']}: {result['status']} "
+                    f"in {result['timings']['total']:.1f}s"
+                )
+        return results
+
+def run_batch(manifest_path, results_path, workers=1, tts_jobs=1, ffmpeg_jobs=1) -> int:
+    """Render a manifest and write the results file.
+
+    Args:
+        manifest_path (str): JSONL or CSV manifest
+        results_path (str): JSONL results file
+        workers (int): Number of pool processes
+        tts_jobs (int): Maximum concurrent TTS stages
+        ffmpeg_jobs (int): Maximum concurrent ffmpeg stages
+
+    Returns:
+        int: Process exit code, 0 if every job succeeded
+    """
+    rows = load_manifest(manifest_path)
+    results = BatchRunner(workers, tts_jobs, ffmpeg_jobs).run(rows, results_path)
+    failed = sum(1 for result in results if result['status'] != 'ok')
+    logger.info(f"Batch finished: {len(results) - failed} ok, {failed} failed")
+    return 1 if failed else 0
@@ -0,0 +1,298 @@
+"""In-process render queue with a configurable number of parallel workers."""
+
+import threading
+import time
+from typing import Callable, List, Optional
+from .pipeline import RenderJob, render_job
+from .utils.cancel import CancelToken, JobCancelled
+from .utils.logger import get_logger
+from .utils.settings_manager import SettingsManager
+
+logger = get_logger('JOB QUEUE')
+
+# Job states
+STATUS_QUEUED = "queued"
+STATUS_RUNNING = "running"
+STATUS_DONE = "done"
+STATUS_FAILED = "failed"
+STATUS_CANCELLED = "cancelled"
+FINISHED_STATUSES = (STATUS_DONE, STATUS_FAILED, STATUS_CANCELLED)
+
+class QueuedJob:
+    """A RenderJob together with its live state in the queue."""
+
+    def __init__(self, job: RenderJob):
+        """Initialize a queued job.
+
+        Args:
+            job (RenderJob): Job to render, its job_id identifies the entry
+        """
+        self.job = job
+        self.reset()
+
+    @property
+    def id(self) -> str:
+        """Identifier of the job."""
+        return self.job.job_id
+
+    @property
+    def elapsed(self) -> Optional[float]:
+        """Seconds spent rendering so far, None if the job never started."""
+        if self.started_at is None:
+            return None
+        return (self.finished_at or time.time()) - self.started_at
+
+    @property
+    def finished(self) -> bool:
+        """Whether the job has stopped, successfully or not."""
+        return self.status in FINISHED_STATUSES
+
+    def reset(self) -> None:
+        """Return the job to the queued state with a fresh cancel token."""
+        self.status = STATUS_QUEUED
+        self.progress = 0.0
+        self.info = None
+        self.output = None
+        self.error = None
+        self.timings = {}
+        self.trace = None
+        self.started_at = None
+        self.finished_at = None
+        self.cancel_token = CancelToken()
+
+class JobQueue:
+    """Renders queued jobs in order on a bounded number of worker threads.
+
+    TTS and ffmpeg already run in child processes, so threads are enough
+    to keep several renders going at once.
+    """
+
+    def __init__(self, workers: Optional[int] = None,
+                 on_change: Optional[Callable[[QueuedJob], None]] = None):
+        """Initialize the queue.
+
+        Args:
+            workers (int, optional): Maximum parallel renders, defaults to
+                the 'queue_workers' setting
+            on_change: Optional callback receiving a QueuedJob whenever its
+                state or progress changes. Called from worker threads.
+        """
+        if workers is None:
+            workers = SettingsManager.get_setting('queue_workers', 2)
+            # Follow the setting when it is changed later, here or by another process
+            SettingsManager.subscribe(self._on_settings_change)
+        self.workers = max(1, int(workers))
+        self.on_change = on_change
+        self._jobs: List[QueuedJob] = []
+        self._lock = threading.Lock()
+        self._next_number = 1
+
+    def add(self, job: RenderJob) -> QueuedJob:
+        """Append a job and start it if a worker is free.
+
+        Args:
+            job (RenderJob): Job to render, an id is assigned if it has none
+
+        Returns:
+            QueuedJob: The queue entry
+        """
+        with self._lock:
+            if not job.job_id:
+                job.job_id = f"job-{self._next_number:04d}"
+            self._next_number += 1
+            queued = QueuedJob(job)
+            self._jobs.append(queued)
+        logger.info(f"Queued {queued.id}")
+        self._notify(queued)
+        self._dispatch()
+        return queued
+
+    def jobs(self) -> List[QueuedJob]:
+        """Get all entries in queue order.
+
+        Returns:
+            List[QueuedJob]: Snapshot of the queue
+        """
+        with self._lock:
+            return list(self._jobs)
+
+    def get(self, job_id: str) -> Optional[QueuedJob]:
+        """Look up an entry by job id.
+
+        Args:
+            job_id (str): Job identifier
+
+        Returns:
+            Optional[QueuedJob]: The entry, or None if unknown
+        """
+        with self._lock:
+            return next((queued for queued in self._jobs if queued.id == job_id), None)
+
+    @property
+    def running(self) -> int:
+        """Number of jobs currently rendering."""
+        with self._lock:
+            return sum(1 for queued in self._jobs if queued.status == STATUS_RUNNING)
+
+    def move(self, job_id: str, offset: int) -> bool:
+        """Move an entry up (negative offset) or down in the queue.
+
+        Args:
+            job_id (str): Job identifier
+            offset (int): Positions to move by
+
+        Returns:
+            bool: True if the entry moved
+        """
+        with self._lock:
+            index = next((i for i, queued in enumerate(self._jobs) if queued.id == job_id), None)
+            if index is None:
+                return False
+            target = min(max(index + offset, 0), len(self._jobs) - 1)
+            if target == index:
+                return False
+            self._jobs.insert(target, self._jobs.pop(index))
+            return True
+
+    def retry(self, job_id: str) -> bool:
+        """Queue a failed or cancelled job again.
+
+        Args:
+            job_id (str): Job identifier
+
+        Returns:
+            bool: True if the job was re-queued
+        """
+        queued = self.get(job_id)
+        if queued is None or queued.status not in (STATUS_FAILED, STATUS_CANCELLED):
+            return False
+        with self._lock:
+            queued.reset()
+        logger.info(f"Retrying {job_id}")
+        self._notify(queued)
+        self._dispatch()
+        return True
+
+    def cancel(self, job_id: str) -> bool:
+        """Cancel a queued or running job.
+
+        Queued jobs are marked cancelled immediately; running jobs have
+        their TTS/ffmpeg child killed and finish as cancelled shortly after.
+
+        Args:
+            job_id (str): Job identifier
+
+        Returns:
+            bool: True if the job was cancelled or is being cancelled
+        """
+        queued = self.get(job_id)
+        if queued is None or queued.finished:
+            return False
+        with self._lock:
+            if queued.status == STATUS_QUEUED:
+                queued.status = STATUS_CANCELLED
+                queued.finished_at = time.time()
+        queued.cancel_token.cancel()
+        logger.info(f"Cancelling {job_id}")
+        self._notify(queued)
+        return True
+
+    def remove(self, job_id: str) -> bool:
+        """Remove a job that is not running.
+
+        Args:
+            job_id (str): Job identifier
+
+        Returns:
+            bool: True if the job was removed
+        """
+        with self._lock:
+            for queued in self._jobs:
+                if queued.id == job_id and queued.status != STATUS_RUNNING:
+                    self._jobs.remove(queued)
+                    return True
+        return False
+
+    def clear_finished(self) -> None:
+        """Remove every finished job from the queue."""
+        with self._lock:
+            self._jobs = [queued for queued in self._jobs if not queued.finished]
+
+    def _on_settings_change(self, changed) -> None:
+        """Apply a changed 'queue_workers' setting."""
+        if 'queue_workers' in changed and int(changed['queue_workers']) != self.workers:
+            self.set_workers(changed['queue_workers'])
+
+    def set_workers(self, workers: int) -> None:
+        """Change the number of parallel renders.
+
+        Lowering the limit lets running jobs finish; it only affects
+        which queued jobs start next.
+
+        Args:
+            workers (int): Maximum parallel renders
+        """
+        self.workers = max(1, int(workers))
+        logger.info(f"Queue concurrency set to {self.workers}")
+        self._dispatch()
+
+    def cancel_all(self) -> None:
+        """Cancel every job that has not finished."""
+        for queued in self.jobs():
+            self.cancel(queued.id)
+
+    def _dispatch(self) -> None:
+        """Start queued jobs, in order, while workers are free."""
+        to_start = []
+        with self._lock:
+            running = sum(1 for queued in self._jobs if queued.status == STATUS_RUNNING)
+            for queued in self._jobs:
+                if running >= self.workers:
+                    break
+                if queued.status == STATUS_QUEUED:
+                    queued.status = STATUS_RUNNING
+                    queued.started_at = time.time()
+                    running += 1
+                    to_start.append(queued)
+        for queued in to_start:
+            threading.Thread(target=self._run, args=(queued,),
+                             name=f"render-{queued.id}", daemon=True).start()
+
+    def _run(self, queued: QueuedJob) -> None:
+        """Render one job on a worker thread, then start the next one."""
+        self._notify(queued)
+
+        def progress_callback(value, info=None):
+            queued.progress = value
+            queued.info = info
+            self._notify(queued)
+
+        try:
+            result = render_job(queued.job, progress_callback, cancel_token=queued.cancel_token)
+            queued.output = result['output']
+            queued.timings = result['timings']
+            queued.trace = result['trace']
+            queued.progress = 100.0
+            status = STATUS_DONE
+        except JobCancelled:
+            status = STATUS_CANCELLED
+        except Exception as e:
+            logger.error(f"Job {queued.id} failed: {e}")
+            queued.error = str(e)
+            status = STATUS_FAILED
+
+        with self._lock:
+            queued.status = status
+            queued.info = None
+            queued.finished_at = time.time()
+        logger.info(f"{queued.id} {status} after {queued.elapsed:.1f}s")
+        self._notify(queued)
+        self._dispatch()
+
+    def _notify(self, queued: QueuedJob) -> None:
+        """Report a change to the on_change callback."""
+        if self.on_change:
+            try:
+                self.on_change(queued)
+            except Exception as e:
+                logger.error(f"Queue listener failed: {e}")
@@ -0,0 +1,292 @@
+"""Render pipeline shared by the GUI and headless entry points."""
+
+import time
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
+from ..config.settings import (
+    VIDEO_OUTPUT_FILENAME,
+    DEFAULT_RENDER_MODE,
+    RENDER_MODE_STREAM_COPY,
+    RENDER_MODE_CACHED,
+    RENDER_MODE_SPECULATIVE
+)
+from .audio.tts import TTS
+from .video.generator import VideoGenerator
+from .video.speculative import SpeculativeBackground
+from .audio.processor import AudioProcessor
+from .scheduler import Stage, StageGraph
+from .utils.cancel import CancelToken
+from .utils.logger import get_logger
+from .utils.settings_manager import SettingsManager
+from .utils.tracing import annotate, trace_job
+from .utils.workspace import JobWorkspace
+
+logger = get_logger('PIPELINE')
+
+class RenderJob:
+    """Description of one TTS -> video render."""
+
+    def __init__(self, script, video, music, output, intro=False, voice_id=None,
+                 rate=None, pitch_factor=None, render_mode=DEFAULT_RENDER_MODE, job_id=None,
+                 fuse_pitch=None, encode_profile=None):
+        """Initialize a render job.
+
+        Args:
+            script (str): Narration text
+            video (str): Background video name or path
+            music (str): Background music name or path
+            output (str): Output .mp4 file, or a directory for the default file name
+            intro (bool): Whether to add the anonymous intro
+            voice_id (int, optional): Voice index, defaults to the saved setting
+            rate (int, optional): Speech rate, defaults to the saved setting
+            pitch_factor (float, optional): Pitch factor, defaults to the saved setting
+            render_mode (str): One of RENDER_MODES
+            job_id (str, optional): Identifier used in logs and results
+            fuse_pitch (bool, optional): Apply the pitch filter inside the final
+                render instead of a separate pass, defaults to the saved setting
+            encode_profile (str, optional): One of ENCODE_PROFILES, defaults to
+                the saved setting
+        """
+        self.script = script
+        self.video = video
+        self.music = music
+        self.output = str(output)
+        self.intro = intro
+        self.voice_id = voice_id
+        self.rate = rate
+        self.pitch_factor = pitch_factor
+        self.render_mode = render_mode
+        self.job_id = job_id
+        if fuse_pitch is None:
+            fuse_pitch = SettingsManager.get_setting('fuse_pitch', True)
+        self.fuse_pitch = fuse_pitch
+        self.encode_profile = encode_profile
+
+    @property
+    def output_dir(self) -> Path:
+        """Directory the final video is written to."""
+        output = Path(self.output)
+        return output.parent if output.suffix.lower() == '.mp4' else output
+
+    @property
+    def output_filename(self) -> str:
+        """File name of the final video."""
+        output = Path(self.output)
+        return output.name if output.suffix.lower() == '.mp4' else VIDEO_OUTPUT_FILENAME
+
+    @property
+    def output_file(self) -> Path:
+        """Full path of the final video."""
+        return self.output_dir / self.output_filename
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> 'RenderJob':
+        """Build a job from a manifest row.
+
+        Args:
+            data (Dict): Row with script, video, music, output and optional
+                intro, voice_id, rate, pitch_factor, render_mode, fuse_pitch,
+                encode_profile and id keys
+
+        Returns:
+            RenderJob: The parsed job
+        """
+        missing = [key for key in ('script', 'video', 'music', 'output') if not data.get(key)]
+        if missing:
+            raise ValueError(f"Missing required field(s): {', '.join(missing)}")
+
+        def optional(key, cast):
+            value = data.get(key)
+            return None if value in (None, '') else cast(value)
+
+        return cls(
+            script=data['script'],
+            video=data['video'],
+            music=data['music'],
+            output=data['output'],
+            intro=_parse_bool(data.get('intro', False)),
+            voice_id=optional('voice_id', int),
+            rate=optional('rate', int),
+            pitch_factor=optional('pitch_factor', float),
+            render_mode=data.get('render_mode') or DEFAULT_RENDER_MODE,
+            job_id=optional('id', str),
+            fuse_pitch=optional('fuse_pitch', _parse_bool),
+            encode_profile=optional('encode_profile', str)
+        )
+
+    def to_dict(self) -> Dict:
+        """Convert the job back to a manifest row.
+
+        Returns:
+            Dict: Serializable job description
+        """
+        return {
+            'id': self.job_id,
+            'script': self.script,
+            'video': self.video,
+            'music': self.music,
+            'output': self.output,
+            'intro': self.intro,
+            'voice_id': self.voice_id,
+            'rate': self.rate,
+            'pitch_factor': self.pitch_factor,
+            'render_mode': self.render_mode,
+            'fuse_pitch': self.fuse_pitch,
+            'encode_profile': self.encode_profile
+        }
+
+def _parse_bool(value) -> bool:
+    """Parse booleans from JSON or CSV manifest values."""
+    if isinstance(value, str):
+        return value.strip().lower() in ('1', 'true', 'yes', 'y', 'on')
+    return bool(value)
+
+def render_job(job: RenderJob,
+               progress_callback: Optional[Callable[[float], None]] = None,
+               tts_slot=None,
+               ffmpeg_slot=None,
+               workspace: Optional[JobWorkspace] = None,
+               cancel_token: Optional[CancelToken] = None) -> Dict:
+    """Run TTS and video generation for one job.
+
+    Args:
+        job (RenderJob): Job to render
+        progress_callback: Optional callback receiving overall progress (0-100),
+            plus a ProgressInfo while ffmpeg is encoding
+        tts_slot: Optional context manager held while synthesizing speech
+        ffmpeg_slot: Optional context manager held while running ffmpeg
+        workspace (JobWorkspace, optional): Workspace for intermediate files.
+            A fresh one is created (and removed afterwards) when omitted.
+        cancel_token (CancelToken, optional): Stops the job and kills its
+            running TTS/ffmpeg child when cancelled
+
+    Returns:
+        Dict: Stage timings in seconds, the output file path, the critical
+            path (see StageGraph.critical_path) and the job's trace record
+            (see tracing.JobTrace)
+
+    Raises:
+        RuntimeError: If TTS or video generation fails
+        JobCancelled: If the cancel token is cancelled
+    """
+    owns_workspace = workspace is None
+    if owns_workspace:
+        workspace = JobWorkspace(job.job_id)
+    try:
+        with trace_job(job.job_id) as trace:
+            result = _render_in_workspace(job, workspace, progress_callback, tts_slot,
+                                          ffmpeg_slot, cancel_token)
+        result['trace'] = trace.to_dict()
+        return result
+    finally:
+        if owns_workspace:
+            workspace.cleanup()
+
+def _render_in_workspace(job, workspace, progress_callback, tts_slot, ffmpeg_slot,
+                         cancel_token=None) -> Dict:
+    """Run the render stages with all intermediate files in `workspace`."""
+    start = time.perf_counter()
+    job_output = job.output_file
+    logger.info(f"Rendering job {job.job_id or ''} to {job_output}")
+
+    if progress_callback:
+        progress_callback(0)
+    job.output_dir.mkdir(parents=True, exist_ok=True)
+    graph = StageGraph(render_stages(job, workspace, progress_callback, tts_slot, ffmpeg_slot,
+                                     cancel_token))
+    graph.run(cancel_token)
+
+    timings = graph.timings()
+    timings['total'] = time.perf_counter() - start
+    critical_path = graph.critical_path()
+    annotate(critical_path=critical_path)
+    logger.info(f"Critical path {' -> '.join(critical_path['stages'])} "
+                f"({critical_path['seconds']:.1f}s of {timings['total']:.1f}s)")
+    return {'output': str(job_output), 'timings': timings, 'critical_path': critical_path}
+
+def render_stages(job, workspace, progress_callback=None, tts_slot=None, ffmpeg_slot=None,
+                  cancel_token=None) -> List[Stage]:
+    """Describe a render as stages for the StageGraph.
+
+    'tts' synthesizes the narration while 'background' (and 'intro')
+    probe or ingest the clips; 'video' starts once all of them are done.
+    In the speculative render mode 'background' also encodes the looped
+    background from the estimated narration length.
+
+    Args:
+        job (RenderJob): Job to render
+        workspace (JobWorkspace): Workspace for intermediate files
+        progress_callback: Optional callback receiving overall progress (0-100)
+        tts_slot: Optional context manager held while synthesizing speech
+        ffmpeg_slot: Optional context manager held while running ffmpeg
+        cancel_token (CancelToken, optional): Stops the job when cancelled
+
+    Returns:
+        List[Stage]: The stages of the render
+    """
+    # Only the mezzanine-based modes may encode while preparing the clips
+    mezzanine_modes = (RENDER_MODE_STREAM_COPY, RENDER_MODE_CACHED, RENDER_MODE_SPECULATIVE)
+    prepare_slot = ffmpeg_slot if job.render_mode in mezzanine_modes else None
+
+    def synthesize(inputs):
+        tts = TTS(job.script, voice_id=job.voice_id, rate=job.rate,
+                  pitch_factor=job.pitch_factor, workspace=workspace,
+                  defer_pitch=job.fuse_pitch, cancel_token=cancel_token)
+        if not tts.generate():
+            raise RuntimeError("TTS generation failed")
+        if progress_callback:
+            progress_callback(40)
+        return {'narration': tts.output_path}
+
+    def prepare_background(inputs):
+        duration = VideoGenerator.prepare_background(job.video, job.render_mode, cancel_token)
+        if job.render_mode != RENDER_MODE_SPECULATIVE:
+            return {'background_duration': duration, 'speculative_background': None}
+        rate = job.rate if job.rate is not None else SettingsManager.get_setting('tts_rate')
+        background = SpeculativeBackground(VideoGenerator.resolve_video(job.video),
+                                           workspace.path / 'speculative', cancel_token)
+        background.encode(SpeculativeBackground.estimate_duration(job.script, rate, job.pitch_factor))
+        return {'background_duration': duration, 'speculative_background': background}
+
+    def prepare_intro(inputs):
+        return {'intro_duration': VideoGenerator.prepare_intro(job.render_mode,
+                                                               cancel_token=cancel_token)}
+
+    def render(inputs):
+        generator = VideoGenerator(
+            job.video,
+            job.music,
+            job.output_dir,
+            job.intro,
+            render_mode=job.render_mode,
+            output_filename=job.output_filename,
+            workspace=workspace,
+            tts_path=inputs['narration'],
+            pitch_factor=AudioProcessor.resolve_pitch_factor(job.pitch_factor) if job.fuse_pitch else None,
+            cancel_token=cancel_token,
+            encode_profile=job.encode_profile,
+            speculative_background=inputs['speculative_background']
+        )
+
+        def video_progress(value, info=None):
+            if progress_callback:
+                if info is None:
+                    progress_callback(40 + value * 0.6)
+                else:
+                    progress_callback(40 + value * 0.6, info)
+
+        if not generator.generate(progress_callback=video_progress):
+            raise RuntimeError("Video generation failed")
+        return {'output': job.output_file}
+
+    stages = [
+        Stage('tts', synthesize, outputs=['narration'], slot=tts_slot),
+        Stage('background', prepare_background,
+              outputs=['background_duration', 'speculative_background'], slot=prepare_slot)
+    ]
+    video_inputs = ['narration', 'background_duration', 'speculative_background']
+    if job.intro:
+        stages.append(Stage('intro', prepare_intro, outputs=['intro_duration'], slot=prepare_slot))
+        video_inputs.append('intro_duration')
+    stages.append(Stage('video', render, inputs=video_inputs, outputs=['output'], slot=ffmpeg_slot))
+    return stages
@@ -0,0 +1,106 @@
+"""Fast low-resolution previews of the start of a script."""
+
+import uuid
+from typing import Callable, Dict, Optional
+from ..config.settings import (
+    PREVIEW_SECONDS,
+    PREVIEW_SENTENCES,
+    PREVIEW_PATH,
+    ENCODE_PROFILE_PREVIEW,
+    RENDER_MODE_SINGLE_PASS
+)
+from .audio.chunked_tts import split_script
+from .audio.processor import AudioProcessor
+from .pipeline import RenderJob, render_job
+from .utils.cancel import CancelToken
+from .utils.logger import get_logger
+from .utils.settings_manager import SettingsManager
+
+logger = get_logger('PREVIEW')
+
+def preview_script(text: str,
+                   sentences: int = PREVIEW_SENTENCES,
+                   seconds: float = PREVIEW_SECONDS,
+                   rate: Optional[int] = None,
+                   pitch_factor: Optional[float] = None) -> str:
+    """Cut a script down to what fits in a preview.
+
+    Keeps the first `sentences` sentences, then trims words so the
+    narration lasts about `seconds` once the pitch filter has slowed it down.
+
+    Args:
+        text (str): Full narration text
+        sentences (int): Maximum number of sentences
+        seconds (float): Target narration length in seconds
+        rate (int, optional): Speech rate in words per minute, defaults to the saved setting
+        pitch_factor (float, optional): Pitch factor, defaults to the saved setting
+
+    Returns:
+        str: Preview narration text
+    """
+    if rate is None:
+        rate = SettingsManager.get_setting('tts_rate', 195)
+    pitch_factor = AudioProcessor.resolve_pitch_factor(pitch_factor)
+
+    words = ' '.join(split_script(text)[:sentences]).split()
+    # Seconds of raw speech that the pitch filter stretches to `seconds`
+    raw_seconds = seconds / AudioProcessor.pitch_stretch(pitch_factor)
+    max_words = max(1, int(raw_seconds * rate / 60))
+    return ' '.join(words[:max_words])
+
+def _clear_old_previews() -> None:
+    """Delete earlier preview files, skipping any still open in a player."""
+    if not PREVIEW_PATH.exists():
+        return
+    for old_preview in PREVIEW_PATH.glob('preview-*.mp4'):
+        try:
+            old_preview.unlink()
+        except OSError:
+            pass
+
+def render_preview(script: str, video: str, music: str,
+                   voice_id: Optional[int] = None,
+                   rate: Optional[int] = None,
+                   pitch_factor: Optional[float] = None,
+                   progress_callback: Optional[Callable[[float], None]] = None,
+                   cancel_token: Optional[CancelToken] = None) -> Dict:
+    """Render the start of a script at low resolution into a temp file.
+
+    Uses the regular render pipeline with the preview encode profile,
+    no intro and the fused single-pass render.
+
+    Args:
+        script (str): Full narration text
+        video (str): Background video name or path
+        music (str): Background music name or path
+        voice_id (int, optional): Voice index, defaults to the saved setting
+        rate (int, optional): Speech rate, defaults to the saved setting
+        pitch_factor (float, optional): Pitch factor, defaults to the saved setting
+        progress_callback: Optional callback receiving progress (0-100)
+        cancel_token (CancelToken, optional): Stops the preview when cancelled
+
+    Returns:
+        Dict: render_job result with the preview file in 'output'
+    """
+    text = preview_script(script, rate=rate, pitch_factor=pitch_factor)
+    if not text:
+        raise ValueError("Script contains no speakable text")
+
+    _clear_old_previews()
+    PREVIEW_PATH.mkdir(parents=True, exist_ok=True)
+    job = RenderJob(
+        script=text,
+        video=video,
+        music=music,
+        output=PREVIEW_PATH / f"preview-{uuid.uuid4().hex[:8]}.mp4",
+        intro=False,
+        voice_id=voice_id,
+        rate=rate,
+        pitch_factor=pitch_factor,
+        render_mode=RENDER_MODE_SINGLE_PASS,
+        job_id="preview",
+        fuse_pitch=True,
+        encode_profile=ENCODE_PROFILE_PREVIEW
+    )
+    logger.info(f"Rendering preview of {len(text.split())} word(s)")
+    return render_job(job, progress_callback, cancel_token=cancel_token)
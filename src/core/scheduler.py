@@ -0,0 +1,212 @@
+"""Dependency-driven scheduler for the stages of one render."""
+
+import contextlib
+import contextvars
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from typing import Callable, Dict, Iterable, List, Optional
+from .utils.cancel import CancelToken, JobCancelled
+from .utils.logger import get_logger
+from .utils.tracing import span
+
+logger = get_logger('SCHEDULER')
+
+class StageGraphError(ValueError):
+    """Raised when stages do not form a valid graph."""
+
+class Stage:
+    """One unit of render work with declared inputs and outputs."""
+
+    def __init__(self, name: str, run: Callable[[Dict], Optional[Dict]],
+                 inputs: Iterable[str] = (), outputs: Iterable[str] = (), slot=None):
+        """Initialize the stage.
+
+        Args:
+            name (str): Unique stage name, also used for its trace span
+            run: Callable receiving a dict of its input artifacts by name and
+                returning a dict with every declared output
+            inputs (Iterable[str]): Artifacts that must exist before the stage starts
+            outputs (Iterable[str]): Artifacts the stage produces
+            slot: Optional context manager held while the stage runs
+        """
+        self.name = name
+        self.run = run
+        self.inputs = tuple(inputs)
+        self.outputs = tuple(outputs)
+        self.slot = slot
+
+class StageGraph:
+    """Runs stages as soon as their inputs exist.
+
+    Independent stages run at the same time on a small thread pool, so
+    e.g. background preparation overlaps speech synthesis. After a run,
+    timings() gives each stage's start and end, and critical_path() the
+    chain of stages that determined the total time.
+    """
+
+    def __init__(self, stages: Iterable[Stage], initial: Optional[Dict] = None):
+        """Initialize and validate the graph.
+
+        Args:
+            stages (Iterable[Stage]): Stages of the render
+            initial (Dict, optional): Artifacts available before any stage runs
+
+        Raises:
+            StageGraphError: On duplicate stages or outputs, missing inputs or cycles
+        """
+        self.stages = list(stages)
+        self.artifacts = dict(initial or {})
+        self._producers = {}
+        for stage in self.stages:
+            for output in stage.outputs:
+                if output in self._producers or output in self.artifacts:
+                    raise StageGraphError(f"Artifact '{output}' is produced twice")
+                self._producers[output] = stage
+        names = [stage.name for stage in self.stages]
+        if len(set(names)) != len(names):
+            raise StageGraphError("Stage names must be unique")
+        for stage in self.stages:
+            missing = [name for name in stage.inputs
+                       if name not in self._producers and name not in self.artifacts]
+            if missing:
+                raise StageGraphError(f"Stage '{stage.name}' needs unknown input(s): {', '.join(missing)}")
+        self._order = self._topological_order()
+        self._times: Dict[str, Dict] = {}
+        self._start = None
+
+    def dependencies(self, stage: Stage) -> List[Stage]:
+        """Stages producing the inputs of a stage."""
+        return list({id(self._producers[name]): self._producers[name]
+                     for name in stage.inputs if name in self._producers}.values())
+
+    def _topological_order(self) -> List[Stage]:
+        """Order the stages so each comes after its dependencies.
+
+        Raises:
+            StageGraphError: If the stages depend on each other in a cycle
+        """
+        order, visiting, done = [], set(), set()
+
+        def visit(stage):
+            if stage.name in done:
+                return
+            if stage.name in visiting:
+                raise StageGraphError(f"Stage '{stage.name}' is part of a dependency cycle")
+            visiting.add(stage.name)
+            for dependency in self.dependencies(stage):
+                visit(dependency)
+            visiting.discard(stage.name)
+            done.add(stage.name)
+            order.append(stage)
+
+        for stage in self.stages:
+            visit(stage)
+        return order
+
+    def run(self, cancel_token: Optional[CancelToken] = None) -> Dict:
+        """Run every stage, each as soon as its inputs exist.
+
+        When a stage fails no new stages are started; the running ones are
+        waited for and the first error is raised.
+
+        Args:
+            cancel_token (CancelToken, optional): Checked before each stage starts
+
+        Returns:
+            Dict: All artifacts by name
+
+        Raises:
+            Exception: The first stage failure
+            JobCancelled: If the cancel token is cancelled
+        """
+        self._start = time.perf_counter()
+        pending = list(self._order)
+        running = {}
+        error = None
+
+        with ThreadPoolExecutor(max_workers=max(1, len(self.stages)),
+                                thread_name_prefix="stage") as pool:
+            while pending or running:
+                if error is None and cancel_token and cancel_token.cancelled:
+                    error = JobCancelled()
+                    pending.clear()
+                if error is None:
+                    for stage in [s for s in pending if all(n in self.artifacts for n in s.inputs)]:
+                        pending.remove(stage)
+                        inputs = {name: self.artifacts[name] for name in stage.inputs}
+                        # Each stage gets its own copy so its spans join the job trace
+                        context = contextvars.copy_context()
+                        running[pool.submit(context.run, self._run_stage, stage, inputs)] = stage
+                if not running:
+                    break
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    stage = running.pop(future)
+                    try:
+                        outputs = future.result()
+                    except BaseException as e:
+                        if error is None:
+                            error = e
+                        continue
+                    self.artifacts.update(outputs)
+                if error is not None:
+                    pending.clear()
+
+        if error is not None:
+            raise error
+        return self.artifacts
+
+    def _run_stage(self, stage: Stage, inputs: Dict) -> Dict:
+        """Run one stage on a pool thread and record its timing."""
+        started = time.perf_counter()
+        try:
+            with stage.slot or contextlib.nullcontext(), span(stage.name):
+                outputs = stage.run(inputs) or {}
+        finally:
+            self._times[stage.name] = {
+                'start': round(started - self._start, 4),
+                'end': round(time.perf_counter() - self._start, 4)
+            }
+        missing = [name for name in stage.outputs if name not in outputs]
+        if missing:
+            raise StageGraphError(f"Stage '{stage.name}' did not produce: {', '.join(missing)}")
+        return {name: outputs[name] for name in stage.outputs}
+
+    def timings(self) -> Dict[str, float]:
+        """Wall seconds of every finished stage."""
+        return {name: round(times['end'] - times['start'], 4) for name, times in self._times.items()}
+
+    def critical_path(self) -> Dict:
+        """Find the chain of stages that determined the total time.
+
+        Starting from the stage that finished last, each step goes to the
+        dependency that finished last, i.e. the one the stage waited for.
+
+        Returns:
+            Dict: 'stages' in run order, their summed wall 'seconds', and
+                the 'slack' of every other stage: how much longer it could
+                have taken without delaying the job
+        """
+        finished = [stage for stage in self._order if stage.name in self._times]
+        if not finished:
+            return {'stages': [], 'seconds': 0.0, 'slack': {}}
+        path = []
+        stage = max(finished, key=lambda s: self._times[s.name]['end'])
+        while stage is not None:
+            path.append(stage.name)
+            dependencies = [d for d in self.dependencies(stage) if d.name in self._times]
+            stage = max(dependencies, key=lambda d: self._times[d.name]['end'], default=None)
+        path.reverse()
+
+        # Latest finish each stage could have had without moving the job's end
+        end = max(times['end'] for times in self._times.values())
+        latest = {}
+        for stage in reversed(finished):
+            dependents = [s for s in finished if stage in self.dependencies(s)]
+            latest[stage.name] = min(
+                (self._times[s.name]['start'] for s in dependents), default=end)
+        slack = {name: round(max(0.0, latest[name] - self._times[name]['end']), 4)
+                 for name in latest if name not in path}
+        walls = self.timings()
+        return {'stages': path, 'seconds': round(sum(walls[name] for name in path), 4),
+                'slack': slack}
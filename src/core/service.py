@@ -0,0 +1,367 @@
+"""Local HTTP API for submitting and following renders without the GUI."""
+
+import json
+import re
+import threading
+import uuid
+from http import HTTPStatus
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Dict, Optional
+from ..config.settings import (
+    SERVICE_HOST,
+    SERVICE_PORT,
+    SERVICE_OUTPUT_PATH,
+    SERVICE_MAX_PENDING,
+    SERVICE_MAX_FINISHED,
+    SERVICE_MAX_BODY_BYTES,
+    SERVICE_HEARTBEAT_SECONDS
+)
+from .jobs import JobQueue, QueuedJob, STATUS_DONE
+from .pipeline import RenderJob
+from .utils.logger import get_logger
+from .utils.process_runner import ProcessRunner
+
+logger = get_logger('SERVICE')
+
+# Seconds a client is asked to wait before retrying a rejected submission
+RETRY_AFTER_SECONDS = 5
+# Bytes sent per write when streaming a finished video
+DOWNLOAD_CHUNK_BYTES = 1024 * 1024
+
+class QueueFullError(RuntimeError):
+    """Raised when a submission would exceed the pending job limit."""
+
+class RenderService:
+    """Admission control and job bookkeeping behind the HTTP handler.
+
+    Jobs run on a JobQueue with a fixed number of workers. At most
+    `max_pending` jobs may be queued or running; further submissions are
+    refused until one finishes. Every job renders to its own file in
+    SERVICE_OUTPUT_PATH.
+    """
+
+    def __init__(self, workers: int = 2, max_pending: int = SERVICE_MAX_PENDING,
+                 output_dir=SERVICE_OUTPUT_PATH):
+        """Initialize the service.
+
+        Args:
+            workers (int): Parallel renders
+            max_pending (int): Queued plus running jobs accepted at once
+            output_dir (Path): Directory the videos are written to
+        """
+        self.max_pending = max(1, int(max_pending))
+        self.output_dir = Path(output_dir)
+        self.output_dir.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        # Notified on every job change, progress streams wait on it
+        self.changed = threading.Condition()
+        self.queue = JobQueue(workers, on_change=self._on_change)
+
+    def submit(self, data: Dict) -> QueuedJob:
+        """Validate and queue a job.
+
+        Args:
+            data (Dict): Manifest-style row with script, video and music and
+                optional intro, voice_id, rate, pitch_factor, render_mode,
+                fuse_pitch and encode_profile. Ids and output paths are
+                assigned by the service.
+
+        Returns:
+            QueuedJob: The queued job
+
+        Raises:
+            ValueError: If the row is not a valid job
+            QueueFullError: If max_pending jobs are already queued or running
+        """
+        if not isinstance(data, dict):
+            raise ValueError("Request body must be a JSON object")
+        job_id = f"svc-{uuid.uuid4().hex[:12]}"
+        row = {key: value for key, value in data.items() if key not in ('id', 'output')}
+        row.update(id=job_id, output=str(self.output_dir / f"{job_id}.mp4"))
+        job = RenderJob.from_dict(row)
+
+        with self._lock:
+            pending = sum(1 for queued in self.queue.jobs() if not queued.finished)
+            if pending >= self.max_pending:
+                raise QueueFullError(f"{pending} jobs pending, limit is {self.max_pending}")
+            queued = self.queue.add(job)
+        self._prune_finished()
+        return queued
+
+    def get(self, job_id: str) -> Optional[QueuedJob]:
+        """Look up a job by id."""
+        return self.queue.get(job_id)
+
+    def cancel(self, job_id: str) -> bool:
+        """Cancel a queued or running job."""
+        return self.queue.cancel(job_id)
+
+    def stats(self) -> Dict:
+        """Queue and child process counters for the health endpoint."""
+        jobs = self.queue.jobs()
+        counts = {}
+        for queued in jobs:
+            counts[queued.status] = counts.get(queued.status, 0) + 1
+        return {
+            'workers': self.queue.workers,
+            'max_pending': self.max_pending,
+            'pending': sum(1 for queued in jobs if not queued.finished),
+            'jobs': counts,
+            'processes': ProcessRunner.stats()
+        }
+
+    def shutdown(self) -> None:
+        """Cancel every unfinished job."""
+        self.queue.cancel_all()
+
+    def _on_change(self, queued: QueuedJob) -> None:
+        """Wake the progress streams."""
+        with self.changed:
+            self.changed.notify_all()
+
+    def _prune_finished(self) -> None:
+        """Forget the oldest finished jobs beyond SERVICE_MAX_FINISHED, and their videos."""
+        finished = [queued for queued in self.queue.jobs() if queued.finished]
+        for queued in finished[:max(0, len(finished) - SERVICE_MAX_FINISHED)]:
+            if self.queue.remove(queued.id):
+                queued.job.output_file.unlink(missing_ok=True)
+
+def describe_job(queued: QueuedJob) -> Dict:
+    """Build the status document of a job.
+
+    Args:
+        queued (QueuedJob): Queue entry
+
+    Returns:
+        Dict: id, status, progress, detail, elapsed, error, timings and
+            the stage breakdown of finished jobs
+    """
+    return {
+        'id': queued.id,
+        'status': queued.status,
+        'progress': round(queued.progress, 1),
+        'detail': queued.info.describe() if queued.info is not None else None,
+        'elapsed': round(queued.elapsed, 3) if queued.elapsed is not None else None,
+        'error': queued.error,
+        'timings': queued.timings,
+        'stages': queued.trace['stages'] if queued.trace else None,
+        'critical_path': queued.trace.get('critical_path') if queued.trace else None,
+        'links': {
+            'self': f"/jobs/{queued.id}",
+            'events': f"/jobs/{queued.id}/events",
+            'video': f"/jobs/{queued.id}/video",
+            'cancel': f"/jobs/{queued.id}/cancel"
+        }
+    }
+
+class RenderRequestHandler(BaseHTTPRequestHandler):
+    """Routes the render API onto a RenderService.
+
+    POST /jobs                submit a job (202, 400, 411, 413 or 429)
+    GET  /jobs/<id>           job status
+    GET  /jobs/<id>/events    progress as Server-Sent Events until the job finishes
+    GET  /jobs/<id>/video     download the finished video
+    POST /jobs/<id>/cancel    cancel (DELETE /jobs/<id> does the same)
+    GET  /health              queue and process counters
+    """
+    server_version = "BeAnonymous"
+    protocol_version = "HTTP/1.1"
+    JOB_PATH = re.compile(r'^/jobs/(?P<id>[\w-]+)(?P<action>/events|/video|/cancel)?$')
+
+    @property
+    def service(self) -> RenderService:
+        """The service the server was started with."""
+        return self.server.service
+
+    def log_message(self, format, *args):
+        """Send access logs to the application logger."""
+        logger.info(f"{self.address_string()} {format % args}")
+
+    def do_GET(self):
+        """Handle status, events, download and health requests."""
+        if self.path == '/health':
+            return self._send_json(HTTPStatus.OK, self.service.stats())
+        queued, action = self._route()
+        if queued is None:
+            return
+        if action is None:
+            self._send_json(HTTPStatus.OK, describe_job(queued))
+        elif action == '/events':
+            self._stream_events(queued)
+        elif action == '/video':
+            self._send_video(queued)
+        else:
+            self._send_error(HTTPStatus.METHOD_NOT_ALLOWED, "Use POST to cancel")
+
+    def do_POST(self):
+        """Handle submissions and cancellations."""
+        if self.path == '/jobs':
+            return self._submit()
+        queued, action = self._route()
+        if queued is None:
+            return
+        if action == '/cancel':
+            self._cancel(queued)
+        else:
+            self._send_error(HTTPStatus.METHOD_NOT_ALLOWED, "Unsupported method")
+
+    def do_DELETE(self):
+        """Cancel a job."""
+        queued, action = self._route()
+        if queued is None:
+            return
+        if action is None:
+            self._cancel(queued)
+        else:
+            self._send_error(HTTPStatus.METHOD_NOT_ALLOWED, "Unsupported method")
+
+    def _route(self):
+        """Resolve /jobs/<id>[/action], answering 404 for unknown paths or jobs.
+
+        Returns:
+            tuple: (QueuedJob or None, action or None)
+        """
+        match = self.JOB_PATH.match(self.path.split('?', 1)[0])
+        queued = self.service.get(match['id']) if match else None
+        if queued is None:
+            self._send_error(HTTPStatus.NOT_FOUND, "No such job" if match else "Not found")
+            return None, None
+        return queued, match['action']
+
+    def _submit(self):
+        """Queue the job described by the JSON body."""
+        header = self.headers.get('Content-Length')
+        if header is None:
+            self.close_connection = True
+            return self._send_error(HTTPStatus.LENGTH_REQUIRED, "Content-Length required")
+        try:
+            length = int(header)
+        except ValueError:
+            length = -1
+        if length < 0:
+            self.close_connection = True
+            return self._send_error(HTTPStatus.BAD_REQUEST, "Invalid Content-Length")
+        if length > SERVICE_MAX_BODY_BYTES:
+            self.close_connection = True  # The body is not read
+            return self._send_error(HTTPStatus.REQUEST_ENTITY_TOO_LARGE, "Request body too large")
+        try:
+            data = json.loads(self.rfile.read(length) or b'null')
+            queued = self.service.submit(data)
+        except QueueFullError as e:
+            return self._send_error(HTTPStatus.TOO_MANY_REQUESTS, str(e),
+                                    {'Retry-After': str(RETRY_AFTER_SECONDS)})
+        except (ValueError, TypeError) as e:
+            return self._send_error(HTTPStatus.BAD_REQUEST, str(e))
+        self._send_json(HTTPStatus.ACCEPTED, describe_job(queued),
+                        {'Location': f"/jobs/{queued.id}"})
+
+    def _cancel(self, queued: QueuedJob):
+        """Cancel a job, 409 if it already finished."""
+        if not self.service.cancel(queued.id):
+            return self._send_error(HTTPStatus.CONFLICT, f"Job is {queued.status}")
+        self._send_json(HTTPStatus.ACCEPTED, describe_job(queued))
+
+    def _stream_events(self, queued: QueuedJob):
+        """Send a 'progress' event on every change and 'end' once the job finishes."""
+        self.send_response(HTTPStatus.OK)
+        self.send_header('Content-Type', 'text/event-stream')
+        self.send_header('Cache-Control', 'no-cache')
+        self.send_header('Connection', 'close')
+        self.end_headers()
+        self.close_connection = True
+
+        last = None
+        changed = self.service.changed
+        try:
+            while True:
+                # Snapshot and wait under the condition so no notify is missed in between
+                with changed:
+                    state = describe_job(queued)
+                    finished = queued.finished
+                    if state == last and not changed.wait(SERVICE_HEARTBEAT_SECONDS):
+                        state = None
+                if state is None:
+                    self.wfile.write(b": keep-alive\n\n")
+                    self.wfile.flush()
+                elif state != last:
+                    event = 'end' if finished else 'progress'
+                    self.wfile.write(f"event: {event}\ndata: {json.dumps(state)}\n\n".encode('utf-8'))
+                    self.wfile.flush()
+                    last = state
+                    if finished:
+                        return
+        except (BrokenPipeError, ConnectionResetError):
+            pass  # Client went away, the job keeps running
+
+    def _send_video(self, queued: QueuedJob):
+        """Stream the finished video, 409 while the job is not done."""
+        path = queued.job.output_file
+        if queued.status != STATUS_DONE or not path.exists():
+            return self._send_error(HTTPStatus.CONFLICT, f"Job is {queued.status}")
+        self.send_response(HTTPStatus.OK)
+        self.send_header('Content-Type', 'video/mp4')
+        self.send_header('Content-Length', str(path.stat().st_size))
+        self.send_header('Content-Disposition', f'attachment; filename="{path.name}"')
+        self.end_headers()
+        try:
+            with open(path, 'rb') as f:
+                while chunk := f.read(DOWNLOAD_CHUNK_BYTES):
+                    self.wfile.write(chunk)
+        except (BrokenPipeError, ConnectionResetError):
+            self.close_connection = True
+
+    def _send_json(self, status: HTTPStatus, body, headers: Optional[Dict] = None):
+        """Send a JSON response."""
+        payload = json.dumps(body).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(payload)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def _send_error(self, status: HTTPStatus, message: str, headers: Optional[Dict] = None):
+        """Send a JSON error response."""
+        self._send_json(status, {'error': message}, headers)
+
+class RenderServer(ThreadingHTTPServer):
+    """Threaded HTTP server holding the RenderService its handlers use."""
+    daemon_threads = True
+
+    def __init__(self, address, service: RenderService):
+        """Bind the server.
+
+        Args:
+            address (tuple): (host, port), port 0 picks a free one
+            service (RenderService): Service handling the requests
+        """
+        self.service = service
+        super().__init__(address, RenderRequestHandler)
+
+def run_service(host: str = SERVICE_HOST, port: int = SERVICE_PORT, workers: int = 2,
+                max_pending: int = SERVICE_MAX_PENDING) -> int:
+    """Serve the render API until interrupted.
+
+    Args:
+        host (str): Interface to bind, loopback by default
+        port (int): Port to listen on
+        workers (int): Parallel renders
+        max_pending (int): Queued plus running jobs accepted at once
+
+    Returns:
+        int: Process exit code
+    """
+    service = RenderService(workers, max_pending)
+    server = RenderServer((host, port), service)
+    logger.info(f"Render service listening on http://{server.server_address[0]}:{server.server_address[1]} "
+                f"({service.queue.workers} workers, {service.max_pending} pending jobs max)")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        logger.info("Shutting down, cancelling unfinished jobs")
+    finally:
+        service.shutdown()
+        server.server_close()
+    return 0
@@ -0,0 +1,271 @@
+"""Indexed catalog of stock videos and background music for BeAnonymous."""
+
+import json
+import os
+import threading
+from pathlib import Path
+from typing import Dict, List, Optional
+from ...config.settings import (
+    CACHE_DIR,
+    USER_DATA_DIR,
+    VIDEO_ASSETS_PATH,
+    AUDIO_ASSETS_PATH
+)
+from ...config.constants import VIDEO_EXTENSIONS, AUDIO_EXTENSIONS
+from ..utils.logger import get_logger
+
+logger = get_logger('ASSET CATALOG')
+
+# Asset kinds and where they live
+ASSET_KIND_VIDEO = 'video'
+ASSET_KIND_AUDIO = 'audio'
+ASSET_SOURCES = {
+    ASSET_KIND_VIDEO: (VIDEO_ASSETS_PATH, VIDEO_EXTENSIONS),
+    ASSET_KIND_AUDIO: (AUDIO_ASSETS_PATH, AUDIO_EXTENSIONS)
+}
+
+class AssetCatalog:
+    """Persistent index of asset files, rescanned incrementally.
+
+    Every directory is stored with its mtime, its files and its
+    subdirectories. A rescan only lists directories whose mtime changed
+    (files were added, removed or renamed); unchanged directories reuse
+    their stored entries. Assets are named by their path relative to the
+    asset root without extension (e.g. 'city/night_drive'), and are tagged
+    with their folder names plus any user tags.
+    """
+    INDEX_FILE = CACHE_DIR / "asset_catalog.json"
+    TAGS_FILE = USER_DATA_DIR / "asset_tags.json"
+    _index: Optional[Dict] = None
+    _user_tags: Optional[Dict] = None
+    _lock = threading.RLock()
+
+    @classmethod
+    def _load(cls) -> Dict:
+        """Load the index and user tags from disk on first use."""
+        if cls._index is None:
+            cls._index = cls._read_json(cls.INDEX_FILE)
+            cls._user_tags = cls._read_json(cls.TAGS_FILE)
+        return cls._index
+
+    @staticmethod
+    def _read_json(path: Path) -> Dict:
+        """Read a JSON object, returning an empty dict if missing or corrupt."""
+        try:
+            if path.exists():
+                with open(path, 'r', encoding='utf-8') as f:
+                    return json.load(f)
+        except Exception as e:
+            logger.error(f"Error loading {path.name}: {e}")
+        return {}
+
+    @staticmethod
+    def _write_json(path: Path, data: Dict) -> None:
+        """Write a JSON object atomically."""
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            temp_file = path.with_suffix(f'.{os.getpid()}.tmp')
+            with open(temp_file, 'w', encoding='utf-8') as f:
+                json.dump(data, f)
+            os.replace(temp_file, path)
+        except Exception as e:
+            logger.error(f"Error saving {path.name}: {e}")
+
+    @classmethod
+    def scan(cls, kind: str, force: bool = False) -> Dict:
+        """Bring the index for one asset kind up to date.
+
+        Args:
+            kind (str): ASSET_KIND_VIDEO or ASSET_KIND_AUDIO
+            force (bool): List every directory even if its mtime is unchanged
+
+        Returns:
+            Dict: Number of directories listed/reused and assets indexed
+        """
+        root, extensions = ASSET_SOURCES[kind]
+        with cls._lock:
+            index = cls._load()
+            previous = index.get(kind, {})
+            if previous.get('root') != str(root):
+                previous = {}  # Asset root moved, start over
+            old_dirs = previous.get('dirs', {})
+
+            new_dirs = {}
+            stats = {'listed': 0, 'reused': 0}
+            pending = ['']
+            while pending:
+                relative = pending.pop()
+                directory = root / relative if relative else root
+                try:
+                    mtime_ns = directory.stat().st_mtime_ns
+                except OSError:
+                    continue  # Removed since the parent was listed
+
+                stored = old_dirs.get(relative)
+                if stored and stored['mtime_ns'] == mtime_ns and not force:
+                    entry = stored
+                    stats['reused'] += 1
+                else:
+                    entry = cls._list_directory(directory, relative, mtime_ns, extensions, stored)
+                    stats['listed'] += 1
+                new_dirs[relative] = entry
+                pending.extend(entry['subdirs'])
+
+            index[kind] = {'root': str(root), 'dirs': new_dirs}
+            stats['assets'] = sum(len(entry['files']) for entry in new_dirs.values())
+            if new_dirs != old_dirs:
+                cls._write_json(cls.INDEX_FILE, index)
+
+        logger.info(
+            f"Scanned {kind} assets: {stats['assets']} file(s), "
+            f"{stats['listed']} folder(s) listed, {stats['reused']} unchanged"
+        )
+        return stats
+
+    @staticmethod
+    def _list_directory(directory: Path, relative: str, mtime_ns: int,
+                        extensions: List[str], stored: Optional[Dict]) -> Dict:
+        """List one directory with os.scandir.
+
+        Args:
+            directory (Path): Directory to list
+            relative (str): Its path relative to the asset root, '' for the root
+            mtime_ns (int): Its current mtime
+            extensions (List[str]): Accepted file extensions
+            stored (Dict, optional): Previous entry, metadata of unchanged files is reused
+
+        Returns:
+            Dict: mtime_ns, subdirs (relative paths) and files (name -> metadata)
+        """
+        old_files = stored['files'] if stored else {}
+        subdirs = []
+        files = {}
+        try:
+            with os.scandir(directory) as entries:
+                for entry in entries:
+                    if entry.name.startswith('.'):
+                        continue
+                    child = f"{relative}/{entry.name}" if relative else entry.name
+                    if entry.is_dir():
+                        subdirs.append(child)
+                        continue
+                    suffix = os.path.splitext(entry.name)[1].lower()
+                    if suffix not in extensions or not entry.is_file():
+                        continue
+                    stat = entry.stat()
+                    old = old_files.get(entry.name)
+                    if old and old['size'] == stat.st_size and old['mtime_ns'] == stat.st_mtime_ns:
+                        files[entry.name] = old
+                    else:
+                        files[entry.name] = {'size': stat.st_size, 'mtime_ns': stat.st_mtime_ns}
+        except OSError as e:
+            logger.error(f"Could not list {directory}: {e}")
+        return {'mtime_ns': mtime_ns, 'subdirs': sorted(subdirs), 'files': files}
+
+    @classmethod
+    def assets(cls, kind: str, rescan: bool = True) -> List[Dict]:
+        """Get every asset of one kind.
+
+        Args:
+            kind (str): ASSET_KIND_VIDEO or ASSET_KIND_AUDIO
+            rescan (bool): Run an incremental scan first
+
+        Returns:
+            List[Dict]: Assets sorted by name, each with name, path, folder,
+                size, mtime_ns and tags
+        """
+        if rescan:
+            cls.scan(kind)
+        root, _ = ASSET_SOURCES[kind]
+        with cls._lock:
+            dirs = cls._load().get(kind, {}).get('dirs', {})
+            user_tags = cls._user_tags.get(kind, {})
+            assets = []
+            for relative, entry in dirs.items():
+                folder_tags = [part.lower() for part in relative.split('/') if part]
+                for file_name, meta in entry['files'].items():
+                    stem = os.path.splitext(file_name)[0]
+                    name = f"{relative}/{stem}" if relative else stem
+                    tags = sorted(set(folder_tags) | set(user_tags.get(name, [])))
+                    assets.append({
+                        'name': name,
+                        'path': str(root / relative / file_name),
+                        'folder': relative,
+                        'size': meta['size'],
+                        'mtime_ns': meta['mtime_ns'],
+                        'tags': tags
+                    })
+        assets.sort(key=lambda asset: asset['name'].lower())
+        return assets
+
+    @classmethod
+    def names(cls, kind: str) -> List[str]:
+        """Get the names of every asset of one kind.
+
+        Args:
+            kind (str): ASSET_KIND_VIDEO or ASSET_KIND_AUDIO
+
+        Returns:
+            List[str]: Sorted asset names
+        """
+        return [asset['name'] for asset in cls.assets(kind)]
+
+    @classmethod
+    def search(cls, kind: str, query: str = '', tag: Optional[str] = None,
+               rescan: bool = False) -> List[Dict]:
+        """Filter assets by a text query and/or a tag.
+
+        Args:
+            kind (str): ASSET_KIND_VIDEO or ASSET_KIND_AUDIO
+            query (str): Words that must all appear in the name or tags
+            tag (str, optional): Tag the asset must carry
+            rescan (bool): Run an incremental scan first
+
+        Returns:
+            List[Dict]: Matching assets sorted by name
+        """
+        words = query.lower().split()
+        results = []
+        for asset in cls.assets(kind, rescan=rescan):
+            if tag and tag not in asset['tags']:
+                continue
+            haystack = ' '.join([asset['name'].lower(), *asset['tags']])
+            if all(word in haystack for word in words):
+                results.append(asset)
+        return results
+
+    @classmethod
+    def tags(cls, kind: str) -> List[str]:
+        """Get every tag used by assets of one kind.
+
+        Args:
+            kind (str): ASSET_KIND_VIDEO or ASSET_KIND_AUDIO
+
+        Returns:
+            List[str]: Sorted tags
+        """
+        found = set()
+        for asset in cls.assets(kind, rescan=False):
+            found.update(asset['tags'])
+        return sorted(found)
+
+    @classmethod
+    def set_tags(cls, kind: str, name: str, tags: List[str]) -> None:
+        """Replace the user tags of an asset.
+
+        Folder tags are implied by the asset's location and cannot be removed.
+
+        Args:
+            kind (str): ASSET_KIND_VIDEO or ASSET_KIND_AUDIO
+            name (str): Asset name
+            tags (List[str]): New user tags
+        """
+        with cls._lock:
+            cls._load()
+            kind_tags = cls._user_tags.setdefault(kind, {})
+            cleaned = sorted({tag.strip().lower() for tag in tags if tag.strip()})
+            if cleaned:
+                kind_tags[name] = cleaned
+            else:
+                kind_tags.pop(name, None)
+            cls._write_json(cls.TAGS_FILE, cls._user_tags)
@@ -0,0 +1,71 @@
+"""Cooperative cancellation for running render jobs."""
+
+import contextlib
+import threading
+from typing import Callable, List
+
+class JobCancelled(BaseException):
+    """Raised inside a job once its CancelToken has been cancelled.
+
+    Derives from BaseException (like KeyboardInterrupt) so the
+    `except Exception` handlers that turn stage failures into False
+    return values let it through to the caller.
+    """
+
+class CancelToken:
+    """Shared flag that stops a job and kills whatever child it is waiting on.
+
+    Stages register a kill callback for the child process they are running
+    with watch(); cancel() fires those callbacks from any thread.
+    """
+
+    def __init__(self):
+        """Initialize an uncancelled token."""
+        self._event = threading.Event()
+        self._lock = threading.Lock()
+        self._callbacks: List[Callable[[], None]] = []
+
+    @property
+    def cancelled(self) -> bool:
+        """Whether cancel() has been called."""
+        return self._event.is_set()
+
+    def cancel(self) -> None:
+        """Cancel the job and kill any watched child process."""
+        with self._lock:
+            self._event.set()
+            callbacks = list(self._callbacks)
+        for callback in callbacks:
+            try:
+                callback()
+            except Exception:
+                pass  # The child may already have exited
+
+    def raise_if_cancelled(self) -> None:
+        """Raise JobCancelled if the token has been cancelled.
+
+        Raises:
+            JobCancelled: If cancel() has been called
+        """
+        if self._event.is_set():
+            raise JobCancelled()
+
+    @contextlib.contextmanager
+    def watch(self, callback: Callable[[], None]):
+        """Call `callback` on cancel while the block runs.
+
+        If the token is already cancelled the callback fires immediately.
+
+        Args:
+            callback: Usually the kill() method of a child process
+        """
+        with self._lock:
+            self._callbacks.append(callback)
+            already_cancelled = self._event.is_set()
+        if already_cancelled:
+            callback()
+        try:
+            yield
+        finally:
+            with self._lock:
+                self._callbacks.remove(callback)
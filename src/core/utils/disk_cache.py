@@ -0,0 +1,177 @@
+"""Size-bounded on-disk LRU cache for BeAnonymous."""
+
+import contextlib
+import json
+import os
+import threading
+import time
+from pathlib import Path
+from typing import Dict, Optional
+from ...config.settings import CACHE_DIR
+from ..utils.file_lock import file_lock
+from ..utils.logger import get_logger
+
+logger = get_logger('CACHE')
+
+class DiskCache:
+    """Key/file cache with least-recently-used eviction under a byte budget.
+
+    Each entry is a single file stored under ``CACHE_DIR / name``. The index
+    (sizes and last-use times) is persisted next to the files so the LRU
+    order survives restarts. Batch workers, the GUI and the render service
+    share the directory, so every read-modify-write of the index happens
+    under a file lock as well as the thread lock.
+    """
+
+    def __init__(self, name: str, max_bytes: int, root: Optional[Path] = None):
+        """Initialize the cache.
+
+        Args:
+            name (str): Cache name, used for the directory and log messages
+            max_bytes (int): Total size budget for stored files
+            root (Path, optional): Directory override, defaults to CACHE_DIR / name
+        """
+        self.name = name
+        self.max_bytes = int(max_bytes)
+        self.root = Path(root) if root else CACHE_DIR / name
+        self.index_file = self.root / "index.json"
+        self.lock_file = self.root / "index.lock"
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._lock = threading.Lock()
+
+    @contextlib.contextmanager
+    def _locked(self):
+        """Hold the thread lock and an exclusive lock shared by every process using the cache."""
+        with self._lock, file_lock(self.lock_file):
+            yield
+
+    def _load_index(self) -> Dict:
+        """Load the cache index from disk."""
+        try:
+            if self.index_file.exists():
+                with open(self.index_file, 'r') as f:
+                    return json.load(f)
+        except Exception as e:
+            logger.error(f"Error loading {self.name} cache index: {e}")
+        return {}
+
+    def _save_index(self, index: Dict) -> None:
+        """Save the cache index to disk."""
+        try:
+            self.root.mkdir(parents=True, exist_ok=True)
+            temp_file = self.index_file.with_suffix('.tmp')
+            with open(temp_file, 'w') as f:
+                json.dump(index, f)
+            os.replace(temp_file, self.index_file)
+        except Exception as e:
+            logger.error(f"Error saving {self.name} cache index: {e}")
+
+    def path_for(self, key: str, suffix: str = '') -> Path:
+        """Get the storage path for a key.
+
+        Args:
+            key (str): Cache key
+            suffix (str): File suffix including the dot
+
+        Returns:
+            Path: Where the entry is (or would be) stored
+        """
+        return self.root / f"{key}{suffix}"
+
+    def get(self, key: str) -> Optional[Path]:
+        """Look up an entry and mark it as recently used.
+
+        Args:
+            key (str): Cache key
+
+        Returns:
+            Optional[Path]: Path to the cached file, or None on a miss
+        """
+        with self._locked():
+            index = self._load_index()
+            entry = index.get(key)
+            if entry and (self.root / entry['file']).exists():
+                entry['last_used'] = time.time()
+                self._save_index(index)
+                self.hits += 1
+                logger.info(f"{self.name} cache hit: {key}")
+                return self.root / entry['file']
+            if entry:
+                # File vanished behind our back, forget it
+                del index[key]
+                self._save_index(index)
+            self.misses += 1
+            logger.info(f"{self.name} cache miss: {key}")
+            return None
+
+    def put(self, key: str, source_path, suffix: str = '') -> Path:
+        """Move a file into the cache and evict old entries over budget.
+
+        Args:
+            key (str): Cache key
+            source_path (str): File to move into the cache
+            suffix (str): File suffix including the dot
+
+        Returns:
+            Path: Path to the cached file
+        """
+        with self._locked():
+            target = self.path_for(key, suffix)
+            os.replace(source_path, target)
+            index = self._load_index()
+            index[key] = {
+                'file': target.name,
+                'size': target.stat().st_size,
+                'last_used': time.time()
+            }
+            self._evict(index, keep=key)
+            self._save_index(index)
+            return target
+
+    def _evict(self, index: Dict, keep: Optional[str] = None) -> None:
+        """Drop least-recently-used entries until the index fits the budget.
+
+        Args:
+            index (Dict): Cache index, modified in place
+            keep (str, optional): Key that must not be evicted
+        """
+        total = sum(entry['size'] for entry in index.values())
+        for key in sorted(index, key=lambda k: index[k]['last_used']):
+            if total <= self.max_bytes:
+                break
+            if key == keep:
+                continue
+            entry = index.pop(key)
+            try:
+                (self.root / entry['file']).unlink()
+            except FileNotFoundError:
+                pass
+            total -= entry['size']
+            self.evictions += 1
+            logger.info(f"{self.name} cache evicted {key} ({entry['size']} bytes)")
+
+    def bytes_stored(self) -> int:
+        """Get the total size of all cached files.
+
+        Returns:
+            int: Size in bytes
+        """
+        with self._locked():
+            return sum(entry['size'] for entry in self._load_index().values())
+
+    def stats(self) -> Dict:
+        """Get hit/miss/eviction counters for this process.
+
+        Returns:
+            Dict: Counters, hit rate and bytes stored
+        """
+        lookups = self.hits + self.misses
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'evictions': self.evictions,
+            'hit_rate': self.hits / lookups if lookups else 0.0,
+            'bytes_stored': self.bytes_stored()
+        }
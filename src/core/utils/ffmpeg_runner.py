@@ -0,0 +1,165 @@
+"""ffmpeg runner with live progress, ETA and stall detection."""
+
+import time
+from typing import Callable, List, Optional
+from ..utils.cancel import CancelToken
+from ..utils.logger import get_logger
+from ..utils.process_runner import ProcessResult, ProcessStallError, run_process
+from ..utils.settings_manager import SettingsManager
+from ..utils.tracing import span
+
+logger = get_logger('FFMPEG')
+
+# Seconds between progress lines written to the log
+LOG_INTERVAL = 5.0
+
+# Raised when ffmpeg stops making progress for longer than the stall timeout
+FFmpegStallError = ProcessStallError
+
+class ProgressInfo:
+    """Snapshot of a running encode parsed from ffmpeg's -progress output."""
+
+    def __init__(self, percent, out_time, speed, eta, elapsed):
+        """Initialize the snapshot.
+
+        Args:
+            percent (float): Completion 0-100, None if the target duration is unknown
+            out_time (float): Seconds of output written so far
+            speed (float): Encode speed as a multiple of realtime, None if unknown
+            eta (float): Estimated seconds until done, None if unknown
+            elapsed (float): Wall seconds since ffmpeg started
+        """
+        self.percent = percent
+        self.out_time = out_time
+        self.speed = speed
+        self.eta = eta
+        self.elapsed = elapsed
+
+    def describe(self) -> str:
+        """Format the snapshot for status labels and logs.
+
+        Returns:
+            str: e.g. "42% at 3.1x, ETA 0:12"
+        """
+        text = f"{self.percent:.0f}%" if self.percent is not None else f"{self.out_time:.1f}s"
+        if self.speed:
+            text += f" at {self.speed:.1f}x"
+        if self.eta is not None:
+            minutes, seconds = divmod(int(self.eta), 60)
+            text += f", ETA {minutes}:{seconds:02d}"
+        return text
+
+def _parse_speed(value: str) -> Optional[float]:
+    """Parse ffmpeg's speed field (e.g. '2.35x')."""
+    try:
+        return float(value.rstrip('x'))
+    except ValueError:
+        return None  # 'N/A' before the first frame
+
+def run_ffmpeg(cmd: List[str],
+               duration: Optional[float] = None,
+               progress_callback: Optional[Callable[[ProgressInfo], None]] = None,
+               stall_timeout: Optional[float] = None,
+               label: str = 'ffmpeg',
+               cancel_token: Optional[CancelToken] = None,
+               timeout: Optional[float] = None) -> ProcessResult:
+    """Run an ffmpeg command, streaming progress parsed from -progress output.
+
+    The command runs through the shared ProcessRunner, so it waits for a
+    free ffmpeg slot first.
+
+    Args:
+        cmd (List[str]): ffmpeg command, starting with the executable
+        duration (float, optional): Expected output duration in seconds, used
+            for percent and ETA
+        progress_callback: Optional callback receiving ProgressInfo snapshots,
+            called on the runner's event loop thread
+        stall_timeout (float, optional): Seconds without progress before ffmpeg
+            is killed, defaults to the 'ffmpeg_stall_timeout' setting
+        label (str): Name used in log messages
+        cancel_token (CancelToken, optional): Kills ffmpeg when cancelled
+        timeout (float, optional): Seconds before ffmpeg is killed regardless
+            of progress
+
+    Returns:
+        ProcessResult: Exit statistics of ffmpeg
+
+    Raises:
+        subprocess.CalledProcessError: If ffmpeg exits with an error, with the
+            tail of its stderr
+        FFmpegStallError: If no progress is made within the stall timeout
+        ProcessTimeoutError: If the timeout expires
+        JobCancelled: If the cancel token is cancelled while ffmpeg runs
+    """
+    if stall_timeout is None:
+        stall_timeout = SettingsManager.get_setting('ffmpeg_stall_timeout', 60)
+    full_cmd = [cmd[0], '-progress', 'pipe:1', '-nostats', *cmd[1:]]
+    inputs = [cmd[i + 1] for i, arg in enumerate(cmd[:-1]) if arg == '-i']
+    with span('ffmpeg', inputs=inputs, outputs=[cmd[-1]], label=label) as current:
+        result = run_process(full_cmd, label=label, timeout=timeout, stall_timeout=stall_timeout,
+                             on_stdout_line=_ProgressParser(duration, progress_callback, label),
+                             cancel_token=cancel_token)
+        if current:
+            current.attrs['queued'] = round(result.queued, 4)
+    return result
+
+class _ProgressParser:
+    """Turns ffmpeg -progress lines into ProgressInfo snapshots."""
+
+    def __init__(self, duration, progress_callback, label):
+        """Initialize the parser.
+
+        Args:
+            duration (float, optional): Expected output duration in seconds
+            progress_callback: Optional callback receiving ProgressInfo snapshots
+            label (str): Name used in log messages
+        """
+        self.duration = duration
+        self.progress_callback = progress_callback
+        self.label = label
+        self.fields = {}
+        self.out_time = 0.0
+        self.start = self.last_log = None  # Set by the first line, after any wait for a slot
+
+    def __call__(self, line: str) -> bool:
+        """Parse one stdout line.
+
+        Returns:
+            bool: True if the line completed a block that advanced the output
+        """
+        if self.start is None:
+            self.start = self.last_log = time.monotonic()
+        key, _, value = line.strip().partition('=')
+        if not key:
+            return False
+        if key != 'progress':
+            self.fields[key] = value
+            return False
+
+        # One complete progress block received
+        try:
+            current = int(self.fields.get('out_time_us', 0)) / 1_000_000
+        except ValueError:
+            current = self.out_time  # 'N/A' until the first frame is muxed
+        advanced = current > self.out_time or value == 'end'
+        self.out_time = max(self.out_time, current)
+        now = time.monotonic()
+        speed = _parse_speed(self.fields.get('speed', 'N/A'))
+        elapsed = now - self.start
+
+        percent = eta = None
+        if self.duration:
+            percent = min(100.0, self.out_time / self.duration * 100)
+            remaining = max(0.0, self.duration - self.out_time)
+            if speed:
+                eta = remaining / speed
+            elif self.out_time > 0:
+                eta = elapsed * remaining / self.out_time
+        info = ProgressInfo(percent, self.out_time, speed, eta, elapsed)
+
+        if self.progress_callback:
+            self.progress_callback(info)
+        if now - self.last_log >= LOG_INTERVAL or value == 'end':
+            logger.info(f"{self.label}: {info.describe()}")
+            self.last_log = now
+        return advanced
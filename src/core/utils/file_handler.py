@@ -1,15 +1,15 @@
 """File handling utilities for BeAnonymous."""
 
 import os
-import json
 import shutil
+import subprocess
+import sys
 from pathlib import Path
 from typing import List, Optional, Dict
-from ...config.settings import VIDEO_ASSETS_PATH, AUDIO_ASSETS_PATH
+from .asset_catalog import AssetCatalog, ASSET_KIND_VIDEO, ASSET_KIND_AUDIO
+from .settings_manager import SettingsManager
 
 class FileHandler:
-    # Settings file location
-    SETTINGS_FILE = Path.home() / ".beanonymous" / "settings.json"
     """File handling utility class."""
     
     @staticmethod
@@ -21,19 +21,30 @@ class FileHandler:
         """
         os.makedirs(directory, exist_ok=True)
     
+    @staticmethod
+    def open_file(path) -> None:
+        """Open a file with the platform's default application.
+        
+        Args:
+            path (str): File to open
+        """
+        path = str(path)
+        if sys.platform == "win32":
+            os.startfile(path)
+        elif sys.platform == "darwin":
+            subprocess.Popen(["open", path])
+        else:
+            subprocess.Popen(["xdg-open", path])
+    
     @staticmethod
     def get_video_files() -> List[str]:
         """Get list of available background videos.
         
         Returns:
-            List[str]: List of video filenames without extension
+            List[str]: List of video names (relative path without extension)
         """
-        videos = []
         try:
-            if VIDEO_ASSETS_PATH.exists():
-                for file in os.listdir(VIDEO_ASSETS_PATH):
-                    if file.endswith(".mp4"):
-                        videos.append(os.path.splitext(file)[0])
+            videos = AssetCatalog.names(ASSET_KIND_VIDEO)
             
             if not videos:
                 print(" [FILE HANDLER] No videos found in stock directory")
@@ -50,12 +61,9 @@ class FileHandler:
         """Get list of available background music.
         
         Returns:
-            List[str]: List of audio filenames without extension
+            List[str]: List of audio names (relative path without extension)
         """
-        music = []
-        for file in os.listdir(AUDIO_ASSETS_PATH):
-            if file.endswith(".mp3"):
-                music.append(os.path.splitext(file)[0])
+        music = AssetCatalog.names(ASSET_KIND_AUDIO)
         return music or ["Default"]
     
     @staticmethod
@@ -86,33 +94,22 @@ class FileHandler:
         except (OSError, PermissionError):
             return False
     
-    @classmethod
-    def save_settings(cls, settings: Dict) -> None:
-        """Save settings to a persistent file.
+    @staticmethod
+    def save_settings(settings: Dict) -> None:
+        """Save settings to the persistent settings file.
+        
+        The given keys are merged into the stored settings.
         
         Args:
             settings (Dict): Settings to save
         """
-        try:
-            # Create settings directory if it doesn't exist
-            cls.SETTINGS_FILE.parent.mkdir(parents=True, exist_ok=True)
-            
-            with open(cls.SETTINGS_FILE, 'w') as f:
-                json.dump(settings, f)
-        except Exception as e:
-            print(f"Error saving settings: {e}")
+        SettingsManager.save_settings(settings)
     
-    @classmethod
-    def load_settings(cls) -> Dict:
-        """Load settings from persistent file.
+    @staticmethod
+    def load_settings() -> Dict:
+        """Load settings from the persistent settings file.
         
         Returns:
-            Dict: Loaded settings or empty dict if file doesn't exist
+            Dict: Stored settings merged with the defaults
         """
-        try:
-            if cls.SETTINGS_FILE.exists():
-                with open(cls.SETTINGS_FILE, 'r') as f:
-                    return json.load(f)
-        except Exception as e:
-            print(f"Error loading settings: {e}")
-        return {}
+        return SettingsManager.load_settings()
@@ -0,0 +1,36 @@
+"""Inter-process file locks for indexes shared by several BeAnonymous processes."""
+
+import contextlib
+import sys
+from pathlib import Path
+
+@contextlib.contextmanager
+def file_lock(lock_path):
+    """Hold an exclusive lock on a lock file, shared by every process using it.
+
+    Batch workers, the GUI and the render service read and rewrite the same
+    JSON indexes, so their read-modify-write cycles must not interleave.
+
+    Args:
+        lock_path (Path): Lock file, created if missing
+    """
+    lock_path = Path(lock_path)
+    lock_path.parent.mkdir(parents=True, exist_ok=True)
+    with open(lock_path, 'a+') as lock_file:
+        if sys.platform == "win32":
+            import msvcrt
+            lock_file.seek(0)
+            # LK_LOCK retries for about 10 seconds before giving up
+            msvcrt.locking(lock_file.fileno(), msvcrt.LK_LOCK, 1)
+            try:
+                yield
+            finally:
+                lock_file.seek(0)
+                msvcrt.locking(lock_file.fileno(), msvcrt.LK_UNLCK, 1)
+        else:
+            import fcntl
+            fcntl.flock(lock_file.fileno(), fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(lock_file.fileno(), fcntl.LOCK_UN)
@@ -0,0 +1,193 @@
+"""Persistent media metadata index for BeAnonymous."""
+
+import json
+import os
+import threading
+import wave
+from fractions import Fraction
+from pathlib import Path
+from typing import Dict, Iterable, Optional
+from ...config.settings import CACHE_DIR, FFPROBE_TIMEOUT, INTRO_VIDEO_PATH
+from ..utils.asset_catalog import AssetCatalog, ASSET_KIND_VIDEO, ASSET_KIND_AUDIO
+from ..utils.file_lock import file_lock
+from ..utils.logger import get_logger
+from ..utils.process_runner import run_process
+from ..utils.tracing import span
+
+logger = get_logger('MEDIA INDEX')
+
+class MediaIndex:
+    """Duration, codec and format metadata keyed by (path, size, mtime).
+
+    Each file is probed once with a single JSON ffprobe call (no shell) and
+    the result is persisted, so unchanged assets are never probed again.
+    WAV files are read in-process from their header.
+    """
+    INDEX_FILE = CACHE_DIR / "media_index.json"
+    LOCK_FILE = CACHE_DIR / "media_index.lock"
+    _entries: Optional[Dict] = None
+    _lock = threading.Lock()
+
+    @classmethod
+    def _read_file(cls) -> Dict:
+        """Read the index file, empty if missing or unreadable."""
+        try:
+            if cls.INDEX_FILE.exists():
+                with open(cls.INDEX_FILE, 'r') as f:
+                    return json.load(f)
+        except Exception as e:
+            logger.error(f"Error loading media index: {e}")
+        return {}
+
+    @classmethod
+    def _load(cls) -> Dict:
+        """Load the index from disk on first use."""
+        if cls._entries is None:
+            cls._entries = cls._read_file()
+        return cls._entries
+
+    @classmethod
+    def _save(cls, updates: Dict) -> None:
+        """Merge new entries into the index file and write it atomically.
+
+        Batch workers, the GUI and the render service all probe into the
+        same file, so it is re-read under a file lock and merged rather
+        than overwritten with this process's entries.
+
+        Args:
+            updates (Dict): Entries probed by this process
+        """
+        try:
+            with file_lock(cls.LOCK_FILE):
+                entries = cls._read_file()
+                entries.update(updates)
+                temp_file = cls.INDEX_FILE.with_suffix(f'.{os.getpid()}.{threading.get_ident()}.tmp')
+                with open(temp_file, 'w') as f:
+                    json.dump(entries, f)
+                os.replace(temp_file, cls.INDEX_FILE)
+            cls._entries = entries
+        except Exception as e:
+            logger.error(f"Error saving media index: {e}")
+
+    @classmethod
+    def get(cls, path, persist: bool = True) -> Dict:
+        """Get metadata for a media file, probing it if unknown or changed.
+
+        Args:
+            path (str): Media file path
+            persist (bool): Store the result on disk. Use False for
+                per-job intermediates that will never be seen again.
+
+        Returns:
+            Dict: duration, video_codec, audio_codec, width, height, fps,
+                sample_rate and channels (None where not applicable)
+        """
+        path = Path(path).resolve()
+        stat = path.stat()
+        key = str(path)
+        with cls._lock:
+            entry = cls._load().get(key)
+            if entry and entry['size'] == stat.st_size and entry['mtime_ns'] == stat.st_mtime_ns:
+                return entry['info']
+
+        if path.suffix.lower() == '.wav':
+            try:
+                return cls._probe_wav(path)
+            except (wave.Error, EOFError):
+                pass  # Not a plain PCM WAV, let ffprobe handle it
+        info = cls._probe_ffprobe(path)
+
+        if persist:
+            with cls._lock:
+                entry = {'size': stat.st_size, 'mtime_ns': stat.st_mtime_ns, 'info': info}
+                cls._load()[key] = entry
+                cls._save({key: entry})
+        return info
+
+    @classmethod
+    def duration(cls, path, persist: bool = True) -> float:
+        """Get the duration of a media file in seconds.
+
+        Args:
+            path (str): Media file path
+            persist (bool): Store the probe result on disk
+
+        Returns:
+            float: Duration in seconds
+        """
+        duration = cls.get(path, persist)['duration']
+        if duration is None:
+            raise ValueError(f"Could not determine duration of {path}")
+        return duration
+
+    @staticmethod
+    def _probe_wav(path: Path) -> Dict:
+        """Read metadata from a WAV header."""
+        with wave.open(str(path), 'rb') as wav_file:
+            rate = wav_file.getframerate()
+            return {
+                'duration': wav_file.getnframes() / rate,
+                'video_codec': None,
+                'audio_codec': f"pcm_s{wav_file.getsampwidth() * 8}le",
+                'width': None,
+                'height': None,
+                'fps': None,
+                'sample_rate': rate,
+                'channels': wav_file.getnchannels()
+            }
+
+    @staticmethod
+    def _probe_ffprobe(path: Path) -> Dict:
+        """Probe a file with one ffprobe call and parse its JSON output."""
+        cmd = [
+            'ffprobe', '-v', 'error',
+            '-print_format', 'json',
+            '-show_format', '-show_streams',
+            str(path)
+        ]
+        with span('ffprobe', inputs=[path]):
+            result = run_process(cmd, label=f"ffprobe {path.name}", timeout=FFPROBE_TIMEOUT,
+                                 capture_stdout=True)
+        data = json.loads(result.stdout)
+        streams = data.get('streams', [])
+        video = next((s for s in streams if s.get('codec_type') == 'video'), {})
+        audio = next((s for s in streams if s.get('codec_type') == 'audio'), {})
+
+        fps = None
+        if video.get('avg_frame_rate') not in (None, '0/0'):
+            fps = float(Fraction(video['avg_frame_rate']))
+
+        duration = data.get('format', {}).get('duration')
+        return {
+            'duration': float(duration) if duration else None,
+            'video_codec': video.get('codec_name'),
+            'audio_codec': audio.get('codec_name'),
+            'width': video.get('width'),
+            'height': video.get('height'),
+            'fps': fps,
+            'sample_rate': int(audio['sample_rate']) if audio.get('sample_rate') else None,
+            'channels': audio.get('channels')
+        }
+
+    @classmethod
+    def warm(cls, paths: Iterable) -> None:
+        """Probe files ahead of time so renders find them indexed.
+
+        Args:
+            paths (Iterable): Media file paths
+        """
+        for path in paths:
+            try:
+                cls.get(path)
+            except Exception as e:
+                logger.error(f"Could not index {path}: {e}")
+
+    @classmethod
+    def warm_assets(cls) -> None:
+        """Index every stock video, background track and the intro."""
+        paths = [asset['path'] for kind in (ASSET_KIND_VIDEO, ASSET_KIND_AUDIO)
+                 for asset in AssetCatalog.assets(kind)]
+        if INTRO_VIDEO_PATH.exists():
+            paths.append(INTRO_VIDEO_PATH)
+        cls.warm(paths)
+        logger.info(f"Media index warmed with {len(paths)} asset(s)")
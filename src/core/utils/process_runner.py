@@ -0,0 +1,346 @@
+"""Shared asyncio runner for ffmpeg, ffprobe and other child processes."""
+
+import asyncio
+import collections
+import contextlib
+import os
+import signal
+import subprocess
+import threading
+import time
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
+from ...config.settings import PROCESS_STDERR_TAIL_LINES, PROCESS_LINE_LIMIT
+from ..utils.cancel import CancelToken, JobCancelled
+from ..utils.logger import get_logger
+from ..utils.settings_manager import SettingsManager
+
+logger = get_logger('PROCESS')
+
+# Seconds between timeout and stall checks while a child runs
+CHECK_INTERVAL = 1.0
+# Seconds to wait for a killed child's pipes to close
+KILL_GRACE = 5.0
+
+class ProcessTimeoutError(subprocess.TimeoutExpired):
+    """Raised when a child runs longer than its timeout and is killed."""
+
+class ProcessStallError(RuntimeError):
+    """Raised when a child stops making progress for longer than its stall timeout."""
+
+class ProcessResult:
+    """Exit statistics of one finished child process."""
+
+    def __init__(self, cmd: List[str], label: str, returncode: int, stdout: Optional[str],
+                 stderr: str, wall: float, queued: float):
+        """Initialize the result.
+
+        Args:
+            cmd (List[str]): Command that ran
+            label (str): Name used in log messages
+            returncode (int): Exit code, negative if killed by a signal
+            stdout (str, optional): Captured output, None unless requested
+            stderr (str): Last PROCESS_STDERR_TAIL_LINES lines of stderr
+            wall (float): Seconds the child ran
+            queued (float): Seconds spent waiting for a free process slot
+        """
+        self.cmd = cmd
+        self.label = label
+        self.returncode = returncode
+        self.stdout = stdout
+        self.stderr = stderr
+        self.wall = wall
+        self.queued = queued
+
+    @property
+    def signal(self) -> Optional[str]:
+        """Name of the signal that killed the child, None if it exited."""
+        if self.returncode >= 0:
+            return None
+        try:
+            return signal.Signals(-self.returncode).name
+        except ValueError:
+            return str(-self.returncode)
+
+    def check(self) -> None:
+        """Raise if the child failed.
+
+        Raises:
+            subprocess.CalledProcessError: With the stderr tail, if the exit code is not 0
+        """
+        if self.returncode != 0:
+            raise subprocess.CalledProcessError(self.returncode, self.cmd, self.stdout, self.stderr)
+
+class _ProcessSlots:
+    """Resizable counting semaphore bounding concurrent children on the loop."""
+
+    def __init__(self, limit: int):
+        """Initialize the slots.
+
+        Args:
+            limit (int): Children allowed to run at once
+        """
+        self.limit = max(1, int(limit))
+        self.running = 0
+        self.waiting = 0
+        self._condition = asyncio.Condition()
+
+    async def acquire(self) -> None:
+        """Wait for a free slot."""
+        async with self._condition:
+            self.waiting += 1
+            try:
+                await self._condition.wait_for(lambda: self.running < self.limit)
+            finally:
+                self.waiting -= 1
+            self.running += 1
+
+    async def release(self) -> None:
+        """Free a slot."""
+        async with self._condition:
+            self.running -= 1
+            self._condition.notify()
+
+    async def resize(self, limit: int) -> None:
+        """Change the limit; running children are never stopped."""
+        async with self._condition:
+            self.limit = max(1, int(limit))
+            self._condition.notify_all()
+
+class ProcessRunner:
+    """Runs child processes on one background event loop per process.
+
+    Every ffmpeg child goes through a shared slot limit (the
+    'ffmpeg_max_processes' setting, 0 picks half the CPUs), so any number
+    of render threads, or coroutines of a service, can submit work without
+    oversubscribing the machine. Other executables such as ffprobe are not
+    limited, so probes are never stuck behind long encodes.
+    """
+    _loop = None
+    _slots = None
+    _lock = threading.Lock()
+    _stats = collections.Counter()
+
+    @classmethod
+    def loop(cls) -> asyncio.AbstractEventLoop:
+        """Get the runner's event loop, starting its thread on first use."""
+        with cls._lock:
+            if cls._loop is None:
+                loop = asyncio.new_event_loop()
+                threading.Thread(target=loop.run_forever, name="process-runner",
+                                 daemon=True).start()
+                cls._loop = loop
+                SettingsManager.subscribe(cls._on_settings_change)
+            return cls._loop
+
+    @staticmethod
+    def max_processes() -> int:
+        """Concurrent ffmpeg children allowed by the settings."""
+        limit = int(SettingsManager.get_setting('ffmpeg_max_processes', 0) or 0)
+        return limit if limit > 0 else max(2, (os.cpu_count() or 2) // 2)
+
+    @classmethod
+    def _get_slots(cls) -> _ProcessSlots:
+        """Get the slot limit, created on the loop thread."""
+        if cls._slots is None:
+            cls._slots = _ProcessSlots(cls.max_processes())
+        return cls._slots
+
+    @classmethod
+    def _on_settings_change(cls, changed) -> None:
+        """Apply a changed 'ffmpeg_max_processes' setting."""
+        if 'ffmpeg_max_processes' in changed and cls._slots is not None:
+            asyncio.run_coroutine_threadsafe(cls._slots.resize(cls.max_processes()), cls._loop)
+
+    @classmethod
+    def stats(cls) -> Dict:
+        """Counters of children run by this process.
+
+        Returns:
+            Dict: started, succeeded, failed, timed_out, stalled and
+                cancelled counts, total wall and queued seconds, and the
+                current running/waiting/limit of the ffmpeg slots
+        """
+        with cls._lock:
+            stats = dict(cls._stats)
+        slots = cls._slots
+        stats.update(
+            running=slots.running if slots else 0,
+            waiting=slots.waiting if slots else 0,
+            limit=slots.limit if slots else cls.max_processes()
+        )
+        return stats
+
+    @classmethod
+    def _count(cls, **counts) -> None:
+        """Add to the exit statistics."""
+        with cls._lock:
+            cls._stats.update(counts)
+
+    @classmethod
+    def run(cls, cmd: List[str], **kwargs) -> ProcessResult:
+        """Run a child from a regular thread and wait for it.
+
+        Args:
+            cmd (List[str]): Command, starting with the executable
+            **kwargs: See run_async()
+
+        Returns:
+            ProcessResult: Exit statistics of the child
+        """
+        future = asyncio.run_coroutine_threadsafe(cls.run_async(cmd, **kwargs), cls.loop())
+        return future.result()
+
+    @classmethod
+    async def run_async(cls, cmd: List[str],
+                        label: Optional[str] = None,
+                        timeout: Optional[float] = None,
+                        stall_timeout: Optional[float] = None,
+                        on_stdout_line: Optional[Callable[[str], bool]] = None,
+                        capture_stdout: bool = False,
+                        cancel_token: Optional[CancelToken] = None,
+                        limited: Optional[bool] = None,
+                        check: bool = True) -> ProcessResult:
+        """Run a child on the runner's loop.
+
+        Args:
+            cmd (List[str]): Command, starting with the executable
+            label (str, optional): Name used in log messages, defaults to the executable
+            timeout (float, optional): Seconds before the child is killed
+            stall_timeout (float, optional): Seconds without progress before the
+                child is killed, progress being on_stdout_line returning True
+            on_stdout_line: Optional callback receiving each stdout line. Called
+                on the loop thread, so it must not block.
+            capture_stdout (bool): Keep stdout in the result
+            cancel_token (CancelToken, optional): Kills the child when cancelled
+            limited (bool, optional): Wait for an ffmpeg slot, defaults to True
+                for ffmpeg itself
+            check (bool): Raise CalledProcessError on a non-zero exit
+
+        Returns:
+            ProcessResult: Exit statistics of the child
+
+        Raises:
+            subprocess.CalledProcessError: If check is set and the child fails
+            ProcessTimeoutError: If the timeout expires
+            ProcessStallError: If no progress is made within the stall timeout
+            JobCancelled: If the cancel token is cancelled
+        """
+        if asyncio.get_running_loop() is not cls.loop():
+            # Called from another loop, e.g. a service: hop onto the runner's loop
+            return await asyncio.wrap_future(asyncio.run_coroutine_threadsafe(
+                cls.run_async(cmd, label, timeout, stall_timeout, on_stdout_line, capture_stdout,
+                              cancel_token, limited, check), cls.loop()))
+
+        label = label or Path(cmd[0]).name
+        if limited is None:
+            limited = Path(cmd[0]).stem == 'ffmpeg'
+        if cancel_token:
+            cancel_token.raise_if_cancelled()
+
+        loop = asyncio.get_running_loop()
+        task = asyncio.current_task()
+        watch = (cancel_token.watch(lambda: loop.call_soon_threadsafe(task.cancel))
+                 if cancel_token else contextlib.nullcontext())
+        slots = cls._get_slots() if limited else None
+        queued_at = time.monotonic()
+        try:
+            with watch:
+                if slots:
+                    await slots.acquire()
+                try:
+                    result = await cls._execute(cmd, label, timeout, stall_timeout, on_stdout_line,
+                                                capture_stdout, time.monotonic() - queued_at)
+                finally:
+                    if slots:
+                        await slots.release()
+        except asyncio.CancelledError:
+            cls._count(cancelled=1)
+            if cancel_token and cancel_token.cancelled:
+                raise JobCancelled() from None
+            raise
+        except ProcessTimeoutError:
+            cls._count(timed_out=1)
+            raise
+        except ProcessStallError:
+            cls._count(stalled=1)
+            raise
+
+        cls._count(succeeded=int(result.returncode == 0), failed=int(result.returncode != 0),
+                   wall_seconds=result.wall, queued_seconds=result.queued)
+        if result.returncode != 0:
+            last_line = result.stderr.rsplit('\n', 1)[-1]
+            logger.error(f"{label} exited with {result.signal or result.returncode}: {last_line}")
+        if check:
+            result.check()
+        return result
+
+    @classmethod
+    async def _execute(cls, cmd, label, timeout, stall_timeout, on_stdout_line, capture_stdout,
+                       queued) -> ProcessResult:
+        """Start the child and supervise it until it exits."""
+        process = await asyncio.create_subprocess_exec(
+            *cmd, stdin=subprocess.DEVNULL, stdout=subprocess.PIPE, stderr=subprocess.PIPE,
+            limit=PROCESS_LINE_LIMIT)
+        cls._count(started=1)
+        start = time.monotonic()
+        last_progress = start
+        stdout = [] if capture_stdout else None
+        stderr = collections.deque(maxlen=PROCESS_STDERR_TAIL_LINES)
+
+        async def read_stdout():
+            nonlocal last_progress
+            async for raw in process.stdout:
+                line = raw.decode('utf-8', errors='replace')
+                if stdout is not None:
+                    stdout.append(line)
+                if on_stdout_line:
+                    try:
+                        if on_stdout_line(line):
+                            last_progress = time.monotonic()
+                    except Exception as e:
+                        logger.error(f"{label} output handler failed: {e}")
+
+        async def read_stderr():
+            async for raw in process.stderr:
+                stderr.append(raw.decode('utf-8', errors='replace').rstrip())
+
+        supervised = asyncio.gather(read_stdout(), read_stderr(), process.wait())
+        try:
+            while True:
+                done, _ = await asyncio.wait({supervised}, timeout=CHECK_INTERVAL)
+                if done:
+                    supervised.result()
+                    break
+                now = time.monotonic()
+                if timeout and now - start > timeout:
+                    raise ProcessTimeoutError(cmd, timeout, stderr='\n'.join(stderr))
+                if stall_timeout and now - last_progress > stall_timeout:
+                    raise ProcessStallError(f"{label} made no progress for {stall_timeout:.0f}s")
+        finally:
+            if process.returncode is None:
+                with contextlib.suppress(ProcessLookupError):
+                    process.kill()
+                # wait() also waits for the pipes to close, which a grandchild
+                # (e.g. of a wrapper script) can hold open after the kill
+                with contextlib.suppress(asyncio.TimeoutError):
+                    await asyncio.wait_for(asyncio.shield(process.wait()), KILL_GRACE)
+            supervised.cancel()
+            # Mark the readers' cancellation as handled
+            supervised.add_done_callback(lambda future: future.cancelled() or future.exception())
+
+        return ProcessResult(cmd, label, process.returncode,
+                             ''.join(stdout) if stdout is not None else None,
+                             '\n'.join(stderr), time.monotonic() - start, queued)
+
+def run_process(cmd: List[str], **kwargs) -> ProcessResult:
+    """Run a child process through the shared runner and wait for it.
+
+    Args:
+        cmd (List[str]): Command, starting with the executable
+        **kwargs: See ProcessRunner.run_async()
+
+    Returns:
+        ProcessResult: Exit statistics of the child
+    """
+    return ProcessRunner.run(cmd, **kwargs)
@@ -1,73 +1,261 @@
 """Settings management utilities for BeAnonymous."""
+import contextlib
 import json
+import os
+import sys
+import threading
+import time
 from pathlib import Path
 from ..utils.logger import get_logger
 
 logger = get_logger('SETTINGS')
 
 class SettingsManager:
-    """Centralized settings management for the application."""
+    """Centralized settings management for the application.
+
+    Settings are cached in memory and only re-read when the file changes
+    on disk (its mtime, size or inode differ), so frequent lookups cost a
+    stat call. Writes merge into the latest file contents under an
+    exclusive file lock and replace the file atomically, so concurrent
+    writers in several processes never lose each other's keys.
+    """
     SETTINGS_FILE = Path.home() / ".beanonymous" / "settings.json"
-    
+
     # Default settings
     DEFAULT_SETTINGS = {
         'tts_rate': 195,
         'tts_voice_id': 0,
         'pitch_factor': 0.35,
-        'last_output_path': ''
+        'last_output_path': '',
+        'video_cache_max_mb': 2048,
+        'use_ram_workspace': False,
+        'fuse_pitch': True,
+        'use_tts_worker': True,
+        'tts_worker_timeout': 120,
+        'narration_cache': True,
+        'narration_cache_max_mb': 512,
+        'chunked_tts': True,
+        'tts_chunk_workers': 0,
+        'tts_chunk_cache_max_mb': 256,
+        'ffmpeg_stall_timeout': 60,
+        'ffmpeg_max_processes': 0,
+        'queue_workers': 2,
+        'encode_profile': 'balanced',
+        'render_trace_log': True,
+        'trace_json_logs': False
     }
-    
-    
+
+    # Attempts at replacing the settings file, Windows refuses while a reader has it open
+    REPLACE_ATTEMPTS = 5
+
+    _cache = None  # Settings as stored in the file, without defaults
+    _signature = None  # (mtime_ns, size, inode) of the cached file, None if missing
+    _lock = threading.RLock()
+    _subscribers = []
+
     @classmethod
-    def load_settings(cls):
-        """Load settings from file."""
+    def _stat_signature(cls):
+        """Identify the current version of the settings file.
+
+        Returns:
+            tuple: (mtime_ns, size, inode), or None if there is no file
+        """
         try:
-            if cls.SETTINGS_FILE.exists():
-                with open(cls.SETTINGS_FILE, 'r') as f:
-                    settings = json.load(f)
-                    # Merge with defaults to ensure all keys exist
-                    return {**cls.DEFAULT_SETTINGS, **settings}
-            else:
-                logger.info("No settings file found, using defaults")
-                return dict(cls.DEFAULT_SETTINGS)
+            stat = cls.SETTINGS_FILE.stat()
+        except FileNotFoundError:
+            return None
+        return (stat.st_mtime_ns, stat.st_size, stat.st_ino)
+
+    @classmethod
+    def _read_file(cls):
+        """Read the settings file.
+
+        Returns:
+            dict: Stored settings, empty if missing or unreadable
+        """
+        try:
+            with open(cls.SETTINGS_FILE, 'r') as f:
+                settings = json.load(f)
+            return settings if isinstance(settings, dict) else {}
+        except FileNotFoundError:
+            return {}
         except Exception as e:
             logger.error(f"Error loading settings: {e}")
-            return dict(cls.DEFAULT_SETTINGS)
-    
+            return {}
+
+    @classmethod
+    def _stored_settings(cls):
+        """Get the stored settings, re-reading the file only if it changed.
+
+        Returns:
+            dict: Stored settings (the cached dict, do not modify)
+        """
+        changed = {}
+        with cls._lock:
+            signature = cls._stat_signature()
+            if cls._cache is None or signature != cls._signature:
+                previous = cls._cache
+                cls._cache = cls._read_file()
+                cls._signature = signature
+                if signature is None and previous is None:
+                    logger.info("No settings file found, using defaults")
+                if previous is not None:
+                    changed = cls._diff(previous, cls._cache)
+            stored = cls._cache
+        if changed:
+            # Another process wrote the file
+            cls._notify(changed)
+        return stored
+
+    @classmethod
+    def _diff(cls, old, new):
+        """Find settings whose effective value changed.
+
+        Returns:
+            dict: Changed keys with their new effective values
+        """
+        old = {**cls.DEFAULT_SETTINGS, **old}
+        new = {**cls.DEFAULT_SETTINGS, **new}
+        return {key: new.get(key) for key in old.keys() | new.keys() if old.get(key) != new.get(key)}
+
+    @classmethod
+    def load_settings(cls):
+        """Load settings merged with the defaults.
+
+        Returns:
+            dict: A copy of the current settings
+        """
+        # Merge with defaults to ensure all keys exist
+        return {**cls.DEFAULT_SETTINGS, **cls._stored_settings()}
+
+    @classmethod
+    @contextlib.contextmanager
+    def _file_lock(cls):
+        """Hold an exclusive lock shared by every process using the settings file."""
+        lock_path = cls.SETTINGS_FILE.with_name(cls.SETTINGS_FILE.name + '.lock')
+        with open(lock_path, 'a+') as lock_file:
+            if sys.platform == "win32":
+                import msvcrt
+                lock_file.seek(0)
+                # LK_LOCK retries for about 10 seconds before giving up
+                msvcrt.locking(lock_file.fileno(), msvcrt.LK_LOCK, 1)
+                try:
+                    yield
+                finally:
+                    lock_file.seek(0)
+                    msvcrt.locking(lock_file.fileno(), msvcrt.LK_UNLCK, 1)
+            else:
+                import fcntl
+                fcntl.flock(lock_file.fileno(), fcntl.LOCK_EX)
+                try:
+                    yield
+                finally:
+                    fcntl.flock(lock_file.fileno(), fcntl.LOCK_UN)
+
+    @classmethod
+    def _write_file(cls, settings):
+        """Write the settings file atomically via a temp file and rename."""
+        temp_file = cls.SETTINGS_FILE.with_name(
+            f"{cls.SETTINGS_FILE.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+        with open(temp_file, 'w') as f:
+            json.dump(settings, f)
+            f.flush()
+            os.fsync(f.fileno())
+        for attempt in range(cls.REPLACE_ATTEMPTS):
+            try:
+                os.replace(temp_file, cls.SETTINGS_FILE)
+                return
+            except PermissionError:
+                if attempt == cls.REPLACE_ATTEMPTS - 1:
+                    temp_file.unlink()
+                    raise
+                time.sleep(0.05)
+
     @classmethod
     def save_settings(cls, settings):
         """Save settings to file.
-        
+
+        The given keys are merged into the latest file contents, other
+        keys are preserved.
+
         Args:
             settings (dict): Settings to save
+
+        Returns:
+            bool: True if the settings were written
         """
         try:
             # Create settings directory if it doesn't exist
             cls.SETTINGS_FILE.parent.mkdir(parents=True, exist_ok=True)
-            
-            # Merge with current settings to preserve other values
-            current_settings = cls.load_settings()
-            current_settings.update(settings)
-            
-            with open(cls.SETTINGS_FILE, 'w') as f:
-                json.dump(current_settings, f)
-                
+
+            with cls._lock, cls._file_lock():
+                previous = cls._cache if cls._cache is not None else {}
+                # Merge with what is on disk now, not the cache, to keep other writers' values
+                current_settings = cls._read_file()
+                current_settings.update(settings)
+                cls._write_file(current_settings)
+                cls._cache = current_settings
+                cls._signature = cls._stat_signature()
+                changed = cls._diff(previous, current_settings)
+
             logger.info("Settings saved successfully")
-            return True
         except Exception as e:
             logger.error(f"Error saving settings: {e}")
             return False
-    
+
+        if changed:
+            cls._notify(changed)
+        return True
+
     @classmethod
     def get_setting(cls, key, default=None):
         """Get a single setting value.
-        
+
         Args:
             key (str): Setting key to get
             default: Default value if setting doesn't exist
-            
+
         Returns:
             Setting value or default
         """
-        settings = cls.load_settings()
-        return settings.get(key, default)
+        stored = cls._stored_settings()
+        if key in stored:
+            return stored[key]
+        return cls.DEFAULT_SETTINGS.get(key, default)
+
+    @classmethod
+    def subscribe(cls, callback):
+        """Call a function whenever settings change.
+
+        Changes are detected on save and when the file is re-read after
+        another process wrote it. The callback runs on the thread that
+        noticed the change.
+
+        Args:
+            callback (callable): Receives a dict of changed keys and their new values
+        """
+        with cls._lock:
+            if callback not in cls._subscribers:
+                cls._subscribers.append(callback)
+
+    @classmethod
+    def unsubscribe(cls, callback):
+        """Stop calling a subscribed function.
+
+        Args:
+            callback (callable): Function passed to subscribe()
+        """
+        with cls._lock:
+            if callback in cls._subscribers:
+                cls._subscribers.remove(callback)
+
+    @classmethod
+    def _notify(cls, changed):
+        """Pass changed settings to every subscriber."""
+        with cls._lock:
+            subscribers = list(cls._subscribers)
+        for callback in subscribers:
+            try:
+                callback(dict(changed))
+            except Exception as e:
+                logger.error(f"Settings subscriber failed: {e}")
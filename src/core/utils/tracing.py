@@ -0,0 +1,316 @@
+"""Structured per-stage timing and resource spans for render jobs."""
+
+import contextlib
+import contextvars
+import json
+import os
+import sys
+import threading
+import time
+from typing import Dict, Iterable, List, Optional
+from ...config.settings import TRACE_LOG_PATH, TRACE_LOG_MAX_BYTES
+from ..utils.file_lock import file_lock
+from ..utils.logger import get_logger
+from ..utils.settings_manager import SettingsManager
+
+try:
+    import resource
+except ImportError:  # Not available on Windows, resource fields stay None
+    resource = None
+
+logger = get_logger('TRACE')
+
+# ru_maxrss is in bytes on macOS and KiB elsewhere
+_RSS_UNIT = 1 if sys.platform == 'darwin' else 1024
+# ru_inblock/ru_oublock count 512-byte blocks
+_BLOCK_SIZE = 512
+
+_current_trace = contextvars.ContextVar('render_trace', default=None)
+_current_span = contextvars.ContextVar('render_span', default=None)
+_log_lock = threading.Lock()
+
+def _usage() -> Optional[Dict]:
+    """Snapshot resource usage of this process and its reaped children."""
+    if resource is None:
+        return None
+    children = resource.getrusage(resource.RUSAGE_CHILDREN)
+    own = resource.getrusage(resource.RUSAGE_SELF)
+    return {
+        'child_cpu_user': children.ru_utime,
+        'child_cpu_system': children.ru_stime,
+        'child_peak_rss': children.ru_maxrss * _RSS_UNIT,
+        'child_read_bytes': children.ru_inblock * _BLOCK_SIZE,
+        'child_write_bytes': children.ru_oublock * _BLOCK_SIZE,
+        'peak_rss': own.ru_maxrss * _RSS_UNIT
+    }
+
+def _file_bytes(paths: Iterable) -> int:
+    """Total size of the given files that exist."""
+    total = 0
+    for path in paths:
+        try:
+            total += os.path.getsize(path)
+        except (OSError, TypeError):
+            pass
+    return total
+
+class Span:
+    """One timed stage or child process inside a job trace.
+
+    Child CPU time and block I/O come from RUSAGE_CHILDREN, which only
+    counts children that have exited and been waited for, and covers the
+    whole process: spans of renders running in parallel threads also see
+    each other's children. Peak RSS values are high-water marks, not deltas.
+    """
+
+    def __init__(self, trace: 'JobTrace', name: str, parent: Optional['Span'], attrs: Dict):
+        """Start the span.
+
+        Args:
+            trace (JobTrace): Trace the span belongs to
+            name (str): Stage name
+            parent (Span, optional): Enclosing span
+            attrs (Dict): Extra fields stored with the span
+        """
+        self.trace = trace
+        self.id = trace.next_span_id()
+        self.name = name
+        self.parent = parent
+        self.depth = parent.depth + 1 if parent else 0
+        self.attrs = attrs
+        self.status = 'ok'
+        self.input_bytes = 0
+        self.output_paths: List = []
+        self.start = time.perf_counter()
+        self.wall = None
+        self._usage_start = _usage()
+        self.usage = {}
+
+    def add_io(self, inputs: Iterable = (), outputs: Iterable = ()) -> None:
+        """Count files read and written by the stage.
+
+        Inputs are measured now, outputs when the span ends.
+
+        Args:
+            inputs (Iterable): Input file paths
+            outputs (Iterable): Output file paths
+        """
+        self.input_bytes += _file_bytes(inputs)
+        self.output_paths.extend(outputs)
+
+    def finish(self) -> None:
+        """Stop the clock and take the resource deltas."""
+        self.wall = time.perf_counter() - self.start
+        end = _usage()
+        if end is not None and self._usage_start is not None:
+            self.usage = {
+                key: round(end[key] - self._usage_start[key], 4)
+                for key in ('child_cpu_user', 'child_cpu_system', 'child_read_bytes', 'child_write_bytes')
+            }
+            self.usage['child_peak_rss'] = end['child_peak_rss']
+            self.usage['peak_rss'] = end['peak_rss']
+
+    def to_dict(self) -> Dict:
+        """Convert the span to a JSON-serializable dict."""
+        return {
+            'id': self.id,
+            'parent': self.parent.id if self.parent else None,
+            'name': self.name,
+            'depth': self.depth,
+            'start': round(self.start - self.trace.start, 4),
+            'wall': round(self.wall, 4) if self.wall is not None else None,
+            'child_cpu_user': self.usage.get('child_cpu_user'),
+            'child_cpu_system': self.usage.get('child_cpu_system'),
+            'child_peak_rss': self.usage.get('child_peak_rss'),
+            'peak_rss': self.usage.get('peak_rss'),
+            'child_read_bytes': self.usage.get('child_read_bytes'),
+            'child_write_bytes': self.usage.get('child_write_bytes'),
+            'input_bytes': self.input_bytes,
+            'output_bytes': _file_bytes(self.output_paths),
+            'status': self.status,
+            **self.attrs
+        }
+
+class JobTrace:
+    """All spans recorded while rendering one job."""
+
+    def __init__(self, job_id: Optional[str]):
+        """Start the trace.
+
+        Args:
+            job_id (str, optional): Job identifier
+        """
+        self.job_id = job_id
+        self.started_at = time.time()
+        self.start = time.perf_counter()
+        self.wall = None
+        self.status = 'ok'
+        self.spans: List[Dict] = []
+        self.fields: Dict = {}
+        self._next_id = 0
+        self._lock = threading.Lock()
+
+    def next_span_id(self) -> int:
+        """Allocate a span id."""
+        with self._lock:
+            self._next_id += 1
+            return self._next_id
+
+    def record(self, span: Span) -> None:
+        """Store a finished span."""
+        record = span.to_dict()
+        with self._lock:
+            self.spans.append(record)
+        if SettingsManager.get_setting('trace_json_logs', False):
+            logger.info(json.dumps({'job_id': self.job_id, **record}))
+
+    def stages(self) -> Dict[str, float]:
+        """Wall time of the top-level stages.
+
+        Returns:
+            Dict[str, float]: Seconds by stage name, summed if a stage ran twice
+        """
+        stages = {}
+        for record in self.spans:
+            if record['depth'] == 0:
+                stages[record['name']] = round(stages.get(record['name'], 0) + record['wall'], 4)
+        return stages
+
+    def to_dict(self) -> Dict:
+        """Convert the trace to one JSON-serializable record."""
+        with self._lock:
+            spans = sorted(self.spans, key=lambda record: record['start'])
+        return {
+            'job_id': self.job_id,
+            'started_at': self.started_at,
+            'wall': round(self.wall, 4) if self.wall is not None else None,
+            'status': self.status,
+            'stages': self.stages(),
+            **self.fields,
+            'spans': spans
+        }
+
+@contextlib.contextmanager
+def trace_job(job_id: Optional[str] = None):
+    """Collect the spans of one job and write its record when done.
+
+    Args:
+        job_id (str, optional): Job identifier
+
+    Yields:
+        JobTrace: The trace, finished when the block exits
+    """
+    trace = JobTrace(job_id)
+    trace_token = _current_trace.set(trace)
+    span_token = _current_span.set(None)
+    try:
+        yield trace
+    except BaseException as e:
+        trace.status = 'cancelled' if type(e).__name__ == 'JobCancelled' else 'failed'
+        raise
+    finally:
+        trace.wall = time.perf_counter() - trace.start
+        _current_span.reset(span_token)
+        _current_trace.reset(trace_token)
+        write_trace(trace.to_dict())
+
+@contextlib.contextmanager
+def span(name: str, inputs: Iterable = (), outputs: Iterable = (), **attrs):
+    """Time a stage of the current job; does nothing outside trace_job().
+
+    Args:
+        name (str): Stage name
+        inputs (Iterable): Input files, counted into input_bytes
+        outputs (Iterable): Output files, counted into output_bytes at the end
+        **attrs: Extra JSON-serializable fields
+
+    Yields:
+        Optional[Span]: The span, None when no job is being traced
+    """
+    trace = _current_trace.get()
+    if trace is None:
+        yield None
+        return
+    current = Span(trace, name, _current_span.get(), attrs)
+    current.add_io(inputs, outputs)
+    token = _current_span.set(current)
+    try:
+        yield current
+    except BaseException as e:
+        current.status = 'cancelled' if type(e).__name__ == 'JobCancelled' else 'failed'
+        raise
+    finally:
+        _current_span.reset(token)
+        current.finish()
+        trace.record(current)
+
+def annotate(**fields) -> None:
+    """Add JSON-serializable fields to the current job's record, if any."""
+    trace = _current_trace.get()
+    if trace is not None:
+        trace.fields.update(fields)
+
+def write_trace(record: Dict) -> None:
+    """Append a job record to the trace log if enabled.
+
+    Once the log would grow past TRACE_LOG_MAX_BYTES it is renamed to
+    render_traces.jsonl.1, replacing the previous one, and a new log is
+    started.
+
+    Args:
+        record (Dict): JobTrace.to_dict() output
+    """
+    if not SettingsManager.get_setting('render_trace_log', True):
+        return
+    try:
+        line = json.dumps(record) + "\n"
+        lock_path = TRACE_LOG_PATH.with_name(TRACE_LOG_PATH.name + '.lock')
+        # Batch workers, the GUI and the service append to the same log
+        with _log_lock, file_lock(lock_path):
+            try:
+                if TRACE_LOG_PATH.stat().st_size + len(line) > TRACE_LOG_MAX_BYTES:
+                    os.replace(TRACE_LOG_PATH, TRACE_LOG_PATH.with_name(TRACE_LOG_PATH.name + '.1'))
+            except FileNotFoundError:
+                pass
+            except OSError as e:
+                # e.g. the log is open in another program on Windows, keep appending
+                logger.error(f"Could not roll over the render trace log: {e}")
+            with open(TRACE_LOG_PATH, 'a', encoding='utf-8') as f:
+                f.write(line)
+    except Exception as e:
+        logger.error(f"Error writing render trace: {e}")
+
+def format_breakdown(record: Dict) -> str:
+    """Describe where a job spent its time, one line per stage.
+
+    Args:
+        record (Dict): JobTrace.to_dict() output
+
+    Returns:
+        str: e.g. "tts 2.3s\\n  synthesize 2.0s\\n  pitch adjustment 0.3s (CPU 0.4s)"
+    """
+    def cpu(spans):
+        values = [s['child_cpu_user'] + s['child_cpu_system'] for s in spans
+                  if s.get('child_cpu_user') is not None]
+        return f" (CPU {sum(values):.1f}s)" if values and sum(values) >= 0.05 else ""
+
+    spans = record.get('spans', [])
+    lines = []
+    for stage in (s for s in spans if s['depth'] == 0):
+        lines.append(f"{stage['name']} {stage['wall']:.1f}s{cpu([stage])}")
+        # Group direct children, ffmpeg runs by their label
+        groups = {}
+        for child in spans:
+            if child['parent'] == stage['id']:
+                groups.setdefault(child.get('label', child['name']), []).append(child)
+        for name, group in groups.items():
+            count = f" x{len(group)}" if len(group) > 1 else ""
+            wall = sum(child['wall'] for child in group)
+            lines.append(f"  {name}{count} {wall:.1f}s{cpu(group)}")
+    if record.get('wall') is not None:
+        lines.append(f"total {record['wall']:.1f}s")
+    critical_path = record.get('critical_path')
+    if critical_path and critical_path['stages']:
+        lines.append(f"critical path {' > '.join(critical_path['stages'])} "
+                     f"{critical_path['seconds']:.1f}s")
+    return '\n'.join(lines)
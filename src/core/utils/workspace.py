@@ -0,0 +1,71 @@
+"""Per-job temporary workspaces for BeAnonymous."""
+
+import re
+import shutil
+import tempfile
+from pathlib import Path
+from typing import Optional
+from ...config.settings import WORKSPACE_ROOT, RAM_WORKSPACE_ROOT
+from ..utils.logger import get_logger
+from ..utils.settings_manager import SettingsManager
+
+logger = get_logger('WORKSPACE')
+
+class JobWorkspace:
+    """A unique temp directory owned by a single render job.
+
+    TTS, pitch conversion and video generation write all their intermediate
+    files here, so concurrent renders never touch each other's files.
+    """
+
+    def __init__(self, job_id: Optional[str] = None, use_ram: Optional[bool] = None,
+                 base_dir: Optional[Path] = None):
+        """Create the workspace directory.
+
+        Args:
+            job_id (str, optional): Job identifier used as the directory prefix
+            use_ram (bool, optional): Place the workspace on a RAM-backed
+                filesystem (/dev/shm) when available. Defaults to the
+                'use_ram_workspace' setting.
+            base_dir (Path, optional): Parent directory override
+        """
+        if base_dir is None:
+            if use_ram is None:
+                use_ram = SettingsManager.get_setting('use_ram_workspace', False)
+            base_dir = WORKSPACE_ROOT
+            if use_ram:
+                if RAM_WORKSPACE_ROOT.parent.is_dir():
+                    base_dir = RAM_WORKSPACE_ROOT
+                else:
+                    logger.info(f"{RAM_WORKSPACE_ROOT.parent} not available, using {WORKSPACE_ROOT}")
+
+        base_dir = Path(base_dir)
+        base_dir.mkdir(parents=True, exist_ok=True)
+        prefix = re.sub(r'[^A-Za-z0-9_.-]', '_', job_id or 'job')
+        self.job_id = job_id
+        self.path = Path(tempfile.mkdtemp(prefix=f"{prefix}-", dir=base_dir)).resolve()
+        logger.info(f"Created workspace {self.path}")
+
+    def file(self, name: str) -> Path:
+        """Get the path of a file inside the workspace.
+
+        Args:
+            name (str): File name
+
+        Returns:
+            Path: Absolute path inside the workspace
+        """
+        return self.path / name
+
+    def cleanup(self) -> None:
+        """Delete the workspace and everything in it."""
+        if self.path.exists():
+            shutil.rmtree(self.path, ignore_errors=True)
+            logger.info(f"Removed workspace {self.path}")
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, tb):
+        self.cleanup()
+        return False
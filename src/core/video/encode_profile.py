@@ -0,0 +1,85 @@
+"""Named encoder profiles for BeAnonymous renders."""
+
+from typing import List, Optional
+from ...config.settings import (
+    ENCODE_PROFILES,
+    DEFAULT_ENCODE_PROFILE,
+    OUTPUT_VIDEO_CODEC,
+    OUTPUT_AUDIO_CODEC
+)
+from ..utils.logger import get_logger
+from ..utils.settings_manager import SettingsManager
+
+logger = get_logger('ENCODE PROFILE')
+
+class EncodeProfile:
+    """Preset, CRF, thread count, resolution and audio bitrate for an encode."""
+
+    def __init__(self, name, preset, crf, threads=0, height=None, audio_bitrate='128k'):
+        """Initialize an encode profile.
+
+        Args:
+            name (str): Profile name
+            preset (str): libx264 preset, e.g. 'veryfast'
+            crf (int): libx264 constant rate factor
+            threads (int): Encoder threads, 0 lets ffmpeg decide
+            height (int, optional): Output height, None keeps the source resolution
+            audio_bitrate (str): AAC bitrate, e.g. '128k'
+        """
+        self.name = name
+        self.preset = preset
+        self.crf = crf
+        self.threads = threads
+        self.height = height
+        self.audio_bitrate = audio_bitrate
+
+    @classmethod
+    def load(cls, name: Optional[str] = None) -> 'EncodeProfile':
+        """Look up a named profile.
+
+        Args:
+            name (str, optional): One of ENCODE_PROFILES, defaults to the
+                'encode_profile' setting
+
+        Returns:
+            EncodeProfile: The profile, or the default one if the name is unknown
+        """
+        if name is None:
+            name = SettingsManager.get_setting('encode_profile', DEFAULT_ENCODE_PROFILE)
+        if name not in ENCODE_PROFILES:
+            logger.error(f"Unknown encode profile '{name}', using '{DEFAULT_ENCODE_PROFILE}'")
+            name = DEFAULT_ENCODE_PROFILE
+        return cls(name, **ENCODE_PROFILES[name])
+
+    def video_args(self) -> List[str]:
+        """ffmpeg output options for the video stream.
+
+        Returns:
+            List[str]: Codec, preset, CRF and thread options
+        """
+        args = [
+            '-c:v', OUTPUT_VIDEO_CODEC,
+            '-preset', self.preset,
+            '-crf', str(self.crf)
+        ]
+        if self.threads:
+            args += ['-threads', str(self.threads)]
+        return args
+
+    def audio_args(self) -> List[str]:
+        """ffmpeg output options for the audio stream.
+
+        Returns:
+            List[str]: Codec and bitrate options
+        """
+        return ['-c:a', OUTPUT_AUDIO_CODEC, '-b:a', self.audio_bitrate]
+
+    def scale_filter(self) -> Optional[str]:
+        """Filter that resizes video to the profile height.
+
+        Returns:
+            Optional[str]: scale filter keeping the aspect ratio, None at source resolution
+        """
+        if self.height is None:
+            return None
+        return f'scale=-2:{self.height}'
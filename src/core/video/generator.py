@@ -1,5 +1,6 @@
 """Video generation module for BeAnonymous."""
 
+import math
 import subprocess
 from pathlib import Path
 from typing import Optional, Callable
@@ -9,67 +10,185 @@ from ...config.settings import (
     INTRO_VIDEO_PATH,
     VIDEO_OUTPUT_FILENAME,
     TEMP_PATH,
-    RESOURCES_DIR
+    RESOURCES_DIR,
+    RENDER_MODES,
+    RENDER_MODE_LEGACY,
+    RENDER_MODE_STREAM_COPY,
+    RENDER_MODE_CACHED,
+    RENDER_MODE_SPECULATIVE,
+    DEFAULT_RENDER_MODE
 )
+from ..audio.processor import AudioProcessor
+from ..utils.cancel import JobCancelled
+from ..utils.ffmpeg_runner import run_ffmpeg
 from ..utils.logger import get_logger
+from ..utils.media_index import MediaIndex
+from .encode_profile import EncodeProfile
+from .ingest import MezzanineIngest
+from .speculative import SpeculativeBackground
+from .track_cache import VideoTrackCache
 
 logger = get_logger('GENERATOR')
 
 class VideoGenerator:
     """Video generator class for creating anonymous videos."""
-    def __init__(self, video_name, audio_name, output_path, add_intro=False):
+    def __init__(self, video_name, audio_name, output_path, add_intro=False,
+                 render_mode=DEFAULT_RENDER_MODE, output_filename=VIDEO_OUTPUT_FILENAME,
+                 workspace=None, tts_path=None, pitch_factor=None, cancel_token=None,
+                 encode_profile=None, intro_path=None, speculative_background=None):
         """Initialize video generator.
         
         Args:
-            video_name (str): Name of the background video file (without extension)
-            audio_name (str): Name of the background audio file (without extension)
+            video_name (str): Name of the background video file (without extension),
+                or a path to an existing video file
+            audio_name (str): Name of the background audio file (without extension),
+                or a path to an existing audio file
             output_path (str): Directory to save the final video
             add_intro (bool): Whether to add the anonymous intro
-        """        
-        self.video_path = Path(VIDEO_ASSETS_PATH) / f"{video_name}.mp4"
-        self.audio_path = Path(AUDIO_ASSETS_PATH) / f"{audio_name}.mp3"
+            render_mode (str): One of RENDER_MODES, controls how the video is rendered
+            output_filename (str): File name of the final video inside output_path
+            workspace (JobWorkspace, optional): Job workspace for intermediate files,
+                defaults to the shared TEMP_PATH
+            tts_path (str, optional): Processed narration file, defaults to
+                final_tts.mp3 in the workspace
+            pitch_factor (float, optional): When set, the narration is an
+                unprocessed WAV and the pitch filter is applied inside the
+                render filtergraph
+            cancel_token (CancelToken, optional): Kills the running ffmpeg
+                process when cancelled
+            encode_profile (str, optional): One of ENCODE_PROFILES, defaults to
+                the 'encode_profile' setting
+            intro_path (str, optional): Intro video, defaults to INTRO_VIDEO_PATH
+            speculative_background (SpeculativeBackground, optional): Background
+                already encoded from an estimated length, used by the
+                speculative render mode. Encoded during generate() when omitted.
+        """
+        if render_mode not in RENDER_MODES:
+            raise ValueError(f"Unknown render mode: {render_mode}")
+        self.render_mode = render_mode
+        self.video_path = self.resolve_video(video_name)
+        self.audio_path = self._resolve_asset(audio_name, AUDIO_ASSETS_PATH, ".mp3")
         self.output_path = Path(output_path)
+        self.output_filename = output_filename
         self.add_intro = add_intro
-        self.tts_path = TEMP_PATH / "final_tts.mp3"
-        
-        # If video file doesn't exist in new stock directory, try alternative locations
-        if not self.video_path.exists():
-            # Try to find the video in the resources/videos directory as a fallback
-            fallback_path = RESOURCES_DIR / "videos" / f"{video_name}.mp4"
-            if fallback_path.exists():
-                self.video_path = fallback_path
-                logger.info(f"Using fallback video path: {self.video_path}")
-            else:
-                logger.error(f"Video file not found: {self.video_path}")
-                raise FileNotFoundError(f"Video file not found: {self.video_path}")
+        self.intro_path = Path(intro_path) if intro_path else Path(INTRO_VIDEO_PATH)
+        self.temp_dir = workspace.path if workspace else TEMP_PATH
+        self.temp_dir.mkdir(parents=True, exist_ok=True)
+        self.tts_path = Path(tts_path) if tts_path else self.temp_dir / "final_tts.mp3"
+        self.pitch_factor = pitch_factor
+        self.cancel_token = cancel_token
+        self.encode_profile = EncodeProfile.load(encode_profile)
+        self.speculative_background = speculative_background
+        self._progress_callback = None
         
         # Ensure other required files exist
         if not self.audio_path.exists():
             raise FileNotFoundError(f"Audio file not found: {self.audio_path}")
         if not self.tts_path.exists():
             raise FileNotFoundError(f"TTS audio file not found: {self.tts_path}")
-        if add_intro and not Path(INTRO_VIDEO_PATH).exists():
-            raise FileNotFoundError(f"Intro video not found: {INTRO_VIDEO_PATH}")
+        if add_intro and not self.intro_path.exists():
+            raise FileNotFoundError(f"Intro video not found: {self.intro_path}")
+
+    @classmethod
+    def resolve_video(cls, video_name):
+        """Resolve a background video name or path to an existing file.
+        
+        Args:
+            video_name (str): Stock video name (without extension) or a path
+            
+        Returns:
+            Path: Path to the video
+            
+        Raises:
+            FileNotFoundError: If the video cannot be found
+        """
+        video_path = cls._resolve_asset(video_name, VIDEO_ASSETS_PATH, ".mp4")
+        # If video file doesn't exist in new stock directory, try alternative locations
+        if not video_path.exists():
+            # Try to find the video in the resources/videos directory as a fallback
+            fallback_path = RESOURCES_DIR / "videos" / f"{video_name}.mp4"
+            if fallback_path.exists():
+                logger.info(f"Using fallback video path: {fallback_path}")
+                return fallback_path
+            logger.error(f"Video file not found: {video_path}")
+            raise FileNotFoundError(f"Video file not found: {video_path}")
+        return video_path
+
+    @classmethod
+    def prepare_background(cls, video_name, render_mode=DEFAULT_RENDER_MODE, cancel_token=None):
+        """Do the background work that does not need the narration.
+        
+        Probes the clip and, for stream-copy renders, ingests it. Results go
+        to the media index and mezzanine cache, where generate() finds them,
+        so this can run while the narration is still being synthesized.
+        
+        Args:
+            video_name (str): Background video name or path
+            render_mode (str): One of RENDER_MODES
+            cancel_token (CancelToken, optional): Kills a running ingest when cancelled
+            
+        Returns:
+            float: Duration of the clip the render will loop, in seconds
+        """
+        video_path = cls.resolve_video(video_name)
+        if render_mode == RENDER_MODE_STREAM_COPY:
+            video_path = MezzanineIngest.ingest(video_path, cancel_token=cancel_token)
+        return MediaIndex.duration(video_path)
+
+    @staticmethod
+    def prepare_intro(render_mode=DEFAULT_RENDER_MODE, intro_path=None, cancel_token=None):
+        """Probe the intro, ingesting it first for the stream-copy render modes.
+        
+        Like prepare_background(), this only warms caches used by generate().
+        
+        Args:
+            render_mode (str): One of RENDER_MODES
+            intro_path (str, optional): Intro video, defaults to INTRO_VIDEO_PATH
+            cancel_token (CancelToken, optional): Kills a running ingest when cancelled
+            
+        Returns:
+            float: Duration of the intro in seconds
+        """
+        intro_path = Path(intro_path) if intro_path else Path(INTRO_VIDEO_PATH)
+        if render_mode in (RENDER_MODE_STREAM_COPY, RENDER_MODE_CACHED, RENDER_MODE_SPECULATIVE):
+            intro_path = MezzanineIngest.ingest(intro_path, keep_audio=True, cancel_token=cancel_token)
+        return MediaIndex.duration(intro_path)
 
-    def _get_audio_duration(self, audio_path):
-        """Get duration of audio file using ffprobe.
+    @staticmethod
+    def _resolve_asset(name, assets_dir, extension):
+        """Resolve an asset name or explicit file path.
+        
+        Args:
+            name (str): Asset name without extension, or a path to a file
+            assets_dir (Path): Directory holding named assets
+            extension (str): Extension of named assets
+            
+        Returns:
+            Path: Path to the asset (may not exist)
+        """
+        candidate = Path(name)
+        if candidate.suffix and candidate.is_file():
+            return candidate
+        return Path(assets_dir) / f"{name}{extension}"
+
+    def _get_audio_duration(self, audio_path, persist=True):
+        """Get duration of audio file from the media index.
         
         Args:
             audio_path (str): Path to audio file
+            persist (bool): Keep the probe result in the on-disk index
             
         Returns:
             float: Duration in seconds
         """
         try:
-            cmd = f'ffprobe -v quiet -show_entries format=duration -of default=noprint_wrappers=1:nokey=1 "{audio_path}"'
-            result = subprocess.run(cmd, capture_output=True, text=True, shell=True)
-            return float(result.stdout.strip())
+            return MediaIndex.duration(audio_path, persist)
         except Exception as e:
             logger.error(f"Error getting audio duration: {str(e)}")
             raise
 
     def _get_video_duration(self, video_path):
-        """Get duration of video file using ffprobe.
+        """Get duration of video file from the media index.
         
         Args:
             video_path (str): Path to video file
@@ -78,95 +197,353 @@ class VideoGenerator:
             float: Duration in seconds
         """
         try:
-            cmd = f'ffprobe -v quiet -show_entries format=duration -of default=noprint_wrappers=1:nokey=1 "{video_path}"'
-            result = subprocess.run(cmd, capture_output=True, text=True, shell=True)
-            return float(result.stdout.strip())
+            return MediaIndex.duration(video_path)
         except Exception as e:
             logger.error(f"Error getting video duration: {str(e)}")
-            raise    
+            raise
+
+    def _get_narration_duration(self):
+        """Get the duration of the narration as it will sound in the render.
         
-    def generate(self, progress_callback: Optional[Callable[[float], None]] = None) -> bool:
+        Returns:
+            float: Duration in seconds
+        """
+        if self.pitch_factor is None:
+            # Per-job intermediate, not worth keeping in the index
+            return self._get_audio_duration(self.tts_path, persist=False)
+        # Fused pitch: the filter stretches the raw WAV, compute from its header
+        return AudioProcessor.pitched_duration(self.tts_path, self.pitch_factor)
+
+    def _narration_filter(self, stream):
+        """Route the narration input through the pitch filter when fused.
+        
+        Args:
+            stream (str): Narration input pad, e.g. '[2:a]'
+            
+        Returns:
+            tuple: (filter prefix ending in ';' or '', pad to use for the narration)
+        """
+        if self.pitch_factor is None:
+            return '', stream
+        return f'{stream}{AudioProcessor.pitch_filter(self.pitch_factor)}[tts];', '[tts]'
+
+    def _scaled_video(self, pad, unscaled_map):
+        """Route the final video through the profile's scale filter, if any.
+        
+        Args:
+            pad (str): Filtergraph pad of the finished video, e.g. '[outv]'
+            unscaled_map (str): -map target to use when no scaling is needed
+            
+        Returns:
+            tuple: (filter suffix starting with ';' or '', -map target for the video)
+        """
+        scale = self.encode_profile.scale_filter()
+        if scale is None:
+            return '', unscaled_map
+        return f';{pad}{scale}[scaledv]', '[scaledv]'
+
+    def _report(self, value, info=None):
+        """Forward progress to the callback passed to generate().
+        
+        Args:
+            value (float): Progress between 0 and 100
+            info (ProgressInfo, optional): Encode speed/ETA details
+        """
+        if self._progress_callback:
+            if info is None:
+                self._progress_callback(value)
+            else:
+                self._progress_callback(value, info)
+
+    def _run_ffmpeg(self, cmd, duration, start, end, label):
+        """Run ffmpeg, mapping its live progress into a slice of the overall range.
+        
+        Args:
+            cmd (list): ffmpeg command
+            duration (float): Expected output duration in seconds
+            start (float): Overall progress when the command starts
+            end (float): Overall progress when the command finishes
+            label (str): Name used in log messages
+        """
+        def on_progress(info):
+            if info.percent is not None:
+                self._report(start + (end - start) * info.percent / 100, info)
+        
+        run_ffmpeg(cmd, duration, on_progress, label=label, cancel_token=self.cancel_token)
+
+    def _render_intro_single_pass(self, tts_duration, intro_duration, output_file):
+        """Render intro + main section with a single ffmpeg filtergraph.
+        
+        The background loop, the TTS/music mix and the intro concatenation
+        all happen in one process, so the main section is encoded exactly
+        once and no intermediate media is written to disk.
+        
+        Args:
+            tts_duration (float): Duration of the main section in seconds
+            intro_duration (float): Duration of the intro in seconds
+            output_file (Path): Final output video path
+        """
+        narration_prefix, narration = self._narration_filter('[2:a]')
+        scale_suffix, video_map = self._scaled_video('[outv]', '[outv]')
+        filter_graph = (
+            f'{narration_prefix}{narration}[3:a]amix=inputs=2:duration=first[main_a];'
+            '[0:v][0:a][1:v][main_a]concat=n=2:v=1:a=1[outv][outa]'
+            f'{scale_suffix}'
+        )
+        cmd = [
+            'ffmpeg', '-y',
+            '-hide_banner', '-loglevel', 'warning',
+            '-i', str(self.intro_path),  # Input 0 - intro
+            '-stream_loop', '-1',  # Loop background video
+            '-t', str(tts_duration),  # Duration from TTS
+            '-i', str(self.video_path),  # Input 1 - background video
+            '-i', str(self.tts_path),  # Input 2 - TTS audio
+            '-i', str(self.audio_path),  # Input 3 - background music
+            '-filter_complex', filter_graph,
+            '-map', video_map,
+            '-map', '[outa]',
+            *self.encode_profile.video_args(),
+            *self.encode_profile.audio_args(),
+            str(output_file)
+        ]
+        logger.info(f"Rendering intro and main section in a single pass ({self.encode_profile.name})...")
+        self._run_ffmpeg(cmd, intro_duration + tts_duration, 20, 90, "single-pass render")
+
+    @staticmethod
+    def _write_concat_list(list_path, clips):
+        """Write an ffmpeg concat demuxer list file.
+        
+        Args:
+            list_path (Path): Where to write the list
+            clips (list): Clip paths in playback order
+        """
+        with open(list_path, 'w', encoding='utf-8') as f:
+            for clip in clips:
+                escaped = str(Path(clip).resolve()).replace("'", "'\\''")
+                f.write(f"file '{escaped}'\n")
+
+    def _render_stream_copy(self, tts_duration, output_file, concat_list):
+        """Render from ingested mezzanine clips, encoding only the audio.
+        
+        Enough repeats of the ingested background to cover the narration
+        are stream-copied after the intro.
+        
+        Args:
+            tts_duration (float): Duration of the main section in seconds
+            output_file (Path): Final output video path
+            concat_list (Path): Where to write the concat demuxer list
+        """
+        background = MezzanineIngest.ingest(self.video_path, cancel_token=self.cancel_token)
+        background_duration = self._get_video_duration(background)
+        repeats = max(1, math.ceil(tts_duration / background_duration))
+        self._mux_stream_copy([background] * repeats, tts_duration, output_file, concat_list)
+
+    def _render_cached(self, tts_duration, output_file, concat_list):
+        """Render using a cached looped background track.
+        
+        The track comes from VideoTrackCache (encoded once per source clip
+        and duration bucket) and is trimmed to the exact length on copy.
+        
+        Args:
+            tts_duration (float): Duration of the main section in seconds
+            output_file (Path): Final output video path
+            concat_list (Path): Where to write the concat demuxer list
+        """
+        track = VideoTrackCache.get_track(self.video_path, tts_duration, self.cancel_token)
+        self._mux_stream_copy([track], tts_duration, output_file, concat_list)
+
+    def _render_speculative(self, tts_duration, output_file, concat_list):
+        """Render from background segments encoded ahead of the narration.
+        
+        Args:
+            tts_duration (float): Duration of the main section in seconds
+            output_file (Path): Final output video path
+            concat_list (Path): Where to write the concat demuxer list
+        """
+        background = self.speculative_background
+        if background is None:
+            background = SpeculativeBackground(self.video_path, self.temp_dir / 'speculative',
+                                               self.cancel_token)
+        self._mux_stream_copy(background.clips_for(tts_duration), tts_duration, output_file,
+                              concat_list)
+
+    def _mux_stream_copy(self, background_clips, tts_duration, output_file, concat_list):
+        """Join mezzanine-format clips with stream copy and mux in fresh audio.
+        
+        The intro (if enabled) and the background clips are joined with the
+        concat demuxer and stream-copied; the output is cut to length with
+        -t. Only the narration/music mix (and intro audio) is encoded, so the
+        encode profile contributes its audio settings only.
+        
+        Args:
+            background_clips (list): Mezzanine-format clips for the main section
+            tts_duration (float): Duration of the main section in seconds
+            output_file (Path): Final output video path
+            concat_list (Path): Where to write the concat demuxer list
+        """
+        clips = list(background_clips)
+        intro_duration = 0.0
+        if self.add_intro:
+            intro = MezzanineIngest.ingest(self.intro_path, keep_audio=True,
+                                           cancel_token=self.cancel_token)
+            intro_duration = self._get_video_duration(intro)
+            clips.insert(0, intro)
+            audio_inputs = ['-i', str(intro), '-i', str(self.tts_path), '-i', str(self.audio_path)]
+            narration_prefix, narration = self._narration_filter('[2:a]')
+            # Pad/trim the intro audio to the intro video so A/V stay aligned
+            filter_graph = (
+                f'[1:a]apad,atrim=end={intro_duration}[intro_a];'
+                f'{narration_prefix}{narration}[3:a]amix=inputs=2:duration=first[main_a];'
+                '[intro_a][main_a]concat=n=2:v=0:a=1[outa]'
+            )
+        else:
+            audio_inputs = ['-i', str(self.tts_path), '-i', str(self.audio_path)]
+            narration_prefix, narration = self._narration_filter('[1:a]')
+            filter_graph = f'{narration_prefix}{narration}[2:a]amix=inputs=2:duration=first[outa]'
+        
+        self._write_concat_list(concat_list, clips)
+        cmd = [
+            'ffmpeg', '-y',
+            '-hide_banner', '-loglevel', 'warning',
+            '-f', 'concat', '-safe', '0',
+            '-i', str(concat_list),  # Input 0 - intro + background
+            *audio_inputs,
+            '-filter_complex', filter_graph,
+            '-map', '0:v',
+            '-map', '[outa]',
+            '-c:v', 'copy',  # Mezzanine clips share one format, no re-encode
+            *self.encode_profile.audio_args(),
+            '-t', str(intro_duration + tts_duration),
+            '-movflags', '+faststart',
+            str(output_file)
+        ]
+        logger.info(f"Stream-copying {len(clips)} mezzanine clip(s)...")
+        self._run_ffmpeg(cmd, intro_duration + tts_duration, 20, 90, "stream-copy mux")
+
+    def _render_intro_legacy(self, tts_duration, intro_duration, temp_video, temp_audio,
+                             output_file):
+        """Render intro + main section with three chained ffmpeg runs.
+        
+        Kept as a fallback for ffmpeg builds that choke on the combined
+        filtergraph. Mixes audio to a temp MP3, muxes it with the looped
+        background, then concatenates the intro with a second re-encode.
+        
+        Args:
+            tts_duration (float): Duration of the main section in seconds
+            intro_duration (float): Duration of the intro in seconds
+            temp_video (Path): Intermediate main section video path
+            temp_audio (Path): Intermediate mixed audio path
+            output_file (Path): Final output video path
+        """
+        # First create mixed audio for main video section (TTS + background music)
+        narration_prefix, narration = self._narration_filter('[0:a]')
+        audio_mix_cmd = [
+            'ffmpeg', '-y',
+            '-hide_banner', '-loglevel', 'warning',
+            '-i', str(self.tts_path),  # TTS audio
+            '-i', str(self.audio_path),  # Background audio
+            '-filter_complex', f'{narration_prefix}{narration}[1:a]amix=inputs=2:duration=first[a]',
+            '-map', '[a]',
+            str(temp_audio)
+        ]
+        self._run_ffmpeg(audio_mix_cmd, tts_duration, 20, 30, "audio mix")
+        self._report(30)  # Audio mix done
+        
+        # Now create a temporary video with the mixed audio
+        temp_main_cmd = [
+            'ffmpeg', '-y',
+            '-hide_banner', '-loglevel', 'warning',
+            '-stream_loop', '-1',  # Loop input video
+            '-t', str(tts_duration),  # Duration from TTS
+            '-i', str(self.video_path),  # Input video
+            '-i', str(temp_audio),  # Mixed audio
+            '-map', '0:v',  # Take video from first input
+            '-map', '1:a',  # Take audio from second input
+            *self.encode_profile.video_args(),
+            *self.encode_profile.audio_args(),
+            str(temp_video)  # Don't use -c:v copy here to ensure compatibility
+        ]
+        self._run_ffmpeg(temp_main_cmd, tts_duration, 30, 50, "main section encode")
+        self._report(50)  # Temp video created
+        
+        # Finally concatenate intro and main video ensuring format compatibility
+        # (scaled after the concat, which needs both parts at the same size)
+        scale_suffix, video_map = self._scaled_video('[outv]', '[outv]')
+        concat_cmd = [
+            'ffmpeg', '-y',
+            '-hide_banner', '-loglevel', 'warning',
+            '-i', str(self.intro_path),  # First input - intro
+            '-i', str(temp_video),  # Second input - main video
+            '-filter_complex',
+            f'[0:v][0:a][1:v][1:a]concat=n=2:v=1:a=1[outv][outa]{scale_suffix}',  # Proper concatenation
+            '-map', video_map,  # Map concatenated video
+            '-map', '[outa]',  # Map concatenated audio
+            *self.encode_profile.video_args(),
+            *self.encode_profile.audio_args(),
+            str(output_file)
+        ]
+        self._run_ffmpeg(concat_cmd, intro_duration + tts_duration, 50, 90, "intro concat")
+        
+    def generate(self, progress_callback: Optional[Callable[..., None]] = None) -> bool:
         """Generate the final video using FFmpeg stream copying.
         
         Args:
-            progress_callback: Optional callback function to receive progress updates
+            progress_callback: Optional callback function to receive progress updates.
+                Called as callback(percent) at milestones and as
+                callback(percent, ProgressInfo) while ffmpeg is encoding.
             
         Returns:
             bool: True if successful, False otherwise
+            
+        Raises:
+            JobCancelled: If the cancel token is cancelled during rendering
         """
         temp_files = []  # Keep track of all temp files
+        output_file = self.output_path / self.output_filename
+        self._progress_callback = progress_callback
         try:
-            if progress_callback:
-                progress_callback(0)  # Start progress
+            self._report(0)  # Start progress
                 
             # Get TTS audio duration
-            tts_duration = self._get_audio_duration(self.tts_path)
-            if progress_callback:
-                progress_callback(10)  # Get audio duration done
+            tts_duration = self._get_narration_duration()
+            self._report(10)  # Get audio duration done
             
-            # Prepare output path
-            output_file = self.output_path / VIDEO_OUTPUT_FILENAME
-            temp_video = TEMP_PATH / "temp_video.mp4"
-            temp_audio = TEMP_PATH / "temp_audio.mp3"
+            # Prepare temp paths
+            temp_video = self.temp_dir / "temp_video.mp4"
+            temp_audio = self.temp_dir / "temp_audio.mp3"
+            concat_list = self.temp_dir / "concat_list.txt"
             
             # Add temp files to tracking list
-            temp_files.extend([temp_video, temp_audio])
+            temp_files.extend([temp_video, temp_audio, concat_list])
+
+            if self.render_mode == RENDER_MODE_STREAM_COPY:
+                self._report(20)  # Ready to assemble
+                self._render_stream_copy(tts_duration, output_file, concat_list)
+
+            elif self.render_mode == RENDER_MODE_CACHED:
+                self._report(20)  # Ready to assemble
+                self._render_cached(tts_duration, output_file, concat_list)
 
-            if self.add_intro:
+            elif self.render_mode == RENDER_MODE_SPECULATIVE:
+                self._report(20)  # Ready to assemble
+                self._render_speculative(tts_duration, output_file, concat_list)
+
+            elif self.add_intro:
                 # Get intro video duration
-                intro_duration = self._get_video_duration(INTRO_VIDEO_PATH)
-                if progress_callback:
-                    progress_callback(20)  # Get video duration done
-                
-                # First create mixed audio for main video section (TTS + background music)
-                audio_mix_cmd = [
-                    'ffmpeg', '-y',
-                    '-hide_banner', '-loglevel', 'warning',
-                    '-i', str(self.tts_path),  # TTS audio
-                    '-i', str(self.audio_path),  # Background audio
-                    '-filter_complex', '[0:a][1:a]amix=inputs=2:duration=first[a]',
-                    '-map', '[a]',
-                    str(temp_audio)
-                ]
-                subprocess.run(audio_mix_cmd, check=True)
-                
-                if progress_callback:
-                    progress_callback(30)  # Audio mix done
-                
-                # Now create a temporary video with the mixed audio
-                temp_main_cmd = [
-                    'ffmpeg', '-y',
-                    '-hide_banner', '-loglevel', 'warning',
-                    '-stream_loop', '-1',  # Loop input video
-                    '-t', str(tts_duration),  # Duration from TTS
-                    '-i', str(self.video_path),  # Input video
-                    '-i', str(temp_audio),  # Mixed audio
-                    '-map', '0:v',  # Take video from first input
-                    '-map', '1:a',  # Take audio from second input
-                    str(temp_video)  # Don't use -c:v copy here to ensure compatibility
-                ]
-                subprocess.run(temp_main_cmd, check=True)
-                
-                if progress_callback:
-                    progress_callback(50)  # Temp video created
-                
-                # Finally concatenate intro and main video ensuring format compatibility
-                concat_cmd = [
-                    'ffmpeg', '-y',
-                    '-hide_banner', '-loglevel', 'warning',
-                    '-i', str(INTRO_VIDEO_PATH),  # First input - intro
-                    '-i', str(temp_video),  # Second input - main video
-                    '-filter_complex',
-                    '[0:v][0:a][1:v][1:a]concat=n=2:v=1:a=1[outv][outa]',  # Proper concatenation
-                    '-map', '[outv]',  # Map concatenated video
-                    '-map', '[outa]',  # Map concatenated audio
-                    str(output_file)
-                ]
-                subprocess.run(concat_cmd, check=True)
+                intro_duration = self._get_video_duration(self.intro_path)
+                self._report(20)  # Get video duration done
+
+                if self.render_mode == RENDER_MODE_LEGACY:
+                    self._render_intro_legacy(tts_duration, intro_duration, temp_video,
+                                              temp_audio, output_file)
+                else:
+                    self._render_intro_single_pass(tts_duration, intro_duration, output_file)
                 
             else:
                 try:
                     # Without intro, simpler command
+                    narration_prefix, narration = self._narration_filter('[1:a]')
+                    scale_suffix, video_map = self._scaled_video('[0:v]', '0:v')
                     cmd = [
                         'ffmpeg', '-y',
                         '-hide_banner', '-loglevel', 'warning',
@@ -175,19 +552,22 @@ class VideoGenerator:
                         '-i', str(self.video_path),  # Input video
                         '-i', str(self.tts_path),  # TTS audio
                         '-i', str(self.audio_path),  # Background audio
-                        '-filter_complex', '[1:a][2:a]amix=inputs=2:duration=first[a]',
-                        '-map', '0:v', '-map', '[a]',
+                        '-filter_complex',
+                        f'{narration_prefix}{narration}[2:a]amix=inputs=2:duration=first[a]{scale_suffix}',
+                        '-map', video_map, '-map', '[a]',
+                        *self.encode_profile.video_args(),
+                        *self.encode_profile.audio_args(),
                         str(output_file)
                     ]
-                    subprocess.run(cmd, check=True)
+                    self._report(20)  # Ready to encode
+                    self._run_ffmpeg(cmd, tts_duration, 20, 90, "render")
                 except subprocess.CalledProcessError as e:
-                    logger.error(f"FFmpeg Error: {e.stderr.decode() if e.stderr else str(e)}")
+                    logger.error(f"FFmpeg Error: {e.stderr or e}")
                     if output_file.exists():
                         output_file.unlink()  # Delete failed output file
                     raise
             
-            if progress_callback:
-                progress_callback(90)  # FFmpeg processing done
+            self._report(90)  # FFmpeg processing done
             
             logger.info(f"Success: Video generated at {output_file}")
             
@@ -201,6 +581,12 @@ class VideoGenerator:
                     pass
             return False
             
+        except JobCancelled:
+            logger.info("Video generation cancelled")
+            if output_file.exists():
+                output_file.unlink()
+            raise
+            
         finally:
             # Clean up ALL temporary files
             try:
@@ -223,7 +609,7 @@ class VideoGenerator:
             except Exception as e:
                 logger.error(f"Error during cleanup: {e}")
                 
-            if progress_callback:
-                progress_callback(100)  # All done
+            self._report(100)  # All done
+            self._progress_callback = None
             
         return True
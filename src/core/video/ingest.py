@@ -0,0 +1,247 @@
+"""Mezzanine ingest for stock and intro videos.
+
+Every clip is transcoded once to a canonical format (same codec, resolution,
+fps, timebase, closed GOPs and a fixed keyframe interval) so renders can join
+them with the ffmpeg concat demuxer and stream-copy the video track.
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import threading
+import uuid
+from pathlib import Path
+from typing import Dict, List
+from ...config.settings import (
+    INTRO_VIDEO_PATH,
+    MEZZANINE_PATH,
+    MEZZANINE_VIDEO_CODEC,
+    MEZZANINE_PROFILE,
+    MEZZANINE_PIX_FMT,
+    MEZZANINE_WIDTH,
+    MEZZANINE_HEIGHT,
+    MEZZANINE_FPS,
+    MEZZANINE_GOP,
+    MEZZANINE_TIMESCALE,
+    MEZZANINE_CRF,
+    MEZZANINE_AUDIO_CODEC,
+    MEZZANINE_AUDIO_RATE,
+    MEZZANINE_AUDIO_BITRATE
+)
+from ..utils.asset_catalog import AssetCatalog, ASSET_KIND_VIDEO
+from ..utils.ffmpeg_runner import run_ffmpeg
+from ..utils.file_lock import file_lock
+from ..utils.logger import get_logger
+from ..utils.media_index import MediaIndex
+
+logger = get_logger('INGEST')
+
+class MezzanineIngest:
+    """Transcodes source clips to the canonical mezzanine format."""
+    INDEX_FILE = MEZZANINE_PATH / "index.json"
+    LOCK_FILE = MEZZANINE_PATH / "index.lock"
+    _lock = threading.Lock()
+
+    @staticmethod
+    def format_signature() -> str:
+        """Get a string identifying the current mezzanine format.
+
+        Returns:
+            str: Signature that changes whenever the canonical format changes
+        """
+        return (
+            f"{MEZZANINE_VIDEO_CODEC}:{MEZZANINE_PROFILE}:{MEZZANINE_PIX_FMT}:"
+            f"{MEZZANINE_WIDTH}x{MEZZANINE_HEIGHT}@{MEZZANINE_FPS}:"
+            f"g{MEZZANINE_GOP}:tb{MEZZANINE_TIMESCALE}:crf{MEZZANINE_CRF}:"
+            f"{MEZZANINE_AUDIO_CODEC}:{MEZZANINE_AUDIO_RATE}:{MEZZANINE_AUDIO_BITRATE}"
+        )
+
+    @staticmethod
+    def video_encode_args() -> List[str]:
+        """Get the ffmpeg output arguments for the canonical video format.
+
+        Returns:
+            List[str]: Encoder, GOP and timebase arguments
+        """
+        video_filter = (
+            f"scale={MEZZANINE_WIDTH}:{MEZZANINE_HEIGHT}:force_original_aspect_ratio=decrease,"
+            f"pad={MEZZANINE_WIDTH}:{MEZZANINE_HEIGHT}:(ow-iw)/2:(oh-ih)/2,"
+            f"setsar=1,fps={MEZZANINE_FPS}"
+        )
+        return [
+            '-vf', video_filter,
+            '-c:v', MEZZANINE_VIDEO_CODEC,
+            '-profile:v', MEZZANINE_PROFILE,
+            '-pix_fmt', MEZZANINE_PIX_FMT,
+            '-crf', str(MEZZANINE_CRF),
+            '-g', str(MEZZANINE_GOP),
+            '-keyint_min', str(MEZZANINE_GOP),
+            '-sc_threshold', '0',  # No scene-cut keyframes, keep the interval fixed
+            '-flags', '+cgop',  # Closed GOPs so every segment starts clean
+            '-video_track_timescale', str(MEZZANINE_TIMESCALE)
+        ]
+
+    @staticmethod
+    def audio_encode_args() -> List[str]:
+        """Get the ffmpeg output arguments for the canonical audio format.
+
+        Returns:
+            List[str]: Audio encoder arguments
+        """
+        return [
+            '-c:a', MEZZANINE_AUDIO_CODEC,
+            '-ar', str(MEZZANINE_AUDIO_RATE),
+            '-ac', '2',
+            '-b:a', MEZZANINE_AUDIO_BITRATE
+        ]
+
+    @classmethod
+    def mezzanine_path_for(cls, source_path) -> Path:
+        """Get the mezzanine file path for a source clip.
+
+        Args:
+            source_path (str): Path to the source clip
+
+        Returns:
+            Path: Location of the ingested clip
+        """
+        source_path = Path(source_path).resolve()
+        digest = hashlib.sha1(str(source_path).encode('utf-8')).hexdigest()[:10]
+        return MEZZANINE_PATH / f"{source_path.stem}-{digest}.mp4"
+
+    @classmethod
+    def _load_index(cls) -> Dict:
+        """Load the ingest index from disk."""
+        try:
+            if cls.INDEX_FILE.exists():
+                with open(cls.INDEX_FILE, 'r') as f:
+                    return json.load(f)
+        except Exception as e:
+            logger.error(f"Error loading ingest index: {e}")
+        return {}
+
+    @classmethod
+    def _save_index(cls, index: Dict) -> None:
+        """Save the ingest index to disk."""
+        try:
+            cls.INDEX_FILE.parent.mkdir(parents=True, exist_ok=True)
+            # Written atomically so concurrent readers never see a partial file
+            temp_file = cls.INDEX_FILE.with_name(
+                f"{cls.INDEX_FILE.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+            with open(temp_file, 'w') as f:
+                json.dump(index, f, indent=2)
+            os.replace(temp_file, cls.INDEX_FILE)
+        except Exception as e:
+            logger.error(f"Error saving ingest index: {e}")
+
+    @classmethod
+    def is_current(cls, source_path, keep_audio=False) -> bool:
+        """Check whether a clip's mezzanine copy is up to date.
+
+        Args:
+            source_path (str): Path to the source clip
+            keep_audio (bool): Whether the copy must have the audio track
+
+        Returns:
+            bool: True if the mezzanine file exists and matches the source
+                and the audio choice
+        """
+        source_path = Path(source_path).resolve()
+        entry = cls._load_index().get(str(source_path))
+        if not entry or not source_path.exists():
+            return False
+        stat = source_path.stat()
+        return (
+            entry.get('size') == stat.st_size
+            and entry.get('mtime_ns') == stat.st_mtime_ns
+            and entry.get('format') == cls.format_signature()
+            and entry.get('has_audio') == keep_audio
+            and cls.mezzanine_path_for(source_path).exists()
+        )
+
+    @classmethod
+    def ingest(cls, source_path, keep_audio=False, force=False, cancel_token=None) -> Path:
+        """Transcode a clip to the mezzanine format unless already done.
+
+        Args:
+            source_path (str): Path to the source clip
+            keep_audio (bool): Keep the audio track (needed for the intro)
+            force (bool): Re-encode even if an up-to-date copy exists
+            cancel_token (CancelToken, optional): Kills the transcode when cancelled
+
+        Returns:
+            Path: Location of the ingested clip
+        """
+        source_path = Path(source_path).resolve()
+        if not source_path.exists():
+            raise FileNotFoundError(f"Source clip not found: {source_path}")
+
+        output_path = cls.mezzanine_path_for(source_path)
+        if not force and cls.is_current(source_path, keep_audio):
+            logger.info(f"Mezzanine copy up to date: {output_path}")
+            return output_path
+
+        MEZZANINE_PATH.mkdir(parents=True, exist_ok=True)
+        partial_path = output_path.with_suffix(f'.{uuid.uuid4().hex[:8]}.partial.mp4')
+        cmd = [
+            'ffmpeg', '-y',
+            '-hide_banner', '-loglevel', 'warning',
+            '-i', str(source_path),
+            *cls.video_encode_args(),
+            *(cls.audio_encode_args() if keep_audio else ['-an']),
+            '-movflags', '+faststart',
+            str(partial_path)
+        ]
+        logger.info(f"Ingesting {source_path.name} to mezzanine format...")
+        try:
+            run_ffmpeg(cmd, MediaIndex.duration(source_path), label=f"ingest {source_path.name}",
+                       cancel_token=cancel_token)
+            partial_path.replace(output_path)
+        except BaseException:
+            if partial_path.exists():
+                partial_path.unlink()
+            raise
+
+        stat = source_path.stat()
+        # Other renders and batch workers ingest at the same time, re-read under the lock
+        with cls._lock, file_lock(cls.LOCK_FILE):
+            index = cls._load_index()
+            index[str(source_path)] = {
+                'size': stat.st_size,
+                'mtime_ns': stat.st_mtime_ns,
+                'format': cls.format_signature(),
+                'output': str(output_path),
+                'has_audio': keep_audio
+            }
+            cls._save_index(index)
+        logger.info(f"Ingested clip written to {output_path}")
+        return output_path
+
+    @classmethod
+    def ingest_all(cls, force=False) -> List[Path]:
+        """Ingest every stock video plus the intro.
+
+        Args:
+            force (bool): Re-encode even if up-to-date copies exist
+
+        Returns:
+            List[Path]: Locations of the ingested clips
+        """
+        ingested = []
+        for asset in AssetCatalog.assets(ASSET_KIND_VIDEO):
+            ingested.append(cls.ingest(asset['path'], force=force))
+        if INTRO_VIDEO_PATH.exists():
+            ingested.append(cls.ingest(INTRO_VIDEO_PATH, keep_audio=True, force=force))
+        return ingested
+
+def main():
+    """Ingest all stock and intro videos from the command line."""
+    parser = argparse.ArgumentParser(description="Normalize stock and intro videos to the mezzanine format.")
+    parser.add_argument('--force', action='store_true', help="Re-encode clips that are already up to date")
+    args = parser.parse_args()
+    for path in MezzanineIngest.ingest_all(force=args.force):
+        print(path)
+
+if __name__ == "__main__":
+    main()
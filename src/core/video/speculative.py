@@ -0,0 +1,149 @@
+"""Looped background encoded from an estimated narration length."""
+
+import math
+from pathlib import Path
+from typing import List, Optional
+from ...config.settings import (
+    SPECULATIVE_SEGMENT_SECONDS,
+    SPECULATIVE_MARGIN,
+    SPECULATIVE_MIN_MARGIN_SECONDS
+)
+from ..audio.processor import AudioProcessor
+from ..utils.cancel import JobCancelled
+from ..utils.ffmpeg_runner import run_ffmpeg
+from ..utils.logger import get_logger
+from ..utils.media_index import MediaIndex
+from .ingest import MezzanineIngest
+
+logger = get_logger('SPECULATIVE')
+
+class SpeculativeBackground:
+    """Background loop encoded before the narration length is known.
+
+    encode() starts from an estimate of the narration length, plus a
+    margin, and writes mezzanine-format segments of
+    SPECULATIVE_SEGMENT_SECONDS each. Segment boundaries fall on the
+    mezzanine's fixed keyframes. Once the real length is known, clips_for()
+    picks enough segments to cover it and encodes any missing part, picking
+    up the loop where it stopped. The render then concatenates and trims
+    them with stream copy.
+    """
+
+    def __init__(self, source_path, directory, cancel_token=None):
+        """Initialize the background.
+
+        Args:
+            source_path (str): Background clip to loop
+            directory (Path): Directory for the segments, e.g. in the job workspace
+            cancel_token (CancelToken, optional): Kills a running encode when cancelled
+        """
+        self.source_path = Path(source_path)
+        self.directory = Path(directory)
+        self.cancel_token = cancel_token
+        self.segments: List[Path] = []
+        self.encoded = 0.0  # Seconds of loop covered by the segments
+
+    @staticmethod
+    def estimate_duration(text: str, rate: int, pitch_factor: Optional[float] = None) -> float:
+        """Estimate the narration length from the script before synthesis.
+
+        Assumes `rate` words per minute of raw speech, stretched by the
+        pitch filter.
+
+        Args:
+            text (str): Narration text
+            rate (int): Speech rate in words per minute
+            pitch_factor (float, optional): Pitch factor, defaults to the saved setting
+
+        Returns:
+            float: Estimated duration in seconds
+        """
+        pitch_factor = AudioProcessor.resolve_pitch_factor(pitch_factor)
+        speech = len(text.split()) * 60 / max(1, int(rate))
+        return speech * AudioProcessor.pitch_stretch(pitch_factor)
+
+    @staticmethod
+    def target_for(estimate: float) -> float:
+        """Length to encode for an estimate, margin included, in whole segments.
+
+        Args:
+            estimate (float): Estimated narration length in seconds
+
+        Returns:
+            float: Seconds to encode
+        """
+        target = estimate + max(estimate * SPECULATIVE_MARGIN, SPECULATIVE_MIN_MARGIN_SECONDS)
+        return math.ceil(target / SPECULATIVE_SEGMENT_SECONDS) * SPECULATIVE_SEGMENT_SECONDS
+
+    def encode(self, estimate: float) -> None:
+        """Encode the loop for an estimated narration length.
+
+        A failed encode is logged and discarded, so clips_for() encodes
+        the whole loop once the length is known.
+
+        Args:
+            estimate (float): Estimated narration length in seconds
+
+        Raises:
+            JobCancelled: If the cancel token is cancelled
+        """
+        target = self.target_for(estimate)
+        logger.info(f"Encoding {target:.0f}s of background for an estimated {estimate:.1f}s narration")
+        try:
+            self._encode_segments(target)
+        except JobCancelled:
+            raise
+        except Exception as e:
+            logger.error(f"Speculative encode failed, encoding after the narration instead: {e}")
+            for segment in self.directory.glob('segment_*.mp4'):
+                segment.unlink(missing_ok=True)
+            self.segments = []
+            self.encoded = 0.0
+
+    def clips_for(self, duration: float) -> List[Path]:
+        """Get segments covering the real narration length.
+
+        Args:
+            duration (float): Narration length in seconds
+
+        Returns:
+            List[Path]: Segments in playback order, at least `duration` long
+        """
+        missing = duration - self.encoded
+        if missing > 0:
+            logger.info(f"Estimate {missing:.1f}s short, extending the background")
+            # Whole segments, so only the very last one is ever trimmed
+            self._encode_segments(math.ceil(missing / SPECULATIVE_SEGMENT_SECONDS)
+                                  * SPECULATIVE_SEGMENT_SECONDS)
+        else:
+            logger.info(f"Estimate covered the narration with {-missing:.1f}s to spare")
+        count = max(1, math.ceil(duration / SPECULATIVE_SEGMENT_SECONDS))
+        return self.segments[:count]
+
+    def _encode_segments(self, seconds: float) -> None:
+        """Append `seconds` of the loop as segments, continuing where it stopped."""
+        self.directory.mkdir(parents=True, exist_ok=True)
+        offset = self.encoded % MediaIndex.duration(self.source_path) if self.encoded else 0.0
+        start_number = len(self.segments)
+        pattern = self.directory / 'segment_%04d.mp4'
+        cmd = [
+            'ffmpeg', '-y',
+            '-hide_banner', '-loglevel', 'warning',
+            '-stream_loop', '-1',  # Loop input video
+            '-ss', f'{offset:.3f}',  # Resume the loop where the last segment ended
+            '-t', str(seconds),
+            '-i', str(self.source_path),
+            *MezzanineIngest.video_encode_args(),
+            '-an',
+            '-f', 'segment',
+            '-segment_time', str(SPECULATIVE_SEGMENT_SECONDS),
+            '-segment_start_number', str(start_number),
+            '-reset_timestamps', '1',
+            '-segment_format', 'mp4',
+            '-segment_format_options', 'movflags=+faststart',
+            str(pattern)
+        ]
+        run_ffmpeg(cmd, seconds, label=f"speculative encode {self.source_path.name}",
+                   cancel_token=self.cancel_token)
+        self.segments = sorted(self.directory.glob('segment_*.mp4'))
+        self.encoded += seconds
@@ -0,0 +1,167 @@
+"""Disk-cached thumbnail strips of stock videos for BeAnonymous."""
+
+import hashlib
+import threading
+import uuid
+from concurrent.futures import Future, ThreadPoolExecutor
+from pathlib import Path
+from typing import Dict, List, Optional
+from ...config.settings import (
+    THUMBNAIL_FRAMES,
+    THUMBNAIL_WIDTH,
+    THUMBNAIL_WORKERS,
+    THUMBNAIL_CACHE_MAX_MB
+)
+from ..utils.disk_cache import DiskCache
+from ..utils.ffmpeg_runner import run_ffmpeg
+from ..utils.logger import get_logger
+from ..utils.media_index import MediaIndex
+
+logger = get_logger('THUMBNAILS')
+
+class ThumbnailCache:
+    """Strips of evenly spaced frames, generated in the background on first request.
+
+    Each strip is a single JPEG of THUMBNAIL_FRAMES frames side by side,
+    extracted with one ffmpeg call per clip and cached by path and mtime.
+    """
+    _cache: Optional[DiskCache] = None
+    _pool: Optional[ThreadPoolExecutor] = None
+    _pending: Dict[str, Future] = {}
+    _lock = threading.RLock()  # Done callbacks may run inside request()
+
+    @classmethod
+    def cache(cls) -> DiskCache:
+        """Get the shared disk cache.
+
+        Returns:
+            DiskCache: Cache holding the strips
+        """
+        if cls._cache is None:
+            cls._cache = DiskCache('thumbnails', THUMBNAIL_CACHE_MAX_MB * 1024 * 1024)
+        return cls._cache
+
+    @staticmethod
+    def key_for(source_path) -> str:
+        """Build the cache key for a clip.
+
+        Args:
+            source_path (str): Video clip path
+
+        Returns:
+            str: Cache key
+        """
+        source_path = Path(source_path).resolve()
+        stat = source_path.stat()
+        identity = (
+            f"{source_path}|{stat.st_size}|{stat.st_mtime_ns}|"
+            f"{THUMBNAIL_FRAMES}x{THUMBNAIL_WIDTH}"
+        )
+        return hashlib.sha1(identity.encode('utf-8')).hexdigest()
+
+    @classmethod
+    def request(cls, source_path) -> Future:
+        """Get a clip's strip without blocking.
+
+        Repeated requests for a clip that is still being generated share
+        the same future.
+
+        Args:
+            source_path (str): Video clip path
+
+        Returns:
+            Future: Resolves to the cached strip path
+        """
+        key = str(source_path)
+        with cls._lock:
+            future = cls._pending.get(key)
+            if future is None:
+                if cls._pool is None:
+                    cls._pool = ThreadPoolExecutor(THUMBNAIL_WORKERS, thread_name_prefix='thumbnail')
+                future = cls._pool.submit(cls.get_strip, source_path)
+                cls._pending[key] = future
+                future.add_done_callback(lambda _: cls._forget(key))
+            return future
+
+    @classmethod
+    def _forget(cls, key: str) -> None:
+        """Drop a finished request."""
+        with cls._lock:
+            cls._pending.pop(key, None)
+
+    @classmethod
+    def cancel_pending(cls) -> None:
+        """Cancel requests that have not started yet."""
+        with cls._lock:
+            for future in list(cls._pending.values()):
+                future.cancel()
+
+    @classmethod
+    def get_strip(cls, source_path) -> Path:
+        """Get a clip's strip, generating it on a miss.
+
+        Args:
+            source_path (str): Video clip path
+
+        Returns:
+            Path: Cached strip path
+        """
+        cache = cls.cache()
+        key = cls.key_for(source_path)
+        strip = cache.get(key)
+        if strip is None:
+            strip = cls._generate(cache, key, source_path)
+        return strip
+
+    @staticmethod
+    def frame_times(duration: float, frames: int = THUMBNAIL_FRAMES) -> List[float]:
+        """Spread frame timestamps evenly over a clip.
+
+        Args:
+            duration (float): Clip length in seconds
+            frames (int): Number of frames
+
+        Returns:
+            List[float]: Timestamp at the middle of each of `frames` equal parts
+        """
+        return [duration * (i + 0.5) / frames for i in range(frames)]
+
+    @classmethod
+    def _generate(cls, cache: DiskCache, key: str, source_path) -> Path:
+        """Extract the frames with a single ffmpeg call and store the strip."""
+        times = cls.frame_times(MediaIndex.duration(source_path))
+        cmd = ['ffmpeg', '-y', '-hide_banner', '-loglevel', 'error']
+        for offset in times:
+            # Input seeking jumps to the nearest keyframe instead of decoding up to it
+            cmd += ['-ss', f'{offset:.3f}', '-i', str(source_path)]
+
+        filters = [
+            f"[{i}:v]scale={THUMBNAIL_WIDTH}:-2,setsar=1[f{i}]"
+            for i in range(len(times))
+        ]
+        if len(times) > 1:
+            filters.append(
+                ''.join(f"[f{i}]" for i in range(len(times)))
+                + f"hstack=inputs={len(times)}[strip]"
+            )
+            strip_label = '[strip]'
+        else:
+            strip_label = '[f0]'
+
+        cache.root.mkdir(parents=True, exist_ok=True)
+        partial_path = cache.path_for(key, f'.{uuid.uuid4().hex[:8]}.partial.jpg')
+        cmd += [
+            '-filter_complex', ';'.join(filters),
+            '-map', strip_label,
+            '-frames:v', '1',
+            '-q:v', '5',
+            str(partial_path)
+        ]
+        try:
+            run_ffmpeg(cmd, label=f"thumbnail {Path(source_path).name}")
+        except BaseException:
+            if partial_path.exists():
+                partial_path.unlink()
+            raise
+        logger.info(f"Generated thumbnail strip for {Path(source_path).name}")
+        return cache.put(key, partial_path, '.jpg')
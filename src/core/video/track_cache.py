@@ -0,0 +1,122 @@
+"""Cache of encoded, looped background video tracks for BeAnonymous."""
+
+import hashlib
+import math
+import uuid
+from pathlib import Path
+from typing import Optional
+from ...config.settings import VIDEO_CACHE_BUCKET_SECONDS
+from ..utils.disk_cache import DiskCache
+from ..utils.ffmpeg_runner import run_ffmpeg
+from ..utils.logger import get_logger
+from ..utils.settings_manager import SettingsManager
+from .ingest import MezzanineIngest
+
+logger = get_logger('TRACK CACHE')
+
+class VideoTrackCache:
+    """Looped background tracks keyed by source identity and duration bucket.
+
+    Tracks are encoded in the mezzanine format, so a cached track can be
+    trimmed with stream copy and concatenated with the ingested intro.
+    """
+    _cache: Optional[DiskCache] = None
+
+    @classmethod
+    def cache(cls) -> DiskCache:
+        """Get the shared disk cache, sized from the current settings.
+
+        Returns:
+            DiskCache: Cache holding the encoded tracks
+        """
+        max_mb = SettingsManager.get_setting('video_cache_max_mb', 2048)
+        if cls._cache is None:
+            cls._cache = DiskCache('video_tracks', max_mb * 1024 * 1024)
+        else:
+            cls._cache.max_bytes = max_mb * 1024 * 1024
+        return cls._cache
+
+    @staticmethod
+    def bucket_for(duration: float) -> int:
+        """Round a duration up to its cache bucket.
+
+        Args:
+            duration (float): Required track length in seconds
+
+        Returns:
+            int: Bucketed length in seconds
+        """
+        buckets = max(1, math.ceil(duration / VIDEO_CACHE_BUCKET_SECONDS))
+        return buckets * VIDEO_CACHE_BUCKET_SECONDS
+
+    @staticmethod
+    def key_for(source_path, bucket: int) -> str:
+        """Build the cache key for a source clip and bucket.
+
+        Args:
+            source_path (str): Background clip path
+            bucket (int): Bucketed duration in seconds
+
+        Returns:
+            str: Cache key
+        """
+        source_path = Path(source_path).resolve()
+        stat = source_path.stat()
+        identity = (
+            f"{source_path}|{stat.st_size}|{stat.st_mtime_ns}|{bucket}|"
+            f"{MezzanineIngest.format_signature()}"
+        )
+        return hashlib.sha1(identity.encode('utf-8')).hexdigest()
+
+    @classmethod
+    def get_track(cls, source_path, duration: float, cancel_token=None) -> Path:
+        """Get a looped track at least `duration` long, encoding it on a miss.
+
+        Args:
+            source_path (str): Background clip path
+            duration (float): Required track length in seconds
+            cancel_token (CancelToken, optional): Kills the encode when cancelled
+
+        Returns:
+            Path: Cached track path
+        """
+        cache = cls.cache()
+        bucket = cls.bucket_for(duration)
+        key = cls.key_for(source_path, bucket)
+
+        track = cache.get(key)
+        if track is None:
+            track = cls._encode(cache, key, source_path, bucket, cancel_token)
+
+        stats = cache.stats()
+        logger.info(
+            f"Video track cache: {stats['hits']} hits, {stats['misses']} misses, "
+            f"{stats['evictions']} evictions, {stats['bytes_stored']} bytes stored"
+        )
+        return track
+
+    @staticmethod
+    def _encode(cache: DiskCache, key: str, source_path, bucket: int, cancel_token=None) -> Path:
+        """Encode a looped track for a bucket and store it in the cache."""
+        cache.root.mkdir(parents=True, exist_ok=True)
+        partial_path = cache.path_for(key, f'.{uuid.uuid4().hex[:8]}.partial.mp4')
+        cmd = [
+            'ffmpeg', '-y',
+            '-hide_banner', '-loglevel', 'warning',
+            '-stream_loop', '-1',  # Loop input video
+            '-t', str(bucket),  # Bucketed duration, trimmed per job
+            '-i', str(source_path),
+            *MezzanineIngest.video_encode_args(),
+            '-an',
+            '-movflags', '+faststart',
+            str(partial_path)
+        ]
+        logger.info(f"Encoding {bucket}s looped track for {Path(source_path).name}...")
+        try:
+            run_ffmpeg(cmd, bucket, label=f"track cache encode {Path(source_path).name}",
+                       cancel_token=cancel_token)
+        except BaseException:
+            if partial_path.exists():
+                partial_path.unlink()
+            raise
+        return cache.put(key, partial_path, '.mp4')
@@ -3,12 +3,9 @@ import customtkinter as ctk
 from tkinter import messagebox, filedialog
 from customtkinter import StringVar, DoubleVar
 from pathlib import Path
-import os
-import webbrowser
-from PIL import Image
-from customtkinter import StringVar, DoubleVar
-from pathlib import Path
-import os
+import queue
+import threading
+import time
 import webbrowser
 from PIL import Image
 
@@ -17,7 +14,7 @@ from ..config.settings import (
     WINDOW_SIZE, 
     WINDOW_BG_COLOR,
     GUI_ASSETS_PATH,
-    TEMP_PATH
+    VIDEO_OUTPUT_FILENAME
 )
 from ..config.constants import (
     GUI_ASSETS,
@@ -26,25 +23,38 @@ from ..config.constants import (
     ERROR_MSGS,
     GITHUB_URL
 )
-from ..core.audio.tts import TTS
-from ..core.video.generator import VideoGenerator
+# The render pipeline (pyttsx3, ffmpeg stages), the job queue and the
+# settings dialog are imported on first use to keep startup fast
+from ..core.utils.cancel import CancelToken, JobCancelled
+from ..core.utils.asset_catalog import AssetCatalog, ASSET_KIND_VIDEO, ASSET_KIND_AUDIO
 from ..core.utils.file_handler import FileHandler
-from ..core.utils.validators import Validators
-from ..core.utils.settings_manager import SettingsManager
-from ..core.utils.settings_manager import SettingsManager
+from ..core.utils.logger import get_logger
+from ..core.utils.media_index import MediaIndex
+from .asset_picker import AssetPicker
+
+logger = get_logger('GUI')
+
+# Milliseconds between checks of the render event queue
+POLL_INTERVAL_MS = 100
+# Seconds to wait for a cancelled render to stop its children when closing
+CLOSE_TIMEOUT_SECONDS = 5
 
 class ProgressDialog:
     """Dialog to show progress during video generation."""
     
-    def __init__(self, parent):
+    def __init__(self, parent, on_cancel=None, title="Generating Video"):
         """Initialize progress dialog.
         
         Args:
             parent: Parent window
+            on_cancel (callable, optional): Called when Cancel is pressed
+                or the dialog is closed
+            title (str): Window title and heading
         """
+        self.on_cancel = on_cancel
         self.window = ctk.CTkToplevel(parent)
-        self.window.title("Generating Video")
-        self.window.geometry("300x150")
+        self.window.title(title)
+        self.window.geometry("300x190")
         self.window.iconbitmap(str(GUI_ASSETS_PATH / APP_ICON))
         # Make it modal
         self.window.transient(parent)
@@ -53,13 +63,13 @@ class ProgressDialog:
         
         # Center on parent
         x = parent.winfo_x() + parent.winfo_width()//2 - 150
-        y = parent.winfo_y() + parent.winfo_height()//2 - 75
+        y = parent.winfo_y() + parent.winfo_height()//2 - 95
         self.window.geometry(f"+{x}+{y}")
         
         # Progress label
         self.label = ctk.CTkLabel(
             self.window, 
-            text="Generating video...", 
+            text=f"{title}...", 
             font=("Arial", 14)
         )
         self.label.pack(pady=20)
@@ -82,6 +92,16 @@ class ProgressDialog:
             font=("Arial", 12)
         )
         self.status.pack(pady=10)
+        
+        # Cancel button, closing the window cancels as well
+        self.cancel_btn = ctk.CTkButton(
+            self.window,
+            text="Cancel",
+            width=100,
+            command=self._cancel
+        )
+        self.cancel_btn.pack(pady=(0, 10))
+        self.window.protocol("WM_DELETE_WINDOW", self._cancel)
     
     def update_progress(self, value, status_text=None):
         """Update progress bar and status text.
@@ -91,184 +111,51 @@ class ProgressDialog:
             status_text (str, optional): Status text to display
         """
         self.progress.set(value)
-        self.window.iconbitmap(str(GUI_ASSETS_PATH / APP_ICON))
         if status_text:
             self.status.configure(text=status_text)
-        self.window.update()
+    
+    def _cancel(self):
+        """Request cancellation of the running render."""
+        if self.cancel_btn.cget("state") == "disabled":
+            return
+        self.cancel_btn.configure(state="disabled")
+        self.status.configure(text="Cancelling...")
+        if self.on_cancel:
+            self.on_cancel()
     
     def close(self):
         """Close the dialog."""
         self.window.grab_release()
         self.window.destroy()
 
-class SettingsDialog:
-    """Dialog for configuring application settings.
-    
-    This dialog provides controls for adjusting:
-    - TTS Rate (Words per Minute): Controls speech speed
-    - TTS Voice ID: Selects different voice options 
-    - Voice Pitch Factor: Adjusts voice pitch
-    
-    Settings are automatically saved when clicking Save and can be reset to defaults.
-    """
-    
-    def __init__(self, parent):
-        """Initialize settings dialog.
+class BeAnonymousApp:
+    """Main application class for BeAnonymous."""
+    def __init__(self, startup_timer=None, close_after_paint=False):
+        """Initialize the BeAnonymous application.
         
         Args:
-            parent: Parent window
+            startup_timer (StartupTimer, optional): Records window and first-paint times
+            close_after_paint (bool): Close as soon as the first frame is drawn,
+                used to measure startup time
         """
-        self.window = ctk.CTkToplevel(parent)
-        self.window.title("Settings")
-        self.window.geometry("400x400")
-        self.window.iconbitmap(str(GUI_ASSETS_PATH / APP_ICON))
-        # Make it modal
-        self.window.transient(parent)
-        self.window.grab_set()
-        
-        # Center on parent
-        x = parent.winfo_x() + parent.winfo_width()//2 - 200
-        y = parent.winfo_y() + parent.winfo_height()//2 - 200
-        self.window.geometry(f"+{x}+{y}")
-        
-        # Load current settings
-        settings = SettingsManager.load_settings()
-        
-        # TTS Rate Slider
-        ctk.CTkLabel(
-            self.window,
-            text="TTS Rate (Words per Minute)",
-            font=("Arial", 14)
-        ).pack(pady=(20,5))
-        
-        self.tts_rate = ctk.CTkSlider(
-            self.window,
-            from_=100,
-            to=300,
-            number_of_steps=200,
-            width=300
-        )
-        self.tts_rate.set(settings['tts_rate'])
-        self.tts_rate.pack(pady=5)
-        
-        self.tts_rate_label = ctk.CTkLabel(
-            self.window,
-            text=str(int(settings['tts_rate'])),
-            font=("Arial", 12)
-        )
-        self.tts_rate_label.pack()
-          # Voice ID Selection
-        ctk.CTkLabel(
-            self.window,
-            text="TTS Voice",
-            font=("Arial", 14)
-        ).pack(pady=(20,5))
-        
-        self.voice_id = ctk.CTkComboBox(
-            self.window,
-            values=["Default Voice (0)", "Alternative Voice (1)"],
-            state="readonly",
-            width=300,
-            height=32,
-            fg_color="#2B2B2B",
-            text_color="#FFFFFF",
-            button_color="#2B2B2B",
-            button_hover_color="#404040",
-            dropdown_fg_color="#2B2B2B",
-            dropdown_text_color="#FFFFFF",
-            dropdown_hover_color="#404040"
-        )
-        self.voice_id.set("Default Voice (0)" if settings['tts_voice_id'] == 0 else "Alternative Voice (1)")
-        self.voice_id.pack(pady=10)
-        
-        # Pitch Factor Slider
-        ctk.CTkLabel(
-            self.window,
-            text="Voice Pitch Factor",
-            font=("Arial", 14)
-        ).pack(pady=(20,5))
-        
-        self.pitch_factor = ctk.CTkSlider(
-            self.window,
-            from_=0.1,
-            to=1.0,
-            number_of_steps=90,
-            width=300
-        )
-        self.pitch_factor.set(settings['pitch_factor'])
-        self.pitch_factor.pack(pady=5)
-        
-        self.pitch_factor_label = ctk.CTkLabel(
-            self.window,
-            text=f"{settings['pitch_factor']:.2f}",
-            font=("Arial", 12)
-        )
-        self.pitch_factor_label.pack()
-        
-        # Button frame
-        button_frame = ctk.CTkFrame(
-            self.window,
-            fg_color="transparent"
-        )
-        button_frame.pack(pady=20)
-        
-        # Save button
-        ctk.CTkButton(
-            button_frame,
-            text="Save",
-            width=100,
-            command=self._save_settings
-        ).pack(side="left", padx=10)
-        
-        # Reset button
-        ctk.CTkButton(
-            button_frame,
-            text="Reset",
-            width=100,
-            command=self._reset_settings
-        ).pack(side="left", padx=10)
-          # Bind slider events
-        self.tts_rate.configure(command=self._on_tts_rate_change)
-        self.pitch_factor.configure(command=self._on_pitch_factor_change)
-    
-    def _on_tts_rate_change(self, value):
-        """Update TTS rate label when slider changes."""
-        self.tts_rate_label.configure(text=str(int(value)))
-    
-    def _on_pitch_factor_change(self, value):
-        """Update pitch factor label when slider changes."""
-        self.pitch_factor_label.configure(text=f"{value:.2f}")
-    def _save_settings(self):
-        """Save the current settings."""
-        settings = {
-            'tts_rate': int(self.tts_rate.get()),
-            'tts_voice_id': 0 if self.voice_id.get() == "Default Voice (0)" else 1,
-            'pitch_factor': float(self.pitch_factor.get())
-        }
-        
-        if SettingsManager.save_settings(settings):
-            messagebox.showinfo("Success", "Settings saved successfully")
-            self.window.destroy()
-        else:
-            messagebox.showerror("Error", "Failed to save settings")
-    def _reset_settings(self):
-        """Reset settings to defaults."""
-        self.tts_rate.set(SettingsManager.DEFAULT_SETTINGS['tts_rate'])
-        self.voice_id.set("Default Voice (0)" if SettingsManager.DEFAULT_SETTINGS['tts_voice_id'] == 0 else "Alternative Voice (1)")
-        self.pitch_factor.set(SettingsManager.DEFAULT_SETTINGS['pitch_factor'])
-        
-        self._on_tts_rate_change(SettingsManager.DEFAULT_SETTINGS['tts_rate'])
-        self._on_pitch_factor_change(SettingsManager.DEFAULT_SETTINGS['pitch_factor'])
-        
-class BeAnonymousApp:
-    """Main application class for BeAnonymous."""
-    def __init__(self):
-        """Initialize the BeAnonymous application."""
+        self.startup_timer = startup_timer
+        self.close_after_paint = close_after_paint
+        self._painted = False
         self.window = ctk.CTk()
         self.setup_window()
         self.create_variables()
         self.load_assets()
         self.create_widgets()
+        self._mark_startup('window')
+        
+    def _mark_startup(self, milestone):
+        """Record a startup milestone if startup is being timed.
+        
+        Args:
+            milestone (str): Milestone name
+        """
+        if self.startup_timer is not None:
+            self.startup_timer.mark(milestone)
         
     def setup_window(self):
         """Configure the main window."""
@@ -287,49 +174,68 @@ class BeAnonymousApp:
         self.intro_var = StringVar(value="False")
         self.progress_var = DoubleVar(value=0.0)
         self.file_handler = FileHandler()
+        self.job_queue = None  # Created on first use, it loads the render pipeline
+        self._cancel_token = None  # Token of the Generate/Preview render in progress
+        self._render_thread = None
+        self.queue_panel = None
+        # Queued outputs get unique names so parallel jobs never collide
+        self._session_stamp = time.strftime("%Y%m%d-%H%M%S")
+        self._queued_count = 0
         
         # Load saved settings
         settings = FileHandler.load_settings()
         self.last_output_path = settings.get('last_output_path', '')
         
     def load_assets(self):
-        """Load GUI assets."""
+        """Prepare GUI assets, images are decoded on first use."""
         self.images = {}
-        for key, filename in GUI_ASSETS.items():
-            file_path = GUI_ASSETS_PATH / filename
-            try:
-                if not file_path.exists():
-                    print(f"Warning: Asset file not found: {file_path}")
-                    continue
-                    
-                pil_image = Image.open(file_path)
-                width, height = pil_image.size
-                self.images[key] = ctk.CTkImage(
-                    light_image=pil_image,  # Light mode image
-                    dark_image=pil_image,  # Use same image for dark mode
-                    size=(width, height)
-                )
-            except Exception as e:
-                print(f"Failed to load image {filename}: {str(e)}")
-                # Create an empty image as fallback
-                if key in ["TOGGLE_ON", "TOGGLE_OFF"]:
-                    self.images[key] = ctk.CTkImage(
-                        light_image=Image.new('RGB', (62, 28), color='grey'),
-                        dark_image=Image.new('RGB', (62, 28), color='grey'),
-                        size=(62, 28)
-                    )
-                elif key in ["ABOUT_BTN", "SETTINGS_BTN"]:
-                    self.images[key] = ctk.CTkImage(
-                        light_image=Image.new('RGB', (30, 30), color='grey'),
-                        dark_image=Image.new('RGB', (30, 30), color='grey'),
-                        size=(30, 30)
-                    )
-                elif key == "GENERATE_BTN":
-                    self.images[key] = ctk.CTkImage(
-                        light_image=Image.new('RGB', (150, 40), color='grey'),
-                        dark_image=Image.new('RGB', (150, 40), color='grey'),
-                        size=(150, 40)
-                    )
+        
+    def _image(self, key):
+        """Get a GUI image, decoding it on first use.
+        
+        Args:
+            key (str): Key in GUI_ASSETS
+            
+        Returns:
+            ctk.CTkImage: The image, a grey placeholder if it cannot be loaded,
+                or None for images without a placeholder
+        """
+        if key not in self.images:
+            self.images[key] = self._decode_image(key)
+        return self.images[key]
+        
+    @staticmethod
+    def _decode_image(key):
+        """Decode a GUI image from disk."""
+        filename = GUI_ASSETS[key]
+        file_path = GUI_ASSETS_PATH / filename
+        try:
+            if not file_path.exists():
+                raise FileNotFoundError(f"Asset file not found: {file_path}")
+                
+            pil_image = Image.open(file_path)
+            width, height = pil_image.size
+            return ctk.CTkImage(
+                light_image=pil_image,  # Light mode image
+                dark_image=pil_image,  # Use same image for dark mode
+                size=(width, height)
+            )
+        except Exception as e:
+            print(f"Failed to load image {filename}: {str(e)}")
+            # Create an empty image as fallback
+            if key in ["TOGGLE_ON", "TOGGLE_OFF"]:
+                size = (62, 28)
+            elif key in ["ABOUT_BTN", "SETTINGS_BTN"]:
+                size = (30, 30)
+            elif key == "GENERATE_BTN":
+                size = (150, 40)
+            else:
+                return None
+            return ctk.CTkImage(
+                light_image=Image.new('RGB', size, color='grey'),
+                dark_image=Image.new('RGB', size, color='grey'),
+                size=size
+            )
     
     def create_widgets(self):
         """Create and place all GUI widgets."""
@@ -344,7 +250,7 @@ class BeAnonymousApp:
         # About button
         ctk.CTkButton(
             master=self.window,
-            image=self.images["ABOUT_BTN"],
+            image=self._image("ABOUT_BTN"),
             text="",
             width=30,
             height=30,
@@ -358,7 +264,7 @@ class BeAnonymousApp:
         # App title
         ctk.CTkLabel(
             master=self.window,
-            image=self.images["APP_TITLE"],
+            image=self._image("APP_TITLE"),
             text="",
             fg_color="transparent"
         ).place(relx=0.5, y=37, anchor="center")
@@ -366,7 +272,7 @@ class BeAnonymousApp:
         # Settings button
         ctk.CTkButton(
             master=self.window,
-            image=self.images["SETTINGS_BTN"],
+            image=self._image("SETTINGS_BTN"),
             text="",
             width=30,
             height=30,
@@ -390,7 +296,7 @@ class BeAnonymousApp:
         # Decorative background image
         ctk.CTkLabel(
             master=self.window,
-            image=self.images["OUTPUT_SECTION"],
+            image=self._image("OUTPUT_SECTION"),
             text="",
             fg_color="transparent"
         ).place(relx=0.5, y=142.5, anchor="center")
@@ -414,7 +320,7 @@ class BeAnonymousApp:
         # Browse button
         ctk.CTkButton(
             master=self.window,
-            image=self.images["BROWSE_BTN"],
+            image=self._image("BROWSE_BTN"),
             text="",
             command=self._select_output_path,
             width=30,
@@ -436,24 +342,8 @@ class BeAnonymousApp:
             text_color="#FFFFFF"
         ).place(x=20, y=220)
         
-        videos = self.file_handler.get_video_files()
-        self.bg_video = ctk.CTkComboBox(
-            master=self.window,
-            values=videos,
-            state="readonly",
-            width=170,
-            height=35,
-            fg_color="#2B2B2B",
-            text_color="#FFFFFF",
-            button_color="#2B2B2B",
-            dropdown_fg_color="#2B2B2B",
-            dropdown_text_color="#FFFFFF",
-            dropdown_hover_color="#404040",
-            border_width=0,
-            border_color="#2B2B2B"
-
-        )
-        self.bg_video.set(videos[0] if videos else "Default")
+        # Filled in once the asset folders have been scanned after first paint
+        self.bg_video = AssetPicker(self.window, ASSET_KIND_VIDEO, "Select Background Video")
         self.bg_video.place(x=20, y=250)
         
         # Background Music Label
@@ -464,23 +354,7 @@ class BeAnonymousApp:
             text_color="#FFFFFF"
         ).place(x=235, y=220)
         
-        audios = self.file_handler.get_audio_files()
-        self.bg_music = ctk.CTkComboBox(
-            master=self.window,
-            values=audios,
-            state="readonly",
-            width=170,
-            height=35,
-            fg_color="#2B2B2B",
-            text_color="#FFFFFF",
-            button_color="#2B2B2B",
-            dropdown_fg_color="#2B2B2B",
-            dropdown_text_color="#FFFFFF",
-            dropdown_hover_color="#404040",
-            border_color="#2B2B2B",
-            border_width=0
-        )
-        self.bg_music.set(audios[0] if audios else "Default")
+        self.bg_music = AssetPicker(self.window, ASSET_KIND_AUDIO, "Select Background Music")
         self.bg_music.place(x=235, y=250)
         
         # Anonymous Intro Label
@@ -493,7 +367,7 @@ class BeAnonymousApp:
         
         self.toggle_btn = ctk.CTkButton(
             master=self.window,
-            image=self.images["TOGGLE_OFF"],
+            image=self._image("TOGGLE_OFF"),
             text="",
             width=62,
             height=28,
@@ -517,7 +391,7 @@ class BeAnonymousApp:
         ctk.CTkLabel(
             master=self.window,
             text="",
-            image=self.images["SCRIPT_ENTRY_BACKGROUND"],
+            image=self._image("SCRIPT_ENTRY_BACKGROUND"),
             fg_color="transparent"
         ).place(relx=0.5, y=400, anchor="center")
         
@@ -537,7 +411,7 @@ class BeAnonymousApp:
         """Create generate button."""
         self.generate_btn = ctk.CTkButton(
             master=self.window,
-            image=self.images["GENERATE_BTN"],
+            image=self._image("GENERATE_BTN"),
             text="",
             width=150,
             height=40,
@@ -548,14 +422,53 @@ class BeAnonymousApp:
         )        
         self.generate_btn.place(x=10, y=475)
         
+        # Preview button
+        self.preview_btn = ctk.CTkButton(
+            master=self.window,
+            text="Preview",
+            width=80,
+            height=30,
+            fg_color="#2d2d2d",
+            hover_color="#404040",
+            command=lambda: self._handle_button("preview")
+        )
+        self.preview_btn.place(x=170, y=480)
+        
+        # Queue controls
+        ctk.CTkButton(
+            master=self.window,
+            text="Add to Queue",
+            width=100,
+            height=30,
+            fg_color="#2d2d2d",
+            hover_color="#404040",
+            command=lambda: self._handle_button("enqueue")
+        ).place(x=258, y=480)
+        ctk.CTkButton(
+            master=self.window,
+            text="Queue",
+            width=64,
+            height=30,
+            fg_color="#2d2d2d",
+            hover_color="#404040",
+            command=lambda: self._handle_button("queue")
+        ).place(x=366, y=480)
+        
     def _handle_button(self, action):
         """Handle button clicks."""
         if action == "about":
             webbrowser.open(GITHUB_URL)
         elif action == "settings":
+            from .settings_dialog import SettingsDialog
             SettingsDialog(self.window)
         elif action == "generate":
             self._generate_video()
+        elif action == "preview":
+            self._preview_video()
+        elif action == "enqueue":
+            self._enqueue_video()
+        elif action == "queue":
+            self._show_queue()
             
     def _select_output_path(self):
         """Handle output directory selection."""
@@ -571,89 +484,324 @@ class BeAnonymousApp:
         new_state = "False" if current_state == "True" else "True"
         toggle_state = 'ON' if new_state == "True" else 'OFF'
         self.toggle_btn.configure(
-            image=self.images[f"TOGGLE_{toggle_state}"]
+            image=self._image(f"TOGGLE_{toggle_state}")
         )
         self.intro_var.set(new_state)
             
-    def _validate_selections(self):
-        """Validate all user selections before generation."""
+    def _validate_selections(self, require_output=True):
+        """Validate all user selections before generation.
+        
+        Args:
+            require_output (bool): Check the output directory as well
+        """
         if not self.script_entry.get("1.0", "end").strip():
             raise ValueError(ERROR_MSGS["EMPTY_FIELDS"])
             
-        if not self.file_handler.validate_output_path(self.output_entry.get()):
+        if require_output and not self.file_handler.validate_output_path(self.output_entry.get()):
             raise ValueError(ERROR_MSGS["INVALID_PATH"])
             
         if self.bg_video.get() == "Default" or self.bg_music.get() == "Default":
             raise ValueError("Please select background video and music")
 
+    def _get_job_queue(self):
+        """Get the render queue, creating it on first use.
+        
+        Returns:
+            JobQueue: The render queue
+        """
+        if self.job_queue is None:
+            from ..core.jobs import JobQueue
+            self.job_queue = JobQueue()
+        return self.job_queue
+    
+    def _show_queue(self):
+        """Open the render queue panel, creating it on first use."""
+        if self.queue_panel is None or not self.queue_panel.window.winfo_exists():
+            from .job_queue import JobQueuePanel
+            self.queue_panel = JobQueuePanel(self.window, self._get_job_queue())
+        self.queue_panel.show()
+    
+    def _enqueue_video(self):
+        """Add the current script and selections to the render queue."""
+        try:
+            self._validate_selections()
+        except Exception as e:
+            messagebox.showerror("Error", str(e))
+            return
+        
+        from ..core.pipeline import RenderJob
+        
+        self._queued_count += 1
+        output_name = f"{Path(VIDEO_OUTPUT_FILENAME).stem}_{self._session_stamp}_{self._queued_count:03d}.mp4"
+        self._get_job_queue().add(RenderJob(
+            self.script_entry.get("1.0", "end").strip(),
+            self.bg_video.path(),
+            self.bg_music.path(),
+            Path(self.output_entry.get()) / output_name,
+            intro=self.intro_var.get() == "True"
+        ))
+        self._show_queue()
+    
     def _generate_video(self):
-        """Handle video generation process."""
+        """Validate inputs and render the video on a background thread."""
         try:
-            self.generate_btn.configure(state="disabled")
-            
             # Validate all inputs first
             self._validate_selections()
-            
-            # Create and show progress dialog
-            progress_dialog = ProgressDialog(self.window)
-            
-            # Generate TTS
-            progress_dialog.update_progress(0.1, "Generating Text-to-Speech...")
-            tts = TTS(self.script_entry.get("1.0", "end").strip())
-            if not tts.generate():
-                raise Exception("TTS generation failed")
-            
-            progress_dialog.update_progress(0.4, "Text-to-Speech generated...")
-            
-            # Generate video with progress updates
-            generator = VideoGenerator(
-                self.bg_video.get(),
-                self.bg_music.get(),
-                self.output_entry.get(),
-                self.intro_var.get() == "True"
-            )
-            
-            def progress_callback(value):
-                # Convert 0-100 to 0.4-1.0 range for overall progress
-                progress = 0.4 + (value * 0.6 / 100)
-                status = "Processing video..." if value < 100 else "Finalizing..."
-                progress_dialog.update_progress(progress, status)
-            
-            if not generator.generate(progress_callback=progress_callback):
-                raise Exception("Video generation failed")
-            
-            # Close progress dialog
-            progress_dialog.close()
-            
-            result = messagebox.askquestion(
-                "Success", 
-                SUCCESS_MSG.format(self.output_entry.get()) + "\n\nWould you like to open the video?", 
-                type='yesno'
-            )
-            if result == 'yes':
-                self._open_generated_video()
-            
         except Exception as e:
-            try:
-                progress_dialog.close()
-            except:
-                pass
             messagebox.showerror("Error", str(e))
-        finally:
-            self.generate_btn.configure(state="normal")
+            return
+        
+        from ..core.pipeline import RenderJob, render_job
+        
+        job = RenderJob(
+            self.script_entry.get("1.0", "end").strip(),
+            self.bg_video.path(),
+            self.bg_music.path(),
+            self.output_entry.get(),
+            intro=self.intro_var.get() == "True",
+            job_id="gui"
+        )
+        self._start_render(
+            lambda progress_callback, cancel_token: render_job(
+                job, progress_callback, cancel_token=cancel_token),
+            "Generating Video",
+            self._on_video_done
+        )
+    
+    def _preview_video(self):
+        """Render a short low-resolution preview and open it."""
+        try:
+            self._validate_selections(require_output=False)
+        except Exception as e:
+            messagebox.showerror("Error", str(e))
+            return
+        
+        from ..core.preview import render_preview
+        
+        script = self.script_entry.get("1.0", "end").strip()
+        video = self.bg_video.path()
+        music = self.bg_music.path()
+        self._start_render(
+            lambda progress_callback, cancel_token: render_preview(
+                script, video, music,
+                progress_callback=progress_callback, cancel_token=cancel_token),
+            "Generating Preview",
+            self._on_preview_done
+        )
+    
+    def _start_render(self, render, title, on_done):
+        """Run a render on a background thread behind a progress dialog.
+        
+        Args:
+            render (callable): Called as render(progress_callback, cancel_token)
+                on the worker thread, returns the render result
+            title (str): Progress dialog title
+            on_done (callable): Called on the Tk thread with the result
+        """
+        self.generate_btn.configure(state="disabled")
+        self.preview_btn.configure(state="disabled")
+        self._on_render_done = on_done
+        
+        # The worker thread only talks to Tk through this queue
+        self._render_events = queue.Queue()
+        self._cancel_token = CancelToken()
+        self._progress_dialog = ProgressDialog(self.window, on_cancel=self._cancel_token.cancel,
+                                               title=title)
+        self._render_thread = threading.Thread(
+            target=self._render_worker,
+            args=(render, self._render_events, self._cancel_token),
+            daemon=True
+        )
+        self._render_thread.start()
+        self.window.after(POLL_INTERVAL_MS, self._poll_render)
+    
+    @staticmethod
+    def _render_worker(render, events, cancel_token):
+        """Run a render off the Tk thread.
+        
+        Args:
+            render (callable): Called as render(progress_callback, cancel_token)
+            events (queue.Queue): Receives ('progress', value, info),
+                ('done', result), ('cancelled', None) or ('error', message)
+            cancel_token (CancelToken): Token shared with the progress dialog
+        """
+        def progress_callback(value, info=None):
+            events.put(('progress', value, info))
+        
+        try:
+            result = render(progress_callback, cancel_token)
+            events.put(('done', result))
+        except JobCancelled:
+            events.put(('cancelled', None))
+        except Exception as e:
+            events.put(('error', str(e)))
+    
+    @staticmethod
+    def _progress_status(value, info=None):
+        """Describe overall render progress for the status label.
+        
+        Args:
+            value (float): Overall progress between 0 and 100
+            info (ProgressInfo, optional): Encode speed/ETA details
+            
+        Returns:
+            str: Status text
+        """
+        if value < 40:
+            return "Generating Text-to-Speech..."
+        if value >= 100:
+            return "Finalizing..."
+        if info is not None:
+            return f"Encoding {info.describe()}"
+        return "Processing video..."
+    
+    def _poll_render(self):
+        """Apply queued render events on the Tk thread, then poll again."""
+        latest = None
+        finished = None
+        try:
+            while finished is None:
+                event = self._render_events.get_nowait()
+                if event[0] == 'progress':
+                    latest = event
+                else:
+                    finished = event
+        except queue.Empty:
+            pass
+        
+        # Only the newest progress matters, older updates are skipped
+        if latest and not self._cancel_token.cancelled:
+            _, value, info = latest
+            self._progress_dialog.update_progress(value / 100, self._progress_status(value, info))
+        
+        if finished is None:
+            self.window.after(POLL_INTERVAL_MS, self._poll_render)
+        else:
+            self._finish_render(*finished)
+    
+    def _finish_render(self, outcome, payload):
+        """Close the progress dialog and report how the render ended.
+        
+        Args:
+            outcome (str): 'done', 'cancelled' or 'error'
+            payload: Render result or error message
+        """
+        self._progress_dialog.close()
+        self.generate_btn.configure(state="normal")
+        self.preview_btn.configure(state="normal")
+        
+        if outcome == 'done':
+            self._on_render_done(payload)
+        elif outcome == 'error':
+            messagebox.showerror("Error", payload)
+    
+    def _on_video_done(self, result):
+        """Show where the render spent its time and offer to open the video.
+        
+        Args:
+            result (Dict): render_job result
+        """
+        from ..core.utils.tracing import format_breakdown
+        
+        message = SUCCESS_MSG.format(self.output_entry.get())
+        breakdown = format_breakdown(result.get('trace', {}))
+        if breakdown:
+            message += f"\n\n{breakdown}"
+        answer = messagebox.askquestion(
+            "Success", 
+            message + "\n\nWould you like to open the video?", 
+            type='yesno'
+        )
+        if answer == 'yes':
+            self._open_generated_video()
+    
+    def _on_preview_done(self, result):
+        """Open a finished preview in the default player.
+        
+        Args:
+            result (Dict): render_preview result
+        """
+        try:
+            FileHandler.open_file(result['output'])
+        except Exception as e:
+            messagebox.showerror("Error", f"Failed to open preview: {str(e)}")
             
     def _open_generated_video(self):
         """Open the generated video file."""
-        from ..config.settings import VIDEO_OUTPUT_FILENAME
         try:
             video_path = Path(self.output_entry.get()) / VIDEO_OUTPUT_FILENAME
             if video_path.exists():
-                os.startfile(str(video_path))
+                FileHandler.open_file(video_path)
             else:
                 messagebox.showerror("Error", f"Video file not found at {video_path}")
         except Exception as e:
             messagebox.showerror("Error", f"Failed to open video: {str(e)}")
             
+    def _on_close(self):
+        """Stop queued and running renders, then close the window."""
+        if self.job_queue is not None:
+            self.job_queue.cancel_all()
+        if self._render_thread is not None and self._render_thread.is_alive():
+            # Kill the TTS/ffmpeg children of a Generate or Preview render and
+            # give the worker a moment to reap them before the process exits
+            self._cancel_token.cancel()
+            self._render_thread.join(timeout=CLOSE_TIMEOUT_SECONDS)
+        self.window.destroy()
+    
+    def _on_map(self, event):
+        """Wait for the first frame to be drawn once the window is mapped."""
+        if event.widget is not self.window or self._painted:
+            return
+        self._painted = True
+        self.window.after_idle(self._on_first_paint)
+    
+    def _on_first_paint(self):
+        """Record the first paint and start the deferred startup work."""
+        self._mark_startup('first_paint')
+        if self.startup_timer is not None:
+            self.startup_timer.log()
+        if self.close_after_paint:
+            self._on_close()
+            return
+        self._load_asset_lists()
+    
+    def _load_asset_lists(self):
+        """Scan the asset folders off the Tk thread and fill in the pickers."""
+        results = queue.Queue()
+        
+        def scan():
+            assets = {}
+            try:
+                for kind in (ASSET_KIND_VIDEO, ASSET_KIND_AUDIO):
+                    assets[kind] = AssetCatalog.assets(kind)
+            except Exception as e:
+                logger.error(f"Asset scan failed: {e}")
+            results.put(assets)
+            # Probe stock media so the first render skips ffprobe
+            MediaIndex.warm_assets()
+        
+        threading.Thread(target=scan, daemon=True).start()
+        self._poll_asset_lists(results)
+    
+    def _poll_asset_lists(self, results):
+        """Select the first assets once the scan has finished.
+        
+        Args:
+            results (queue.Queue): Receives the scanned assets by kind
+        """
+        try:
+            assets = results.get_nowait()
+        except queue.Empty:
+            self.window.after(POLL_INTERVAL_MS, self._poll_asset_lists, results)
+            return
+        for picker, kind in ((self.bg_video, ASSET_KIND_VIDEO), (self.bg_music, ASSET_KIND_AUDIO)):
+            # Keep anything picked while the scan was running
+            if picker.get() == "Default" and assets.get(kind):
+                picker.set(assets[kind][0]['name'], assets[kind][0]['path'])
+        self._mark_startup('assets_loaded')
+            
     def run(self):
         """Start the application."""
+        self.window.protocol("WM_DELETE_WINDOW", self._on_close)
+        self.window.bind("<Map>", self._on_map, add="+")
         self.window.mainloop()
\ No newline at end of file
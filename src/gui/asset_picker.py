@@ -0,0 +1,249 @@
+"""Searchable asset pickers for BeAnonymous."""
+import queue
+import customtkinter as ctk
+from PIL import Image
+
+from ..config.settings import GUI_ASSETS_PATH
+from ..config.constants import APP_ICON
+from ..core.utils.asset_catalog import AssetCatalog, ASSET_KIND_VIDEO
+from ..core.utils.logger import get_logger
+from ..core.video.thumbnails import ThumbnailCache
+
+logger = get_logger('ASSET PICKER')
+
+# Rows added each time the list is scrolled near its end
+PAGE_SIZE = 20
+# Milliseconds to wait after typing before filtering
+SEARCH_DELAY_MS = 200
+# Milliseconds between checks for scrolling and finished thumbnails
+POLL_INTERVAL_MS = 150
+# Thumbnail strips are shown at this fraction of their generated size
+STRIP_DISPLAY_SCALE = 0.5
+ALL_TAGS = "All tags"
+
+class AssetPickerDialog:
+    """Dialog for finding an asset by name, folder or tag."""
+
+    def __init__(self, parent, kind, on_select, title="Select Asset"):
+        """Initialize the picker dialog.
+
+        Args:
+            parent: Parent window
+            kind (str): ASSET_KIND_VIDEO or ASSET_KIND_AUDIO
+            on_select (callable): Called with the chosen asset dict
+            title (str): Window title
+        """
+        self.kind = kind
+        self.on_select = on_select
+        self.thumbnails = kind == ASSET_KIND_VIDEO
+        self._search_job = None
+        self._poll_job = None
+        self.matches = []
+        self.rows = []
+        self.images = []
+        # Finished thumbnail requests, handed over from the generator threads
+        self.finished = queue.Queue()
+
+        width = 560 if self.thumbnails else 420
+        self.window = ctk.CTkToplevel(parent)
+        self.window.title(title)
+        self.window.geometry(f"{width}x480")
+        self.window.protocol("WM_DELETE_WINDOW", self._close)
+        icon_path = GUI_ASSETS_PATH / APP_ICON
+        if icon_path.exists():
+            self.window.iconbitmap(str(icon_path))
+        # Make it modal
+        self.window.transient(parent)
+        self.window.grab_set()
+
+        # Center on parent
+        x = parent.winfo_x() + parent.winfo_width()//2 - width//2
+        y = parent.winfo_y() + parent.winfo_height()//2 - 240
+        self.window.geometry(f"+{x}+{y}")
+
+        # Search and tag filter
+        filters = ctk.CTkFrame(self.window, fg_color="transparent")
+        filters.pack(fill="x", padx=10, pady=(10, 0))
+        self.search = ctk.CTkEntry(filters, placeholder_text="Search", width=250)
+        self.search.pack(side="left")
+        self.search.bind("<KeyRelease>", self._schedule_search)
+
+        self.tag = ctk.CTkOptionMenu(
+            filters,
+            values=[ALL_TAGS] + AssetCatalog.tags(kind),
+            width=130,
+            command=lambda _: self._apply_filter()
+        )
+        self.tag.set(ALL_TAGS)
+        self.tag.pack(side="right")
+
+        self.count_label = ctk.CTkLabel(self.window, text="", anchor="w",
+                                        font=("Arial", 11), text_color="#AAAAAA")
+        self.count_label.pack(fill="x", padx=12)
+
+        self.results = ctk.CTkScrollableFrame(self.window, fg_color="#2B2B2B")
+        self.results.pack(fill="both", expand=True, padx=10, pady=(0, 10))
+
+        self._apply_filter()
+        self.search.focus_set()
+        self._poll()
+
+    def _schedule_search(self, _event=None):
+        """Filter once typing pauses instead of on every key."""
+        if self._search_job is not None:
+            self.window.after_cancel(self._search_job)
+        self._search_job = self.window.after(SEARCH_DELAY_MS, self._apply_filter)
+
+    def _apply_filter(self):
+        """Show assets matching the search text and tag."""
+        self._search_job = None
+        tag = self.tag.get()
+        matches = AssetCatalog.search(self.kind, self.search.get(),
+                                      None if tag == ALL_TAGS else tag)
+
+        for row in self.rows:
+            row.destroy()
+        self.rows = []
+        self.images = []
+        # Thumbnails of the previous results are no longer needed
+        ThumbnailCache.cancel_pending()
+        self.matches = matches
+        self.results._parent_canvas.yview_moveto(0)
+        self._show_more()
+
+    def _show_more(self):
+        """Add the next page of results."""
+        for asset in self.matches[len(self.rows):len(self.rows) + PAGE_SIZE]:
+            label = asset['name']
+            if asset['tags']:
+                label += f"   [{', '.join(asset['tags'])}]"
+            row = ctk.CTkButton(
+                self.results,
+                text=label,
+                anchor="w",
+                compound="left",
+                fg_color="transparent",
+                hover_color="#404040",
+                command=lambda a=asset: self._select(a)
+            )
+            row.pack(fill="x", pady=1)
+            self.rows.append(row)
+            if self.thumbnails:
+                # Generated off the Tk thread, picked up by _poll
+                ThumbnailCache.request(asset['path']).add_done_callback(
+                    lambda future, row=row: self.finished.put((row, future)))
+
+        text = f"{len(self.matches)} match(es)"
+        if len(self.rows) < len(self.matches):
+            text += f", showing {len(self.rows)} - scroll for more"
+        self.count_label.configure(text=text)
+
+    def _poll(self):
+        """Load more rows near the end of the list and show finished thumbnails."""
+        if len(self.rows) < len(self.matches) and self.results._parent_canvas.yview()[1] > 0.9:
+            self._show_more()
+
+        while True:
+            try:
+                row, future = self.finished.get_nowait()
+            except queue.Empty:
+                break
+            if future.cancelled() or not row.winfo_exists():
+                continue
+            if future.exception() is not None:
+                logger.error(f"Thumbnail failed: {future.exception()}")
+                continue
+            self._set_thumbnail(row, future.result())
+
+        self._poll_job = self.window.after(POLL_INTERVAL_MS, self._poll)
+
+    def _set_thumbnail(self, row, strip_path):
+        """Show a thumbnail strip on a result row."""
+        try:
+            with Image.open(strip_path) as strip:
+                strip.load()
+        except OSError as e:
+            logger.error(f"Could not load thumbnail {strip_path}: {e}")
+            return
+        size = (int(strip.width * STRIP_DISPLAY_SCALE), int(strip.height * STRIP_DISPLAY_SCALE))
+        image = ctk.CTkImage(light_image=strip, dark_image=strip, size=size)
+        # Keep a reference so the image is not garbage collected
+        self.images.append(image)
+        row.configure(image=image)
+
+    def _close(self):
+        """Stop polling and pending thumbnails, then close."""
+        if self._search_job is not None:
+            self.window.after_cancel(self._search_job)
+        if self._poll_job is not None:
+            self.window.after_cancel(self._poll_job)
+        ThumbnailCache.cancel_pending()
+        self.window.grab_release()
+        self.window.destroy()
+
+    def _select(self, asset):
+        """Report the chosen asset and close."""
+        self._close()
+        self.on_select(asset)
+
+class AssetPicker:
+    """Button showing the selected asset, opening a searchable picker on click.
+
+    Exposes get()/set() like the combo boxes it replaces.
+    """
+
+    def __init__(self, master, kind, title, width=170, height=35):
+        """Initialize the picker.
+
+        Args:
+            master: Parent widget
+            kind (str): ASSET_KIND_VIDEO or ASSET_KIND_AUDIO
+            title (str): Title of the picker dialog
+            width (int): Button width
+            height (int): Button height
+        """
+        self.master = master
+        self.kind = kind
+        self.title = title
+        self._name = "Default"
+        self._path = None
+        self.button = ctk.CTkButton(
+            master=master,
+            text=self._name,
+            anchor="w",
+            width=width,
+            height=height,
+            fg_color="#2B2B2B",
+            hover_color="#404040",
+            text_color="#FFFFFF",
+            command=self._open
+        )
+
+    def place(self, **kwargs):
+        """Place the picker button in its parent."""
+        self.button.place(**kwargs)
+
+    def get(self):
+        """Get the selected asset name."""
+        return self._name
+
+    def path(self):
+        """Get the selected asset file, or its name if it was set by name."""
+        return self._path or self._name
+
+    def set(self, name, path=None):
+        """Select an asset.
+
+        Args:
+            name (str): Asset name
+            path (str, optional): Asset file path
+        """
+        self._name = name
+        self._path = path
+        self.button.configure(text=name)
+
+    def _open(self):
+        """Open the picker dialog."""
+        AssetPickerDialog(self.master.winfo_toplevel(), self.kind,
+                          lambda asset: self.set(asset['name'], asset['path']),
+                          title=self.title)
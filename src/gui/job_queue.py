@@ -0,0 +1,221 @@
+"""Render queue panel for BeAnonymous."""
+import os
+import customtkinter as ctk
+
+from ..config.settings import GUI_ASSETS_PATH
+from ..config.constants import APP_ICON
+from ..core.jobs import (
+    JobQueue,
+    STATUS_QUEUED,
+    STATUS_RUNNING,
+    STATUS_DONE,
+    STATUS_FAILED,
+    STATUS_CANCELLED
+)
+from ..core.utils.settings_manager import SettingsManager
+
+# Milliseconds between refreshes of the job rows
+REFRESH_INTERVAL_MS = 250
+
+STATUS_COLORS = {
+    STATUS_QUEUED: "#AAAAAA",
+    STATUS_RUNNING: "#4a90d9",
+    STATUS_DONE: "#5cb85c",
+    STATUS_FAILED: "#d9534f",
+    STATUS_CANCELLED: "#f0ad4e"
+}
+
+def _format_elapsed(seconds):
+    """Format seconds as m:ss, or a dash if the job never started."""
+    if seconds is None:
+        return "-"
+    minutes, seconds = divmod(int(seconds), 60)
+    return f"{minutes}:{seconds:02d}"
+
+class JobRow:
+    """Widgets showing one queued job."""
+
+    def __init__(self, parent, panel, job_id, title):
+        """Initialize the row.
+
+        Args:
+            parent: Frame holding the rows
+            panel (JobQueuePanel): Owning panel, receives button actions
+            job_id (str): Job identifier
+            title (str): Short description shown in the row
+        """
+        self.frame = ctk.CTkFrame(parent, fg_color="#2d2d2d")
+        self.frame.grid_columnconfigure(0, weight=1)
+
+        self.title = ctk.CTkLabel(self.frame, text=f"{job_id}  {title}", anchor="w",
+                                  font=("Arial", 12, "bold"))
+        self.title.grid(row=0, column=0, sticky="w", padx=8, pady=(6, 0))
+
+        self.status = ctk.CTkLabel(self.frame, text="", anchor="e", font=("Arial", 12))
+        self.status.grid(row=0, column=1, sticky="e", padx=8, pady=(6, 0))
+
+        self.progress = ctk.CTkProgressBar(self.frame, height=10, fg_color="#202020",
+                                           progress_color="#4a90d9")
+        self.progress.grid(row=1, column=0, columnspan=2, sticky="ew", padx=8, pady=4)
+        self.progress.set(0)
+
+        self.detail = ctk.CTkLabel(self.frame, text="", anchor="w", font=("Arial", 11),
+                                   text_color="#AAAAAA", justify="left", wraplength=420)
+        self.detail.grid(row=2, column=0, columnspan=2, sticky="w", padx=8)
+
+        buttons = ctk.CTkFrame(self.frame, fg_color="transparent")
+        buttons.grid(row=3, column=0, columnspan=2, sticky="e", padx=8, pady=(0, 6))
+        self.buttons = {}
+        for action, label in (("up", "▲"), ("down", "▼"), ("retry", "Retry"),
+                              ("cancel", "Cancel"), ("remove", "Remove")):
+            width = 28 if action in ("up", "down") else 60
+            button = ctk.CTkButton(buttons, text=label, width=width, height=24,
+                                   command=lambda a=action: panel.handle_action(a, job_id))
+            button.pack(side="left", padx=2)
+            self.buttons[action] = button
+
+    def update(self, queued):
+        """Show the current state of a queued job.
+
+        Args:
+            queued (QueuedJob): Queue entry
+        """
+        status = queued.status
+        if status == STATUS_RUNNING and queued.info is not None:
+            status_text = queued.info.describe()
+        elif status == STATUS_RUNNING:
+            status_text = f"running {queued.progress:.0f}%"
+        else:
+            status_text = status
+        self.status.configure(text=status_text, text_color=STATUS_COLORS.get(status, "#FFFFFF"))
+        self.progress.set(queued.progress / 100)
+
+        detail = f"Elapsed {_format_elapsed(queued.elapsed)}  •  {queued.output or queued.job.output_file}"
+        if queued.trace:
+            detail += "\n" + "  •  ".join(f"{name} {seconds:.1f}s"
+                                          for name, seconds in queued.trace['stages'].items())
+        if queued.error:
+            detail += f"\n{queued.error}"
+        self.detail.configure(text=detail)
+
+        self.buttons["up"].configure(state="normal" if status == STATUS_QUEUED else "disabled")
+        self.buttons["down"].configure(state="normal" if status == STATUS_QUEUED else "disabled")
+        self.buttons["retry"].configure(
+            state="normal" if status in (STATUS_FAILED, STATUS_CANCELLED) else "disabled")
+        self.buttons["cancel"].configure(state="disabled" if queued.finished else "normal")
+        self.buttons["remove"].configure(state="disabled" if status == STATUS_RUNNING else "normal")
+
+class JobQueuePanel:
+    """Window listing queued renders with per-job controls.
+
+    Closing the window only hides it; the queue keeps rendering.
+    """
+
+    def __init__(self, parent, job_queue: JobQueue):
+        """Initialize the panel.
+
+        Args:
+            parent: Parent window
+            job_queue (JobQueue): Queue to display and control
+        """
+        self.job_queue = job_queue
+        self.rows = {}
+        self.order = None  # Forces the first refresh to lay out the rows or the empty text
+
+        self.window = ctk.CTkToplevel(parent)
+        self.window.title("Render Queue")
+        self.window.geometry("500x520")
+        icon_path = GUI_ASSETS_PATH / APP_ICON
+        if icon_path.exists():
+            self.window.iconbitmap(str(icon_path))
+        self.window.protocol("WM_DELETE_WINDOW", self.hide)
+
+        # Concurrency selector
+        header = ctk.CTkFrame(self.window, fg_color="transparent")
+        header.pack(fill="x", padx=10, pady=(10, 0))
+        ctk.CTkLabel(header, text="Parallel renders", font=("Arial", 14)).pack(side="left")
+        self.workers = ctk.CTkOptionMenu(
+            header,
+            values=[str(n) for n in range(1, max(2, os.cpu_count() or 2) + 1)],
+            width=70,
+            command=self._on_workers_change
+        )
+        self.workers.set(str(job_queue.workers))
+        self.workers.pack(side="left", padx=10)
+        ctk.CTkButton(header, text="Clear finished", width=110,
+                      command=self._clear_finished).pack(side="right")
+
+        self.list_frame = ctk.CTkScrollableFrame(self.window, fg_color="transparent")
+        self.list_frame.pack(fill="both", expand=True, padx=10, pady=10)
+        self.list_frame.grid_columnconfigure(0, weight=1)
+
+        self.empty_label = ctk.CTkLabel(self.list_frame, text="No jobs queued",
+                                        text_color="#AAAAAA")
+        self._refresh()
+
+    def show(self):
+        """Bring the panel to the front."""
+        self.window.deiconify()
+        self.window.lift()
+
+    def hide(self):
+        """Hide the panel without stopping the queue."""
+        self.window.withdraw()
+
+    def handle_action(self, action, job_id):
+        """Apply a row button to a job.
+
+        Args:
+            action (str): 'up', 'down', 'retry', 'cancel' or 'remove'
+            job_id (str): Job identifier
+        """
+        if action == "up":
+            self.job_queue.move(job_id, -1)
+        elif action == "down":
+            self.job_queue.move(job_id, 1)
+        elif action == "retry":
+            self.job_queue.retry(job_id)
+        elif action == "cancel":
+            self.job_queue.cancel(job_id)
+        elif action == "remove":
+            self.job_queue.remove(job_id)
+        self._refresh(reschedule=False)
+
+    def _on_workers_change(self, value):
+        """Apply and remember the selected concurrency."""
+        self.job_queue.set_workers(int(value))
+        SettingsManager.save_settings({'queue_workers': int(value)})
+
+    def _clear_finished(self):
+        """Drop finished jobs from the list."""
+        self.job_queue.clear_finished()
+        self._refresh(reschedule=False)
+
+    def _refresh(self, reschedule=True):
+        """Sync rows with the queue, rebuilding the layout only when it changed."""
+        if not self.window.winfo_exists():
+            return
+        jobs = self.job_queue.jobs()
+        order = [queued.id for queued in jobs]
+
+        if order != self.order:
+            for job_id in list(self.rows):
+                if job_id not in order:
+                    self.rows.pop(job_id).frame.destroy()
+            for queued in jobs:
+                if queued.id not in self.rows:
+                    title = " ".join(queued.job.script.split())[:40]
+                    self.rows[queued.id] = JobRow(self.list_frame, self, queued.id, title)
+            for index, job_id in enumerate(order):
+                self.rows[job_id].frame.grid(row=index, column=0, sticky="ew", pady=4)
+            if order:
+                self.empty_label.grid_forget()
+            else:
+                self.empty_label.grid(row=0, column=0, pady=20)
+            self.order = order
+
+        for queued in jobs:
+            self.rows[queued.id].update(queued)
+
+        if reschedule:
+            self.window.after(REFRESH_INTERVAL_MS, self._refresh)
@@ -0,0 +1,70 @@
+"""Cold-start timing of the BeAnonymous GUI."""
+import time
+from typing import Dict, Optional
+
+from ..config.settings import STARTUP_BUDGET_SECONDS
+from ..core.utils.logger import get_logger
+
+logger = get_logger('STARTUP')
+
+class StartupTimer:
+    """Startup milestones in seconds since a start time.
+
+    Milestones recorded by the GUI:
+    - imports: the GUI modules are loaded
+    - window: the main window and its widgets are built
+    - first_paint: the first frame is drawn, checked against the budget
+    - assets_loaded: the deferred asset scan has filled in the pickers
+    """
+
+    def __init__(self, start: Optional[float] = None, budget: Optional[float] = None):
+        """Initialize the timer.
+
+        Args:
+            start (float, optional): time.perf_counter() value to measure from,
+                defaults to now
+            budget (float, optional): Allowed seconds from start to first paint,
+                defaults to STARTUP_BUDGET_SECONDS
+        """
+        self.start = time.perf_counter() if start is None else start
+        self.budget = STARTUP_BUDGET_SECONDS if budget is None else budget
+        self.marks = {}
+
+    def mark(self, milestone: str) -> float:
+        """Record a milestone.
+
+        Args:
+            milestone (str): Milestone name
+
+        Returns:
+            float: Seconds since the start
+        """
+        self.marks[milestone] = round(time.perf_counter() - self.start, 4)
+        return self.marks[milestone]
+
+    def within_budget(self) -> bool:
+        """Check the first paint against the budget.
+
+        Returns:
+            bool: True if the first paint happened within the budget
+        """
+        first_paint = self.marks.get('first_paint')
+        return first_paint is not None and first_paint <= self.budget
+
+    def report(self) -> Dict:
+        """Get the milestones and the budget verdict.
+
+        Returns:
+            Dict: marks, budget and within_budget
+        """
+        return {
+            'marks': dict(self.marks),
+            'budget': self.budget,
+            'within_budget': self.within_budget()
+        }
+
+    def log(self) -> None:
+        """Log the milestones recorded so far."""
+        timings = ', '.join(f"{name} {seconds:.3f}s" for name, seconds in self.marks.items())
+        status = "within" if self.within_budget() else "over"
+        logger.info(f"Startup: {timings} ({status} the {self.budget:.1f}s budget)")